@@ -5,7 +5,9 @@
 import streamlit as st
 import os
 import json
+import re
 import pandas as pd
+import numpy as np
 from datetime import datetime
 import glob
 import plotly.express as px
@@ -13,49 +15,80 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import base64
 
+from modules.log_writer import resolve_log_path
+from modules.run_catalog import get_run_catalog
+from modules.result_store import (
+    RESULT_SCHEMA, build_result_record, read_result_json_files,
+    compact_run_results, get_result_store_path, is_result_store_fresh, load_result_store
+)
+from modules.report_cache import get_cached_run_data
+from modules.export_bundle import EXPORT_STATIC_MAX_BYTES, get_export_bundle, get_export_bundle_url
+from modules.log_index import get_log_index, read_log_lines, search_log, list_log_tasks
+from modules.task_profile import (
+    get_task_profile, summarize_check_spans, summarize_slowest_checks, summarize_slowest_hosts, summarize_slowest_tasks
+)
+from modules.report_summary import classify_result_statuses, match_result_pattern, get_report_summary
+
+# 원본 데이터 탭/CSV 에 노출할 컬럼 (내부 분류 플래그 컬럼 제외)
+REPORT_DATA_COLUMNS = RESULT_SCHEMA.names + ['실질적_양호상태', '상세_상태', '실패_유형']
+
+LOG_VIEW_PAGE_SIZES = [100, 200, 500, 1000]   # 로그 뷰어 한 페이지 라인 수 선택지
+LOG_SEARCH_RESULT_OPTIONS = 200               # 검색 결과 이동 목록에 표시할 최대 라인 수
+
+REPORT_TAB_LABELS = ["📊 종합 대시보드", "🖥️ 서버별 분석", "🔍 취약점 상세", "⏱️ 실행 분석", "📄 원본 데이터"]
+
 def load_timestamp_results(timestamp):
-    """특정 타임스탬프의 JSON 결과 파일들을 로드"""
-    result_folder = f"playbooks/playbook_result_{timestamp}/results"
+    """특정 타임스탬프의 점검 결과 로드 (파일이 바뀌지 않았으면 프로세스 공유 캐시에서 반환)"""
+    return get_cached_run_data('results', timestamp, lambda: _load_classified_results(timestamp))
+
+def _load_classified_results(timestamp):
+    """결과 로드 후 상태 분류 컬럼을 한 번만 추가 (모든 탭/차트가 재사용)"""
+    result_data, error = _load_timestamp_results(timestamp)
+    if result_data is not None and not result_data['df'].empty:
+        result_data['df'] = classify_result_statuses(result_data['df'])
+    return result_data, error
+
+def _load_timestamp_results(timestamp):
+    """특정 타임스탬프의 점검 결과 로드 (Parquet 결과 저장소 우선, 없으면 JSON 결과 파일을 압축 저장 후 로드)"""
+    result_folder_path = f"playbooks/playbook_result_{timestamp}"
+    result_folder = f"{result_folder_path}/results"
     
-    if not os.path.exists(result_folder):
+    # 보관 정책으로 압축된 실행은 results 폴더 없이 Parquet 저장소만 남음
+    if not os.path.exists(result_folder) and not os.path.exists(get_result_store_path(result_folder_path)):
         return None, f"결과 폴더를 찾을 수 없습니다: {result_folder}"
     
+    # 🆕 실행 완료 시 만들어진 Parquet 저장소가 최신이면 JSON 을 읽지 않고 컬럼 단위로 바로 로드
+    if not is_result_store_fresh(result_folder_path):
+        try:
+            compact_run_results(result_folder_path)
+        except Exception as e:
+            print(f"⚠️ 결과 Parquet 압축 실패, JSON 결과를 직접 읽습니다: {str(e)}")
+    
+    if is_result_store_fresh(result_folder_path):
+        try:
+            df, meta = load_result_store(result_folder_path)
+            return {'df': df, **meta}, None
+        except Exception as e:
+            print(f"⚠️ 결과 Parquet 읽기 실패, JSON 결과를 직접 읽습니다: {str(e)}")
+    
     json_files = glob.glob(f"{result_folder}/*.json")
     if not json_files:
-        # JSON 파일이 없을 때 로그 파일 정보 추가 제공
-        log_file = f"logs/ansible_execute_log_{timestamp}.log"
+        # JSON 파일이 없을 때 로그 파일 정보 추가 제공 (카탈로그에 색인된 로그 경로 우선)
+        catalog_run = get_run_catalog().get_run(timestamp)
+        log_file = catalog_run['log_file'] if catalog_run else resolve_log_path(timestamp)
         error_msg = f"JSON 결과 파일을 찾을 수 없습니다: {result_folder}"
         
         if os.path.exists(log_file):
             try:
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    log_content = f.read()
-                
-                # 로그에서 오류 관련 정보 추출
-                error_lines = []
-                failed_lines = []
-                recap_started = False
-                
-                for line in log_content.split('\n'):
-                    line_lower = line.lower()
-                    
-                    if "play recap" in line_lower:
-                        recap_started = True
-                        continue
-                    
-                    if any(keyword in line_lower for keyword in ['error', 'failed', 'fatal', 'unreachable']):
-                        if recap_started and "failed=" in line_lower:
-                            failed_lines.append(line.strip())
-                        elif not recap_started:
-                            error_lines.append(line.strip())
-                
+                # 로그 색인(한 번 파싱 후 캐시)에서 PLAY RECAP 이전 오류 라인과 RECAP 실패 요약 사용
+                log_index = get_log_index(timestamp)
                 detailed_info = {
                     'error_msg': error_msg,
                     'log_file': log_file,
                     'has_log': True,
-                    'error_lines': error_lines[-10:] if error_lines else [],
-                    'failed_summary': failed_lines,
-                    'log_size': len(log_content),
+                    'error_lines': [line['text'] for line in log_index['error_lines'][-10:]],
+                    'failed_summary': [line.strip() for line in log_index['recap_lines'] if "failed=" in line.lower()],
+                    'log_size': log_index['size'],
                 }
                 
                 return None, detailed_info
@@ -67,100 +100,35 @@ def load_timestamp_results(timestamp):
         
         return None, error_msg
         
-    all_data = []
-    file_info = []
-    server_list = set()
-    check_types = set()
-    
-    for json_file in json_files:
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-                filename = os.path.basename(json_file)
-                file_info.append({
-                    'filename': filename,
-                    'path': json_file,
-                    'size': os.path.getsize(json_file),
-                    'data_type': type(data).__name__
-                })
-                
-                # 데이터 정규화 및 추가 정보 추출
-                if isinstance(data, list):
-                    for item in data:
-                        if isinstance(item, dict):
-                            server_list.add(item.get('hostname', 'Unknown'))
-                            # 파일명에서 점검 타입 추출
-                            check_type = filename.split('_')[1:3]  # 예: 1_1_1
-                            if len(check_type) >= 2:
-                                check_types.add('_'.join(check_type))
-                    all_data.extend(data)
-                elif isinstance(data, dict):
-                    server_list.add(data.get('hostname', 'Unknown'))
-                    check_type = filename.split('_')[1:3]
-                    if len(check_type) >= 2:
-                        check_types.add('_'.join(check_type))
-                    all_data.append(data)
-                    
-        except Exception as e:
-            st.error(f"❌ 파일 {json_file} 로드 실패: {str(e)}")
-            continue
-    
-    return {
-        'data': all_data,
-        'file_info': file_info,
-        'total_files': len(json_files),
-        'loaded_files': len(file_info),
-        'servers': list(server_list),
-        'check_types': list(check_types)
-    }, None
+    reports, meta = read_result_json_files(result_folder)
+    df = pd.DataFrame.from_records([build_result_record(report) for report in reports], columns=RESULT_SCHEMA.names)
+    return {'df': df, **meta}, None
 
-def create_security_improvement_analysis(df):
-    """보안 개선 효과 분석 (ignore 항목 반영)"""
-    if df.empty:
+def load_timestamp_summary(timestamp, result_data):
+    """대시보드 집계 요약 로드 (실행 완료 시 저장된 report_summary.json 우선, 없으면 결과 데이터로 계산 후 저장)"""
+    result_folder_path = f"playbooks/playbook_result_{timestamp}"
+    return get_cached_run_data(
+        'summary', timestamp,
+        lambda: get_report_summary(result_folder_path, result_data['df'], result_data)
+    )
+
+def get_report_figure(timestamp, name, builder):
+    """차트 생성 결과 메모이즈 (실행 파일이 바뀌지 않았으면 재실행/다른 세션에서도 그대로 재사용)"""
+    return get_cached_run_data(f'figure:{name}', timestamp, builder)
+
+def create_security_improvement_analysis(summary):
+    """보안 개선 효과 분석 (ignore 항목 반영, 실행 요약 집계 사용)"""
+    totals = summary['totals']
+    total_checks = totals['total_checks']
+    if not total_checks:
         return None, None, None
-        
-    # 실질적 상태가 없으면 생성 (ignore 고려)
-    if '실질적_양호상태' not in df.columns:
-        df['실질적_양호상태'] = (
-            (df['전체 취약 여부'] == False) | 
-            (df['조치 결과'].str.contains("조치 완료|완료|성공", case=False, na=False))
-        )
-    
-    # 1. 원래부터 양호 (조치 불필요)
-    originally_safe = df[
-        (df['실질적_양호상태'] == True) & 
-        (df['조치 여부'] == False)
-    ]
-    
-    # 2. 조치 후 양호 (취약 발견 → 조치 완료)
-    remediated_safe = df[
-        (df['조치 여부'] == True) & 
-        (df['조치 결과'].str.contains("조치 완료|완료|성공", case=False, na=False))
-    ]
-    
-    # 3. 조치 시도했지만 실패/무시됨
-    attempted_but_failed = df[
-        (df['조치 여부'] == True) & 
-        (df['조치 결과'].str.contains("실패|오류|ERROR|FAILED|무시|ignore|건너뛰|skip", case=False, na=False))
-    ]
     
-    # 4. 여전히 취약 (조치 안됨)
-    still_vulnerable = df[
-        (df['실질적_양호상태'] == False) & 
-        (df['조치 여부'] == False)
-    ]
-    
-    # 통계 데이터 생성 (4개 카테고리)
+    # 통계 데이터 생성 (4개 카테고리: 원래부터 양호 / 조치 후 양호 / 조치 시도했지만 실패·무시 / 조치 안 된 취약)
+    counts = [totals['originally_safe'], totals['remediated_safe'], totals['attempted_but_failed'], totals['still_vulnerable']]
     improvement_stats = pd.DataFrame({
         '항목': ['원래부터 양호', '조치 후 양호', '조치 시도(실패/무시)', '여전히 취약'],
-        '개수': [len(originally_safe), len(remediated_safe), len(attempted_but_failed), len(still_vulnerable)],
-        '비율(%)': [
-            len(originally_safe) / len(df) * 100,
-            len(remediated_safe) / len(df) * 100,
-            len(attempted_but_failed) / len(df) * 100,
-            len(still_vulnerable) / len(df) * 100
-        ]
+        '개수': counts,
+        '비율(%)': [count / total_checks * 100 for count in counts]
     })
     
     # 파이 차트 생성 (4개 카테고리)
@@ -179,14 +147,9 @@ def create_security_improvement_analysis(df):
     )
     
     # 서버별 개선 효과 차트 (4개 카테고리)
-    server_improvement = df.groupby('호스트').apply(lambda x: pd.Series({
-        '원래_양호': len(x[(x['실질적_양호상태'] == True) & (x['조치 여부'] == False)]),
-        '조치_후_양호': len(x[(x['조치 여부'] == True) & 
-                            (x['조치 결과'].str.contains("조치 완료|완료|성공", case=False, na=False))]),
-        '조치_시도_실패': len(x[(x['조치 여부'] == True) & 
-                             (x['조치 결과'].str.contains("실패|오류|ERROR|FAILED|무시|ignore|건너뛰|skip", case=False, na=False))]),
-        '여전히_취약': len(x[(x['실질적_양호상태'] == False) & (x['조치 여부'] == False)])
-    })).reset_index()
+    server_improvement = summary['server_counts'].rename(columns={'미조치_취약': '여전히_취약'})[
+        ['호스트', '원래_양호', '조치_후_양호', '조치_시도_실패', '여전히_취약']
+    ]
     
     fig2 = px.bar(
         server_improvement,
@@ -203,45 +166,18 @@ def create_security_improvement_analysis(df):
     )
     fig2.update_layout(height=400)
     
-    return fig1, fig2, {
-        'originally_safe': originally_safe,
-        'remediated_safe': remediated_safe,
-        'attempted_but_failed': attempted_but_failed,
-        'still_vulnerable': still_vulnerable,
-        'stats': improvement_stats
-    }
-    
-def create_failure_analysis(df):
-    """실패한 작업들에 대한 상세 분석 (ignore 포함)"""
-    if df.empty:
-        return None, None, None
+    return fig1, fig2, {'stats': improvement_stats}
     
-    # ignore된 항목들과 실패한 항목들 모두 포함
-    failed_items = df[
-        (df['조치 여부'] == True) & 
-        (df['조치 결과'].str.contains("실패|오류|ERROR|FAILED|무시|ignore|건너뛰|skip", case=False, na=False))
-    ]
+def create_failure_analysis(summary):
+    """실패한 작업들에 대한 상세 분석 (ignore 포함, 실행 요약 집계 사용)"""
+    # 서버 × 조치 결과별 실패/무시/건너뜀 건수 (실패 유형은 요약 생성 시 분류됨)
+    failures = summary['failures']
     
-    if len(failed_items) == 0:
+    if failures.empty:
         return None, None, {"message": "실패하거나 무시된 작업이 없습니다."}
     
-    # 실패 유형 재분류
-    def categorize_failure_type(result):
-        result_lower = str(result).lower()
-        if any(word in result_lower for word in ['무시', 'ignore', 'ignored']):
-            return 'Ignored (무시됨)'
-        elif any(word in result_lower for word in ['건너뛰', 'skip', 'skipped']):
-            return 'Skipped (건너뜀)'
-        elif any(word in result_lower for word in ['실패', 'failed', 'error']):
-            return 'Failed (실패)'
-        else:
-            return 'Other (기타)'
-    
-    failed_items_copy = failed_items.copy()
-    failed_items_copy['실패_유형'] = failed_items_copy['조치 결과'].apply(categorize_failure_type)
-    
     # 1. 실패 유형별 분류
-    failure_types = failed_items_copy.groupby('실패_유형').size().reset_index(name='count')
+    failure_types = failures.groupby('실패_유형')['count'].sum().reset_index()
     
     fig1 = px.pie(
         failure_types,
@@ -257,10 +193,10 @@ def create_failure_analysis(df):
     )
         
     # 2. 서버별 실패 현황
-    server_failures = failed_items.groupby('호스트').agg({
-        '작업 설명': 'count',
-        '조치 결과': lambda x: list(x.unique())
-    }).reset_index()
+    server_failures = failures.groupby('호스트').agg(
+        실패_개수=('count', 'sum'),
+        실패_유형들=('조치 결과', list)
+    ).reset_index()
     server_failures.columns = ['서버명', '실패_개수', '실패_유형들']
     
     fig2 = px.bar(
@@ -273,22 +209,21 @@ def create_failure_analysis(df):
     )
     fig2.update_layout(height=400)
     
-    # 3. 실패 상세 데이터
+    # 3. 실패 요약 데이터 (개별 항목 목록은 화면에서 원본 결과로 조회)
     failure_details = {
-        'total_failures': len(failed_items),
-        'affected_servers': len(failed_items['호스트'].unique()),
+        'total_failures': int(failures['count'].sum()),
+        'affected_servers': failures['호스트'].nunique(),
         'failure_types': failure_types.to_dict('records'),
-        'server_breakdown': server_failures.to_dict('records'),
-        'detailed_failures': failed_items[['호스트', '작업 설명', '조치 결과', '취약 사유']].to_dict('records')
+        'server_breakdown': server_failures.to_dict('records')
     }
     
     return fig1, fig2, failure_details
 
-def create_unreachable_hosts_analysis(df, result_data):
+def create_unreachable_hosts_analysis(summary):
     """접근 불가능한 호스트 분석"""
     # 모든 서버 vs 실제 결과가 있는 서버 비교
-    expected_servers = set(result_data.get('servers', []))
-    actual_servers = set(df['호스트'].unique()) if not df.empty else set()
+    expected_servers = set(summary['servers'])
+    actual_servers = set(summary['reachable_servers'])
     
     unreachable_servers = expected_servers - actual_servers
     
@@ -327,27 +262,11 @@ def create_vulnerability_severity_chart(df):
     if df.empty:
         return None
     
-    # 실질적 상태가 없으면 생성
-    if '실질적_양호상태' not in df.columns:
-        df['실질적_양호상태'] = (
-            (df['전체 취약 여부'] == False) | 
-            (df['조치 결과'].str.contains("조치 완료|완료|성공", case=False, na=False))
-        )
-    
-    # 3단계 상태로 재분류
-    df_chart = df.copy()
-    
-    def categorize_status(row):
-        if row['실질적_양호상태'] == False:
-            return '실질적 취약'
-        elif row['조치 여부'] == True and '조치 완료' in str(row['조치 결과']):
-            return '조치 후 양호'
-        else:
-            return '원래부터 양호'
-    
-    df_chart['상세_상태'] = df_chart.apply(categorize_status, axis=1)
+    # 상태 분류 컬럼이 없으면 생성 (3단계 상세 상태: 원래부터 양호 / 조치 후 양호 / 실질적 취약)
+    if '상세_상태' not in df.columns:
+        df = classify_result_statuses(df)
     
-    severity_counts = df_chart.groupby(['상세_상태', '진단 결과']).size().reset_index(name='count')
+    severity_counts = df.groupby(['상세_상태', '진단 결과'], observed=True).size().reset_index(name='count')
     
     # 색상 매핑
     color_map = {
@@ -366,39 +285,12 @@ def create_vulnerability_severity_chart(df):
     )
     return fig
 
-def create_server_comparison_chart(df):
-    """서버별 비교 차트 (실질적 상태 반영)"""
-    if df.empty:
+def create_server_comparison_chart(summary):
+    """서버별 비교 차트 (실질적 상태 반영, 실행 요약 집계 사용)"""
+    server_stats = summary['server_counts']
+    if server_stats.empty:
         return None
     
-    # 실질적 상태가 없으면 생성
-    if '실질적_양호상태' not in df.columns:
-        df['실질적_양호상태'] = (
-            (df['전체 취약 여부'] == False) | 
-            (df['조치 결과'].str.contains("조치 완료|완료|성공", case=False, na=False))
-        )
-        
-    # 실질적 상태 기준으로 서버별 통계 계산
-    server_stats = df.groupby('호스트').agg({
-        '실질적_양호상태': ['count', lambda x: (~x).sum()],  # 전체 개수, 실질적 취약 개수
-        '조치 여부': 'sum'
-    }).round(2)
-    
-    server_stats.columns = ['총_점검', '실질적_취약', '조치_완료']
-    server_stats['실질적_양호'] = server_stats['총_점검'] - server_stats['실질적_취약']
-    server_stats = server_stats.reset_index()
-    
-    # 세부 분류 추가
-    server_details = df.groupby('호스트').apply(lambda x: pd.Series({
-        '원래_양호': len(x[(x['실질적_양호상태'] == True) & (x['조치 여부'] == False)]),
-        '조치_후_양호': len(x[(x['조치 여부'] == True) & 
-                            (x['조치 결과'].str.contains("조치 완료|완료|성공", case=False, na=False))]),
-        '여전히_취약': len(x[x['실질적_양호상태'] == False])
-    })).reset_index()
-    
-    # 서버 통계와 세부 분류 병합
-    server_stats = server_stats.merge(server_details, on='호스트')
-    
     fig = make_subplots(
         rows=2, cols=2,
         subplot_titles=('서버별 실질적 취약점 현황', '조치 완료율', '전체 보안 상태 분포', '보안 개선 효과'),
@@ -416,14 +308,10 @@ def create_server_comparison_chart(df):
         row=1, col=1
     )
     
-    # 조치 완료율 (전체 점검 대비 조치 완료된 비율)
-    # remediated_safe 계산
-    remediated_safe = df[(df['조치 여부'] == True) & 
-                        (df['조치 결과'].str.contains("조치 완료|완료|성공", case=False, na=False))]
-    
-    total_items_with_action = len(df[df['조치 여부'] == True])  # 조치가 시도된 항목
-    if total_items_with_action > 0:
-        completion_rate = len(remediated_safe) / total_items_with_action * 100
+    # 조치 완료율 (조치가 시도된 항목 대비 조치 완료된 비율)
+    totals = summary['totals']
+    if totals['action_attempted'] > 0:
+        completion_rate = totals['remediated_safe'] / totals['action_attempted'] * 100
         fig.add_trace(
             go.Bar(x=server_stats['호스트'], y=[completion_rate] * len(server_stats), name='조치 완료율(%)', marker_color='blue'),
             row=1, col=2
@@ -457,26 +345,45 @@ def create_server_comparison_chart(df):
         row=2, col=2
     )
     fig.add_trace(
-        go.Bar(x=server_stats['호스트'], y=server_stats['여전히_취약'], name='여전히 취약', marker_color='#dc3545'),
+        go.Bar(x=server_stats['호스트'], y=server_stats['실질적_취약'], name='여전히 취약', marker_color='#dc3545'),
         row=2, col=2
     )
     
     fig.update_layout(height=800, showlegend=True, title_text="서버별 종합 보안 분석 (실질적 상태 반영)")
     return fig
 
-def create_vulnerability_details_analysis(df):
-    """취약점 상세 분석"""
-    if df.empty:
-        return None, None
-        
-    # 취약점 유형별 분석
-    vulnerable_data = df[df['전체 취약 여부'] == True]
+def create_server_heatmap(summary):
+    """서버-취약점 히트맵 (실질적 취약점 수, 실행 요약 집계 사용)"""
+    heatmap_data = summary['task_counts'].pivot_table(
+        index='작업 설명', 
+        columns='호스트', 
+        values='실질적_취약',  # 실질적 취약점 수
+        aggfunc='sum',
+        fill_value=0
+    )
     
-    if vulnerable_data.empty:
-        return None, None
+    if heatmap_data.empty:
+        return None
     
+    fig_heatmap = px.imshow(
+        heatmap_data.values,
+        labels=dict(x="서버", y="점검 항목", color="실질적 취약점 수"),
+        x=heatmap_data.columns,
+        y=heatmap_data.index,
+        color_continuous_scale='Reds',
+        aspect="auto"
+    )
+    fig_heatmap.update_layout(height=600)
+    return fig_heatmap
+
+def create_vulnerability_details_analysis(summary):
+    """취약점 상세 분석 (실질적 취약점 기준, 실행 요약 집계 사용)"""
     # 작업 설명별 취약점 분포
-    task_vuln = vulnerable_data['작업 설명'].value_counts()
+    task_vuln = summary['task_counts'].groupby('작업 설명')['실질적_취약'].sum()
+    task_vuln = task_vuln[task_vuln > 0].sort_values(ascending=False)
+    
+    if task_vuln.empty:
+        return None, None
     
     fig1 = px.bar(
         x=task_vuln.values, 
@@ -490,7 +397,7 @@ def create_vulnerability_details_analysis(df):
     fig1.update_layout(height=400)
     
     # 조치 상태별 분석
-    remediation_status = vulnerable_data.groupby(['조치 결과', '호스트']).size().reset_index(name='count')
+    remediation_status = summary['vulnerable_status']
     
     fig2 = px.bar(
         remediation_status,
@@ -545,215 +452,856 @@ def create_detailed_file_analysis(df):
     return fig
 
 def create_execution_timeline(timestamp):
-    """실행 타임라인 분석 (올바른 날짜 시간 표시)"""
-    log_file = f"logs/ansible_execute_log_{timestamp}.log"
-    
-    if not os.path.exists(log_file):
-        return None
-        
+    """실행 타임라인 차트 (로그/프로파일이 바뀌지 않았으면 캐시된 차트 반환)"""
+    return get_cached_run_data('timeline', timestamp, lambda: _create_execution_timeline(timestamp))
+
+def _timeline_label(event):
+    """타임라인 항목 이름 (이벤트의 첫 ']' 앞까지, 50자 초과 시 생략)"""
+    event_part = event.split(']')[0].strip()
+    return event_part[:50] + '...' if len(event_part) > 50 else event_part
+
+def _create_execution_timeline(timestamp):
+    """실행 타임라인 분석 (태스크 프로파일의 실제 시작/종료 시각 우선, 없으면 로그 색인의 PLAY/TASK 경계 사용)"""
     try:
-        # timestamp에서 실행 날짜 추출 (예: 20250620_141836)
-        execution_date = datetime.strptime(timestamp, "%Y%m%d_%H%M%S").date()
-        
-        with open(log_file, 'r', encoding='utf-8') as f:
-            log_content = f.read()
-        
-        # 로그에서 시간 정보 추출
-        timeline_events = []
-        for line in log_content.split('\n'):
-            if '[' in line and ']' in line:
-                try:
-                    time_part = line.split('[')[1].split(']')[0]
-                    event_part = line.split(']')[1].strip()
-                    
-                    if 'TASK' in event_part or 'PLAY' in event_part:
-                        # HH:MM:SS 형식을 실제 datetime으로 변환
-                        hour, minute, second = map(int, time_part.split(':'))
-                        event_datetime = datetime.combine(execution_date, datetime.min.time().replace(
-                            hour=hour, minute=minute, second=second
-                        ))
-                        
-                        timeline_events.append({
-                            'start_time': event_datetime,
-                            'end_time': event_datetime + pd.Timedelta(seconds=30),  # 30초 지속으로 가정
-                            'event': event_part[:50] + '...' if len(event_part) > 50 else event_part,
-                            'type': 'TASK' if 'TASK' in event_part else 'PLAY'
-                        })
-                except:
-                    continue
-        
-        if timeline_events:
-            timeline_df = pd.DataFrame(timeline_events)
-            
-            # Gantt 차트 스타일의 타임라인
-            fig = px.timeline(
-                timeline_df,
-                x_start="start_time",
-                x_end="end_time", 
-                y="event",
-                color="type",
-                title=f"Ansible 실행 타임라인 ({execution_date.strftime('%Y-%m-%d')})",
-                color_discrete_map={
-                    'TASK': '#1f77b4',
-                    'PLAY': '#ff7f0e'
-                }
-            )
-            
-            # x축 시간 형식 개선
-            fig.update_xaxes(
-                title="실행 시간",
-                tickformat="%H:%M:%S"
-            )
-            fig.update_yaxes(title="실행 항목")
-            fig.update_layout(height=600, showlegend=True)
-            return fig
-            
+        profile_df = get_task_profile(timestamp)
+        if profile_df is not None and not profile_df.empty:
+            return _create_profile_timeline(timestamp, profile_df)
+        return _create_log_timeline(timestamp)
     except Exception as e:
         st.error(f"타임라인 생성 실패: {str(e)}")
     
     return None
 
+def _create_profile_timeline(timestamp, profile_df):
+    """점검별 실행 구간 타임라인 (모든 호스트 중 첫 시작 ~ 마지막 종료)"""
+    spans = summarize_check_spans(profile_df)
+    timeline_df = pd.DataFrame({
+        'start_time': [datetime.fromtimestamp(value) for value in spans['start']],
+        'end_time': [datetime.fromtimestamp(value) for value in spans['end']],
+        'event': spans['check'].astype(str),
+        'hosts': spans['hosts']
+    })
+    timeline_df['duration'] = (timeline_df['end_time'] - timeline_df['start_time']).dt.total_seconds().round(1)
+    
+    execution_date = datetime.strptime(timestamp, "%Y%m%d_%H%M%S").date()
+    fig = px.timeline(
+        timeline_df,
+        x_start="start_time",
+        x_end="end_time",
+        y="event",
+        color="duration",
+        hover_data={'hosts': True, 'duration': True},
+        title=f"점검별 실행 타임라인 ({execution_date.strftime('%Y-%m-%d')}, 호스트별 실제 시작/종료 시각 기준)",
+        labels={'duration': '소요 시간(초)', 'hosts': '서버 수'},
+        color_continuous_scale='Blues'
+    )
+    fig.update_xaxes(title="실행 시간", tickformat="%H:%M:%S")
+    fig.update_yaxes(title="점검 항목", autorange="reversed")
+    fig.update_layout(height=max(400, 22 * len(timeline_df)), showlegend=False)
+    return fig
+
+def _create_log_timeline(timestamp):
+    """로그 기준 타임라인 (프로파일이 없는 실행, 각 항목은 같은 샤드의 다음 PLAY/TASK 시작까지로 표시)"""
+    log_index = get_log_index(timestamp)
+    
+    if log_index is None:
+        return None
+    
+    # timestamp에서 실행 날짜 추출 (예: 20250620_141836)
+    execution_date = datetime.strptime(timestamp, "%Y%m%d_%H%M%S").date()
+    execution_start = datetime.combine(execution_date, datetime.min.time())
+    
+    # 색인된 PLAY/TASK 경계를 실제 datetime으로 변환 (자정을 넘기면 다음 날로)
+    events = log_index['events']
+    seconds = events['seconds'].astype(np.int64)
+    
+    if not len(seconds):
+        return None
+    
+    day_offsets = np.concatenate(([0], np.cumsum(np.diff(seconds) < -12 * 3600)))
+    start_times = pd.Series(pd.Timestamp(execution_start) + pd.to_timedelta(seconds + day_offsets * 24 * 3600, unit='s'))
+    # 샤드 실행은 샤드별로 이벤트가 섞여 있으므로 같은 샤드 안에서 다음 이벤트 시작을 종료 시각으로 사용
+    shards = pd.Series([event.split(') ', 1)[0] if event.startswith('(shard') else '' for event in events['event']])
+    end_times = start_times.groupby(shards).shift(-1).fillna(start_times)
+    
+    timeline_df = pd.DataFrame({
+        'start_time': start_times,
+        'end_time': end_times,
+        'event': [_timeline_label(event) for event in events['event']],
+        'type': events['type']
+    })
+    
+    # Gantt 차트 스타일의 타임라인
+    fig = px.timeline(
+        timeline_df,
+        x_start="start_time",
+        x_end="end_time", 
+        y="event",
+        color="type",
+        title=f"Ansible 실행 타임라인 ({execution_date.strftime('%Y-%m-%d')})",
+        color_discrete_map={
+            'TASK': '#1f77b4',
+            'PLAY': '#ff7f0e'
+        }
+    )
+    
+    # x축 시간 형식 개선
+    fig.update_xaxes(
+        title="실행 시간",
+        tickformat="%H:%M:%S"
+    )
+    fig.update_yaxes(title="실행 항목")
+    fig.update_layout(height=600, showlegend=True)
+    return fig
+
+def create_task_profile_charts(profile_df):
+    """느린 점검 / 느린 서버 차트와 느린 태스크 표 (태스크 프로파일 기준)"""
+    slowest_checks = summarize_slowest_checks(profile_df)
+    slowest_hosts = summarize_slowest_hosts(profile_df)
+    slowest_tasks = summarize_slowest_tasks(profile_df)
+    
+    fig_checks = px.bar(
+        slowest_checks,
+        x='total_seconds',
+        y='check',
+        orientation='h',
+        hover_data=['mean_seconds', 'max_seconds', 'hosts'],
+        title="🐢 느린 점검 항목 (전체 서버 소요 시간 합계)",
+        labels={'total_seconds': '소요 시간 합계(초)', 'check': '점검 항목', 'mean_seconds': '서버당 평균(초)',
+                'max_seconds': '서버 최대(초)', 'hosts': '서버 수'}
+    )
+    fig_checks.update_yaxes(autorange="reversed")
+    fig_checks.update_layout(height=500)
+    
+    fig_hosts = px.bar(
+        slowest_hosts,
+        x='wall_seconds',
+        y='host',
+        orientation='h',
+        hover_data=['busy_seconds', 'tasks'],
+        title="🐢 느린 서버 (첫 태스크 시작 ~ 마지막 태스크 종료)",
+        labels={'wall_seconds': '점검 소요 시간(초)', 'host': '서버', 'busy_seconds': '태스크 시간 합계(초)',
+                'tasks': '태스크 수'}
+    )
+    fig_hosts.update_yaxes(autorange="reversed")
+    fig_hosts.update_layout(height=500)
+    
+    return fig_checks, fig_hosts, slowest_tasks
+
 def calculate_execution_time(timestamp):
-    """로그에서 실행 시간을 계산"""
-    log_file = f"logs/ansible_execute_log_{timestamp}.log"
+    """로그 기준 실행 시간 (로그가 바뀌지 않았으면 캐시된 값 반환)"""
+    return get_cached_run_data('execution_time', timestamp, lambda: _calculate_execution_time(timestamp))
+
+def _calculate_execution_time(timestamp):
+    """로그 색인의 첫/마지막 타임스탬프로 실행 시간 계산 (날짜가 바뀐 경우 포함)"""
+    log_index = get_log_index(timestamp)
     
-    if not os.path.exists(log_file):
+    if log_index is None or log_index['duration_seconds'] is None:
         return None
+    
+    # 분:초 형식으로 변환
+    minutes, seconds = divmod(log_index['duration_seconds'], 60)
+    return f"{minutes}분 {seconds}초"
+
+@st.fragment
+def render_dashboard_tab(timestamp, df, result_data, summary):
+    """종합 대시보드 탭 (요약 집계 기반 지표/차트)"""
+    totals = summary['totals']
+    
+    # === 종합 대시보드 ===
+    st.header("📋 보안 점검 종합 현황")
+    
+    # 핵심 메트릭 (실질적 상태 기준으로 모두 수정)
+    total_checks = totals['total_checks']
+    
+    # 실질적 취약/양호 상태 (요약 집계)
+    actual_vulnerable_items = totals['actual_vulnerable']
+    actual_safe_items = totals['actual_safe']
+    
+    remediation_needed = totals['remediation_needed']
+    remediation_complete = totals['remediation_complete']
+    
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("🔍 총 점검 항목", total_checks)
+    col2.metric("⚠️ 실질적 취약점", actual_vulnerable_items, delta=f"{(actual_vulnerable_items/total_checks*100):.1f}%")
+    col3.metric("✅ 실질적 양호", actual_safe_items, delta=f"{(actual_safe_items/total_checks*100):.1f}%")
+    col4.metric("🔧 조치 필요", remediation_needed)
+    col5.metric("🛡️ 조치 완료", remediation_complete)
+    
+    # 보안 개선 효과 메트릭 추가
+    st.markdown("### 🚀 보안 개선 효과 분석")
+    col1, col2, col3, col4 = st.columns(4)
+    
+    col1.metric("🟢 원래부터 양호", totals['originally_safe'], 
+               help="처음 점검 시부터 보안 설정이 올바르게 되어 있던 항목")
+    col2.metric("🔄 조치 후 양호", totals['remediated_safe'], 
+               help="취약점이 발견되었지만 Ansible 자동 조치로 양호해진 항목")
+    
+    if totals['remediated_safe'] > 0:
+        # 전체 발견된 문제 중에서 자동 해결된 비율
+        total_issues_found = totals['action_attempted']  # 조치가 시도된 항목들
+        if total_issues_found > 0:
+            improvement_rate = totals['remediated_safe'] / total_issues_found * 100
+            col3.metric("📈 자동 해결율", f"{improvement_rate:.1f}%",
+                       help="조치가 시도된 항목 중 성공적으로 해결된 비율")
+        else:
+            col3.metric("📈 자동 해결율", "0%")
+    else:
+        col3.metric("📈 자동 해결율", "0%")
         
-    try:
-        with open(log_file, 'r', encoding='utf-8') as f:
-            log_content = f.read()
+    col4.metric("🎯 전체 보안율", f"{(actual_safe_items/total_checks*100):.1f}%",
+               help="조치 완료 포함한 실질적으로 양호한 항목의 비율")
+    
+    st.markdown(" ")
+    
+    # 보안 개선 효과 차트
+    fig_improvement1, fig_improvement2, improvement_data = get_report_figure(
+        timestamp, 'security_improvement', lambda: create_security_improvement_analysis(summary)
+    )
+    if fig_improvement1 and fig_improvement2:
+        col1, col2 = st.columns(2)
+        with col1:
+            st.plotly_chart(fig_improvement1, use_container_width=True)
+        with col2:
+            st.plotly_chart(fig_improvement2, use_container_width=True)
         
-        lines = log_content.split('\n')
-        start_time = None
-        end_time = None
+        # 개선 효과 상세 테이블
+        with st.expander("📊 보안 개선 효과 상세 통계"):
+            st.dataframe(improvement_data['stats'], use_container_width=True, hide_index=True)
+            
+            if totals['remediated_safe'] > 0:
+                # 개별 항목 목록은 원본 결과에서 조회
+                st.subheader("🔄 자동 조치로 개선된 항목들")
+                remediated_safe = df[df['조치 여부'] & df['조치_완료']]
+                remediated_display = remediated_safe[['호스트', '작업 설명', '조치 결과']].copy()
+                st.dataframe(remediated_display, use_container_width=True)
+            else:
+                st.info("자동 조치로 개선된 항목이 없습니다.")
+    
+    # 서버 비교 차트 (서버별 요약 집계 사용)
+    fig_server_comparison = get_report_figure(timestamp, 'server_comparison', lambda: create_server_comparison_chart(summary))
+    if fig_server_comparison:
+        st.plotly_chart(fig_server_comparison, use_container_width=True)
+
+@st.fragment
+def render_server_tab(timestamp, df, result_data, summary):
+    """서버별 분석 탭 (서버 선택 시 이 탭만 다시 실행)"""
+    totals = summary['totals']
+    
+    # === 서버별 분석 ===
+    st.header("🖥️ 서버별 상세 분석")
+    
+    # 서버 선택
+    selected_server = st.selectbox(
+        "분석할 서버 선택:",
+        options=['전체'] + result_data['servers'],
+        index=0
+    )
+    
+    # 서버별 집계는 요약에서 바로 필터 (원본 결과를 다시 집계하지 않음)
+    server_counts = summary['server_counts']
+    task_counts = summary['task_counts']
+    if selected_server != '전체':
+        server_counts = server_counts[server_counts['호스트'] == selected_server]
+        task_counts = task_counts[task_counts['호스트'] == selected_server]
+    
+    if len(server_counts) > 0:
+        # 서버별 통계 (실질적 상태 기준) - 2열로 변경
+        col1, col2 = st.columns(2)
         
-        # 시작 시간과 종료 시간 찾기
-        for line in lines:
-            if '[' in line and ']' in line:
-                try:
-                    time_part = line.split('[')[1].split(']')[0]
-                    # 첫 번째 타임스탬프를 시작 시간으로
-                    if start_time is None:
-                        start_time = time_part
-                    # 마지막 타임스탬프를 종료 시간으로 계속 업데이트
-                    end_time = time_part
-                except:
-                    continue
+        with col1:
+            st.subheader("📊 점검 현황 (실질적 상태)")
+            server_stats = server_counts.set_index('호스트')[['총_점검', '실질적_양호', '실질적_취약']]
+            server_stats.columns = ['총점검', '실질적_양호', '실질적_취약']
+            st.dataframe(server_stats, use_container_width=True)
         
-        if start_time and end_time:
-            # 시간 형식: HH:MM:SS
-            start_h, start_m, start_s = map(int, start_time.split(':'))
-            end_h, end_m, end_s = map(int, end_time.split(':'))
+        with col2:
+            st.subheader("🔧 조치 현황")
+            # 조치 현황을 더 세분화해서 표시
+            remediation_detailed = server_counts.set_index('호스트')[['원래_양호', '조치_완료', '수동_조치_필요', '조치_불필요']]
+            remediation_detailed.columns = ['원래부터 양호', '조치 완료', '수동 조치 필요', '조치 불필요']
             
-            start_seconds = start_h * 3600 + start_m * 60 + start_s
-            end_seconds = end_h * 3600 + end_m * 60 + end_s
+            st.dataframe(remediation_detailed, use_container_width=True)
+        
+        # 점검 유형을 별도 행으로 이동
+        st.subheader("📋 점검 유형 (전체)")
+        task_stats = task_counts.groupby('작업 설명')['총_점검'].sum().sort_values(ascending=False)
+        
+        # 표 형태로 변환
+        task_df = pd.DataFrame({
+            '점검 항목': task_stats.index,
+            '점검 횟수': task_stats.values
+        })
+        
+        st.dataframe(task_df, use_container_width=True, hide_index=True)
+        
+        # 서버별 취약점 히트맵 (실질적 상태 기준)
+        if len(result_data['servers']) > 1:
+            st.subheader("🔥 서버-취약점 히트맵 (실질적 상태)")
+            fig_heatmap = get_report_figure(timestamp, 'server_heatmap', lambda: create_server_heatmap(summary))
+            if fig_heatmap:
+                st.plotly_chart(fig_heatmap, use_container_width=True)
+    else:
+        st.info("선택한 서버의 데이터가 없습니다.")
+
+@st.fragment
+def render_vulnerability_tab(timestamp, df, result_data, summary):
+    """취약점 상세 탭 (필터 변경 시 이 탭만 다시 실행)"""
+    totals = summary['totals']
+    total_checks = totals['total_checks']
+    
+    # === 취약점 상세 ===
+    st.header("🔍 취약점 및 실패 상세 분석")
+    
+    # 실질적으로 취약한 항목만 표시 (조치 완료 제외) - 개별 항목 목록은 원본 결과에서 조회
+    vulnerable_df = df[df['실질적_양호상태'] == False]
+    
+    if totals['actual_vulnerable'] > 0:
+        st.subheader(f"⚠️ 실질적 취약점 ({totals['actual_vulnerable']}개)")
+        st.info("💡 '조치 완료'된 항목은 해결된 것으로 간주하여 제외됩니다.")
+        
+        # 취약점 상세 차트 (실질적 취약점 기준, 요약 집계 사용)
+        fig1, fig2 = get_report_figure(
+            timestamp, 'vulnerability_details', lambda: create_vulnerability_details_analysis(summary)
+        )
+        if fig1:
+            st.plotly_chart(fig1, use_container_width=True)
+        if fig2:
+            st.plotly_chart(fig2, use_container_width=True)
             
-            # 날짜가 바뀐 경우 처리
-            if end_seconds < start_seconds:
-                end_seconds += 24 * 3600
+    else:
+        st.success("🛡️ 모든 취약점이 해결되었습니다!")
+        st.info("일부 항목은 '조치 완료' 상태로 자동 해결되었습니다.")
+    
+    # 조치 완료된 항목들도 별도로 표시
+    resolved_items = df[df['조치 여부'] & df['조치_완료']]
+    
+    if len(resolved_items) > 0:
+        st.subheader(f"✅ 자동 해결된 항목들 ({len(resolved_items)}개)")
+        
+        with st.expander("🔧 Ansible이 자동으로 해결한 취약점들"):
+            for idx, row in resolved_items.iterrows():
+                st.markdown(f"**{row['호스트']}** - {row['작업 설명']}")
+                st.markdown(f"- 상태: {row['조치 결과']}")
+                if row['취약 사유']:
+                    st.markdown(f"- 원인: {row['취약 사유']}")
+                st.markdown("---")
+    
+    # 실질적 취약점이 있는 경우에만 상세 분석 표시
+    if len(vulnerable_df) > 0:
+        # 취약점 상세 테이블
+        st.subheader("📋 실질적 취약점 상세 목록")
+        
+        # 필터링 옵션
+        col1, col2 = st.columns(2)
+        with col1:
+            filter_server = st.multiselect(
+                "서버 필터:", 
+                options=vulnerable_df['호스트'].unique(),
+                default=vulnerable_df['호스트'].unique()
+            )
+        with col2:
+            filter_remediation = st.selectbox(
+                "조치 상태 필터:",
+                options=['전체', '수동 조치 필요', '미조치', '실패'],
+                index=0
+            )
+        
+        # 필터 적용
+        filtered_vuln = vulnerable_df[vulnerable_df['호스트'].isin(filter_server)]
+        if filter_remediation != '전체':
+            filtered_vuln = filtered_vuln[match_result_pattern(filtered_vuln['조치 결과'], filter_remediation)]
+        
+        # 상세 정보 표시
+        for idx, row in filtered_vuln.iterrows():
+            with st.expander(f"🚨 {row['호스트']} - {row['작업 설명']}", expanded=False):
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.write(f"**진단 결과:** {row['진단 결과']}")
+                    st.write(f"**플레이북:** {row['플레이북']}")
+                    st.write(f"**조치 상태:** {row['조치 결과']}")
+                    if row['취약 파일 수'] > 0:
+                        st.write(f"**영향받는 파일:** {row['취약 파일 수']}개")
+                
+                with col2:
+                    if row['취약 사유']:
+                        st.write("**취약 사유:**")
+                        st.info(row['취약 사유'])
+                    if row['권장사항']:
+                        st.write("**권장사항:**")
+                        st.success(row['권장사항'])
+                
+                # 추가 기술적 세부사항
+                if row['현재 권한'] or row['현재 소유자']:
+                    st.markdown("**🔧 기술적 세부사항:**")
+                    tech_details = []
+                    if row['현재 권한']:
+                        tech_details.append(f"현재 권한: `{row['현재 권한']}`")
+                    if row['현재 소유자']:
+                        tech_details.append(f"현재 소유자: `{row['현재 소유자']}`")
+                    st.markdown(" | ".join(tech_details))
+    
+    # 🆕 실패 분석 섹션 추가
+    st.markdown("---")
+    st.subheader("❌ 실행 실패 분석")
+    
+    # 실패한 작업 분석
+    fig_fail1, fig_fail2, failure_data = get_report_figure(timestamp, 'failure_analysis', lambda: create_failure_analysis(summary))
+    
+    if failure_data and 'message' in failure_data:
+        st.success("✅ " + failure_data['message'])
+    elif failure_data:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("총 실패 작업", failure_data['total_failures'])
+        with col2:
+            st.metric("영향받은 서버", failure_data['affected_servers'])
+        with col3:
+            failure_rate = failure_data['total_failures'] / total_checks * 100 if total_checks > 0 else 0
+            st.metric("실패율", f"{failure_rate:.1f}%")
+        
+        # 실패 차트
+        if fig_fail1 and fig_fail2:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.plotly_chart(fig_fail1, use_container_width=True)
+            with col2:
+                st.plotly_chart(fig_fail2, use_container_width=True)
+        
+        # 실패 상세 목록
+        with st.expander("🔍 실패한 작업 상세 목록", expanded=False):
+            failed_items = df[df['실패_유형'].notna()]
+            for failure in failed_items[['호스트', '작업 설명', '조치 결과', '취약 사유']].to_dict('records'):
+                st.markdown(f"**{failure['호스트']}** - {failure['작업 설명']}")
+                st.markdown(f"- 실패 사유: {failure['조치 결과']}")
+                if failure['취약 사유']:
+                    st.markdown(f"- 원인: {failure['취약 사유']}")
+                st.markdown("---")
+    
+    # 🆕 접근 불가능한 서버 분석
+    st.subheader("🔌 서버 접근성 분석")
+    
+    fig_unreachable, unreachable_data = get_report_figure(timestamp, 'unreachable_hosts', lambda: create_unreachable_hosts_analysis(summary))
+    
+    if unreachable_data and 'message' in unreachable_data:
+        st.success("✅ " + unreachable_data['message'])
+    elif unreachable_data:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("접근 불가 서버", unreachable_data['total_unreachable'])
+        with col2:
+            st.metric("접근 가능 서버", len(unreachable_data['reachable_servers']))
+        with col3:
+            st.metric("접근 성공률", f"{unreachable_data['success_rate']:.1f}%")
+        
+        if fig_unreachable:
+            st.plotly_chart(fig_unreachable, use_container_width=True)
+        
+        # 접근 불가 서버 목록
+        if unreachable_data['unreachable_servers']:
+            with st.expander("⚠️ 접근 불가능한 서버 목록"):
+                for server in unreachable_data['unreachable_servers']:
+                    st.markdown(f"- **{server}**: 네트워크 연결 실패 또는 SSH 접근 불가")
+                    
+                st.info("💡 해결 방법: SSH 키 설정, 네트워크 연결, 방화벽 설정을 확인하세요.")
+                
+        # 조치 시도했지만 무시된 항목들 별도 표시 (있을 때만 원본 결과에서 목록 조회)
+        if totals['ignored_actions'] > 0:
+            ignored_items = df[df['조치 여부'] & df['조치_무시']]
+            st.subheader(f"⚠️ 조치 시도했지만 무시된 항목들 ({len(ignored_items)}개)")
+            st.info("💡 이 항목들은 실행 중 문제가 발생했지만 ignore_errors 설정으로 전체 실행은 계속되었습니다.")
             
-            duration_seconds = end_seconds - start_seconds
+            with st.expander("🔧 무시된 항목들 상세보기"):
+                for idx, row in ignored_items.iterrows():
+                    st.markdown(f"**{row['호스트']}** - {row['작업 설명']}")
+                    st.markdown(f"- 상태: {row['조치 결과']}")
+                    if row['취약 사유']:
+                        st.markdown(f"- 원인: {row['취약 사유']}")
+                    st.markdown("---")
+
+@st.fragment
+def render_execution_tab(timestamp, df, result_data, summary):
+    """실행 분석 탭 (타임라인/실행 통계/로그 요약)"""
+    totals = summary['totals']
+    total_checks = totals['total_checks']
+    
+    # === 실행 분석 ===
+    st.header("⏱️ Ansible 실행 분석")
+    
+    # 실행 타임라인
+    fig_timeline = create_execution_timeline(timestamp)
+    if fig_timeline:
+        st.plotly_chart(fig_timeline, use_container_width=True)
+    else:
+        st.info("실행 타임라인 데이터를 생성할 수 없습니다.")
+    
+    # 실행 통계 (실질적 상태 기준)
+    st.subheader("📊 실행 통계")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        # 실제 실행 시간 계산
+        execution_time = calculate_execution_time(timestamp)
+        if execution_time:
+            st.metric("⏱️ 전체 실행 시간", execution_time)
+        
+        st.metric("📊 평균 서버당 점검", f"{total_checks / len(result_data['servers']) if result_data['servers'] else 0:.1f}개 점검/서버")
+    
+    # 🆕 실패 현황 메트릭 추가 (ignore 포함)
+    attempted_failed_tasks = totals['issue_results']
+    ignored_tasks = totals['ignored_results']
+    unreachable_count = len(set(summary['servers']) - set(summary['reachable_servers']))
+
+    col5, col6 = st.columns(2)
+    with col5:
+        if attempted_failed_tasks > 0:
+            st.warning(f"⚠️ **{attempted_failed_tasks}**개 조치 문제")
+            if ignored_tasks > 0:
+                st.caption(f"└ 그 중 {ignored_tasks}개는 무시됨")
+        else:
+            st.success("✅ **모든 조치 성공**")
+
+    with col6:
+        if unreachable_count > 0:
+            st.warning(f"🔌 **{unreachable_count}**개 서버 접근불가")
+        else:
+            st.success("🌐 **모든 서버 접근가능**")
+    
+    with col2:
+        # 실질적 성공률
+        success_rate = (totals['actual_safe'] / total_checks * 100) if total_checks > 0 else 0
+        st.metric("✅ 실질적 성공률", f"{success_rate:.1f}%")
+        
+        automation_rate = (totals['automated'] / total_checks * 100) if total_checks > 0 else 0
+        st.metric("🔧 자동 조치율", f"{automation_rate:.1f}%")
+    
+    with col3:
+        st.metric("🖥️ 점검된 서버 수", len(result_data['servers']))
+        st.metric("📋 점검 항목 유형", len(result_data['check_types']))
+    
+    # 실행 시간 프로파일 (콜백이 기록한 호스트별 태스크 시작/종료 시각)
+    st.subheader("🐢 실행 시간 프로파일")
+    
+    profile_df = get_task_profile(timestamp)
+    if profile_df is not None and not profile_df.empty:
+        fig_checks, fig_hosts, slowest_tasks = get_report_figure(
+            timestamp, 'task_profile', lambda: create_task_profile_charts(profile_df)
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            st.plotly_chart(fig_checks, use_container_width=True)
+        with col2:
+            st.plotly_chart(fig_hosts, use_container_width=True)
+        
+        with st.expander("⏱️ 가장 오래 걸린 태스크"):
+            st.dataframe(
+                slowest_tasks.rename(columns={
+                    'host': '서버', 'check': '점검 항목', 'task': '태스크', 'status': '상태', 'duration': '소요 시간(초)'
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+    else:
+        st.info("이 실행에는 태스크 실행 시간 기록이 없습니다. (프로파일 콜백 도입 이전 실행)")
+    
+    # 실행 로그 요약
+    st.subheader("📋 실행 로그 요약")
+    
+    try:
+        log_index = get_log_index(timestamp)  # 로그가 바뀌지 않았으면 캐시된 색인 사용
+        if log_index is not None:
+            # 로그 통계 (색인 생성 시 함께 계산)
+            keyword_counts = log_index['keyword_counts']
             
-            # 분:초 형식으로 변환
-            minutes = duration_seconds // 60
-            seconds = duration_seconds % 60
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("총 로그 라인", log_index['line_count'])
+            col2.metric("성공 메시지", keyword_counts['success'])
+            col3.metric("경고 메시지", keyword_counts['warning'])
+            col4.metric("오류 메시지", keyword_counts['error'])
             
-            return f"{minutes}분 {seconds}초"
+            # 로그 미리보기 (마지막 20줄만 오프셋으로 읽음)
+            preview_lines = read_log_lines(log_index, log_index['line_count'] - 20, log_index['line_count'])
+            
+            with st.expander("📄 로그 미리보기 (마지막 20줄)"):
+                st.code('\n'.join(preview_lines), language="text")
+        else:
+            st.warning("로그 파일을 찾을 수 없습니다.")
             
     except Exception as e:
-        return None
-    
-    return None
-    """실행 타임라인 분석"""
-    log_file = f"logs/ansible_execute_log_{timestamp}.log"
+        st.error(f"로그 파일 읽기 실패: {str(e)}")
+
+@st.fragment
+def render_raw_data_tab(timestamp, df, result_data, summary):
+    """원본 데이터 탭 (컬럼/필터 선택 시 이 탭만 다시 실행)"""
+    # === 원본 데이터 ===
+    st.header("📄 원본 데이터 및 다운로드")
+    
+    # 파일 정보 표시
+    st.subheader("📂 로드된 파일 정보")
+    
+    if result_data['file_info']:
+        file_info_df = pd.DataFrame(result_data['file_info'])
+        
+        # 파일 크기를 읽기 쉽게 변환
+        def format_file_size(size_bytes):
+            if size_bytes < 1024:
+                return f"{size_bytes} B"
+            elif size_bytes < 1024**2:
+                return f"{size_bytes/1024:.1f} KB"
+            else:
+                return f"{size_bytes/(1024**2):.1f} MB"
+        
+        file_info_df['readable_size'] = file_info_df['size'].apply(format_file_size)
+        
+        # 표시할 컬럼 선택
+        display_file_info = file_info_df[['filename', 'readable_size', 'data_type']].copy()
+        display_file_info.columns = ['파일명', '크기', '데이터 타입']
+        
+        st.dataframe(display_file_info, use_container_width=True)
+    else:
+        st.info("파일 정보가 없습니다.")
+    
+    # 데이터 요약 통계
+    st.subheader("📊 데이터 요약")
+    col1, col2, col3, col4 = st.columns(4)
+    
+    col1.metric("총 데이터 항목", len(df))
+    col2.metric("처리된 서버", len(result_data['servers']))
+    col3.metric("점검 유형", len(result_data['check_types']))
+    col4.metric("결과 파일", result_data['total_files'])
+    
+    # 전체 데이터 테이블
+    st.subheader("🔍 세부 데이터 보기")
+    
+    # 컬럼 선택 기능
+    available_columns = REPORT_DATA_COLUMNS
+    selected_columns = st.multiselect(
+        "표시할 컬럼 선택:",
+        options=available_columns,
+        default=['호스트', '작업 설명', '진단 결과', '실질적_양호상태', '조치 결과']
+    )
     
-    if not os.path.exists(log_file):
-        return None
+    if selected_columns:
+        # 필터링 옵션 (실질적 상태 기준)
+        col1, col2 = st.columns(2)
         
-    try:
-        with open(log_file, 'r', encoding='utf-8') as f:
-            log_content = f.read()
+        with col1:
+            show_only_vulnerable = st.checkbox("실질적 취약점만 표시", value=False)
         
-        # 로그에서 시간 정보 추출
-        timeline_events = []
-        for line in log_content.split('\n'):
-            if '[' in line and ']' in line:
-                try:
-                    time_part = line.split('[')[1].split(']')[0]
-                    event_part = line.split(']')[1].strip()
-                    
-                    if 'TASK' in event_part or 'PLAY' in event_part:
-                        timeline_events.append({
-                            'time': time_part,
-                            'event': event_part[:50] + '...' if len(event_part) > 50 else event_part,
-                            'type': 'TASK' if 'TASK' in event_part else 'PLAY'
-                        })
-                except:
-                    continue
+        with col2:
+            show_only_manual = st.checkbox("수동 조치 필요 항목만 표시", value=False)
         
-        if timeline_events:
-            timeline_df = pd.DataFrame(timeline_events)
+        # 필터 적용
+        filtered_df = df
+        
+        if show_only_vulnerable:
+            filtered_df = filtered_df[filtered_df['실질적_양호상태'] == False]
+        
+        if show_only_manual:
+            filtered_df = filtered_df[match_result_pattern(filtered_df['조치 결과'], "수동")]
+        
+        # 데이터 표시
+        if len(filtered_df) > 0:
+            st.dataframe(filtered_df[selected_columns], use_container_width=True)
             
-            fig = px.timeline(
-                timeline_df,
-                x_start="time",
-                x_end="time", 
-                y="event",
-                color="type",
-                title="Ansible 실행 타임라인"
+            # 수동 조치 필요 항목 강조 표시
+            manual_items = filtered_df[filtered_df['수동_조치_필요']]
+            if len(manual_items) > 0:
+                st.warning(f"🔧 **수동 조치 필요 항목: {len(manual_items)}개**")
+                
+                with st.expander("🚨 수동 조치 필요 항목 상세보기"):
+                    for idx, row in manual_items.iterrows():
+                        st.markdown(f"**{row['호스트']}** - {row['작업 설명']}")
+                        if row['취약 사유']:
+                            st.markdown(f"- 사유: {row['취약 사유']}")
+                        if row['권장사항']:
+                            st.markdown(f"- 권장사항: {row['권장사항']}")
+                        st.markdown("---")
+        else:
+            st.info("필터 조건에 맞는 데이터가 없습니다.")
+    else:
+        st.info("표시할 컬럼을 선택해주세요.")
+    
+    # 다운로드 섹션 (요청할 때만 번들/원본 JSON 을 만들어 전송)
+    st.subheader("⬇️ 데이터 다운로드")
+    st.caption("📦 내보내기 번들: 결과 Parquet/CSV, 실질적 취약점 CSV, 요약 집계, 태스크 프로파일, 압축 실행 로그 (ZIP)")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # 번들은 처음 요청할 때 디스크에 한 번 만들고, 원본이 바뀌지 않았으면 모든 세션이 재사용
+        if st.checkbox("📦 내보내기 번들 준비", key=f"prepare_export_{timestamp}"):
+            try:
+                with st.spinner("📦 내보내기 번들 생성 중..."):
+                    bundle_path = get_export_bundle(timestamp)
+                if bundle_path:
+                    # 번들은 정적 파일 서빙으로 디스크에서 바로 내려보냄 (download_button 은 파일 전체를 메모리에 올림)
+                    bundle_size = os.path.getsize(bundle_path)
+                    bundle_name = os.path.basename(bundle_path)
+                    if not st.get_option("server.enableStaticServing"):
+                        st.warning(f"정적 파일 서빙이 꺼져 있어 번들을 내려받을 수 없습니다. "
+                                   f"(.streamlit/config.toml 의 server.enableStaticServing 확인, 서버 경로: {bundle_path})")
+                    elif bundle_size > EXPORT_STATIC_MAX_BYTES:
+                        st.warning(f"번들이 정적 파일 서빙 한도({EXPORT_STATIC_MAX_BYTES // (1024 * 1024)} MB)를 넘어 "
+                                   f"웹에서 내려받을 수 없습니다. 서버에서 직접 가져가세요: {bundle_path}")
+                    else:
+                        st.markdown(
+                            f'<a href="{get_export_bundle_url(bundle_path)}" download="{bundle_name}">'
+                            f'📦 내보내기 번들 다운로드 ({bundle_size / (1024 * 1024):.1f} MB)</a>',
+                            unsafe_allow_html=True
+                        )
+                else:
+                    st.warning("내보낼 결과가 없습니다.")
+            except Exception as e:
+                st.error(f"내보내기 번들 생성 실패: {str(e)}")
+    
+    with col2:
+        # JSON 원본 데이터 다운로드 (원본 보고서는 요청할 때만 결과 JSON 에서 읽음)
+        if st.checkbox("📋 원본 JSON 준비", key=f"prepare_raw_json_{timestamp}"):
+            raw_reports, _ = read_result_json_files(f"playbooks/playbook_result_{timestamp}/results")
+            json_data = json.dumps(raw_reports, ensure_ascii=False, indent=2)
+            st.download_button(
+                "📋 원본 JSON 다운로드",
+                json_data,
+                f"raw_data_{timestamp}.json",
+                "application/json"
             )
-            fig.update_layout(height=600)
-            return fig
             
-    except Exception as e:
-        st.error(f"타임라인 생성 실패: {str(e)}")
+    # 로그 파일 내용 표시 (보이는 페이지만 오프셋으로 읽음)
+    st.subheader("📋 실행 로그 전체보기")
     
-    return None
+    try:
+        log_index = get_log_index(timestamp)  # 로그가 바뀌지 않았으면 캐시된 색인 사용
+        if log_index is not None:
+            render_log_viewer(timestamp, log_index, result_data['servers'])
+        else:
+            st.warning(f"로그 파일을 찾을 수 없습니다: {resolve_log_path(timestamp)}")
+    except Exception as e:
+        st.error(f"로그 파일 읽기 실패: {str(e)}")
 
-def get_log_content(timestamp):
-    """로그 파일 내용을 반환하는 함수 (다운로드 버튼 없이)"""
-    log_file = f"logs/ansible_execute_log_{timestamp}.log"
+def search_run_log(timestamp, log_index, term, regex, case):
+    """로그 검색 결과 (로그가 바뀌지 않았으면 같은 검색어는 캐시된 결과 반환)"""
+    return get_cached_run_data(f'log_search:{regex}:{case}:{term}', timestamp,
+                               lambda: search_log(log_index, term, regex=regex, case=case))
+
+def get_log_tasks(timestamp, log_index):
+    """로그의 TASK 이동 목록 (로그가 바뀌지 않았으면 캐시된 목록 반환)"""
+    return get_cached_run_data('log_tasks', timestamp, lambda: list_log_tasks(log_index))
+
+def render_log_viewer(timestamp, log_index, servers=None):
+    """라인 오프셋 색인 기반 로그 뷰어 (현재 페이지만 읽어 표시, 서버 측 검색, 태스크/서버 위치로 이동)"""
+    key = f"log_viewer_{timestamp}"
+    line_count = log_index['line_count']
+    if not line_count:
+        st.info("로그가 비어 있습니다.")
+        return
     
-    if os.path.exists(log_file):
+    start_key = f"{key}_start"
+    search_key = f"{key}_search"
+    st.session_state[start_key] = min(st.session_state.get(start_key, 1), line_count)
+    st.session_state.setdefault(search_key, "")
+    
+    def go_to_line(line_number):
+        # 해당 라인이 페이지 가운데쯤 오도록 이동 (line_number 는 0부터)
+        page_size = st.session_state.get(f"{key}_page_size", LOG_VIEW_PAGE_SIZES[1])
+        st.session_state[start_key] = max(1, min(line_count, line_number + 1 - page_size // 4))
+    
+    def move_page(direction):
+        page_size = st.session_state.get(f"{key}_page_size", LOG_VIEW_PAGE_SIZES[1])
+        if direction == 'first':
+            start_line = 1
+        elif direction == 'last':
+            start_line = line_count - page_size + 1
+        else:
+            start_line = st.session_state[start_key] + (page_size if direction == 'next' else -page_size)
+        st.session_state[start_key] = max(1, min(line_count, start_line))
+    
+    def search_server(server):
+        st.session_state[search_key] = f"[{server}]"   # ansible 출력의 호스트 표기 (ok: [서버])
+    
+    # 서버 측 검색 (일치 라인 목록에서 선택한 위치로 이동)
+    col1, col2, col3 = st.columns([4, 1, 1])
+    with col1:
+        search_term = st.text_input("🔍 로그 검색:", placeholder="검색할 키워드를 입력하세요", key=search_key)
+    with col2:
+        use_regex = st.checkbox("정규식", key=f"{key}_regex")
+    with col3:
+        match_case = st.checkbox("대소문자 구분", key=f"{key}_case")
+    
+    if search_term:
         try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                return f.read()
-        except Exception as e:
-            st.error(f"로그 파일 읽기 실패: {str(e)}")
-            return None
-    else:
-        return None
+            search_result = search_run_log(timestamp, log_index, search_term, use_regex, match_case)
+        except re.error as e:
+            st.error(f"잘못된 정규식입니다: {str(e)}")
+            search_result = None
+        
+        if search_result is not None:
+            matches = search_result['matches']
+            st.info(f"검색 결과: {search_result['match_count']:,}개 라인에서 '{search_term}' 발견"
+                    + (f" (처음 {len(matches):,}개 표시)" if len(matches) < search_result['match_count'] else ""))
+            if matches:
+                options = matches[:LOG_SEARCH_RESULT_OPTIONS]
+                col1, col2 = st.columns([5, 1])
+                with col1:
+                    selected_match = st.selectbox(
+                        "검색 결과 위치:",
+                        options=range(len(options)),
+                        format_func=lambda i: f"{options[i]['line'] + 1:>7} | {options[i]['text'][:150]}",
+                        key=f"{key}_match"
+                    )
+                with col2:
+                    st.button("➡️ 이동", key=f"{key}_goto_match", on_click=go_to_line,
+                              args=(options[selected_match]['line'],), use_container_width=True)
+    
+    # 태스크/서버 위치로 이동
+    col1, col2, col3, col4 = st.columns([3, 1, 3, 1])
+    log_tasks = get_log_tasks(timestamp, log_index)
+    with col1:
+        selected_task = st.selectbox("📌 태스크로 이동:", options=range(len(log_tasks)),
+                                     format_func=lambda i: log_tasks[i][0], key=f"{key}_task",
+                                     disabled=not log_tasks)
+    with col2:
+        st.button("➡️ 이동", key=f"{key}_goto_task", disabled=not log_tasks, use_container_width=True,
+                  on_click=go_to_line, args=(log_tasks[selected_task][1] if log_tasks else 0,))
+    with col3:
+        selected_server = st.selectbox("🖥️ 서버 로그 찾기:", options=servers or [], key=f"{key}_server",
+                                       disabled=not servers)
+    with col4:
+        st.button("🔍 찾기", key=f"{key}_find_server", disabled=not servers, use_container_width=True,
+                  on_click=search_server, args=(selected_server,))
+    
+    # 페이지 이동
+    col1, col2, col3, col4, col5, col6 = st.columns([1, 1, 2, 2, 1, 1])
+    with col1:
+        st.button("⏮️ 처음", key=f"{key}_first", on_click=move_page, args=('first',), use_container_width=True)
+    with col2:
+        st.button("◀️ 이전", key=f"{key}_prev", on_click=move_page, args=('prev',), use_container_width=True)
+    with col3:
+        start_line = st.number_input("시작 라인", min_value=1, max_value=line_count, step=1, key=start_key)
+    with col4:
+        page_size = st.selectbox("페이지당 라인 수", LOG_VIEW_PAGE_SIZES, index=1, key=f"{key}_page_size")
+    with col5:
+        st.button("다음 ▶️", key=f"{key}_next", on_click=move_page, args=('next',), use_container_width=True)
+    with col6:
+        st.button("끝 ⏭️", key=f"{key}_last", on_click=move_page, args=('last',), use_container_width=True)
+    
+    # 현재 페이지만 바이트 오프셋으로 읽어 표시
+    lines = read_log_lines(log_index, start_line - 1, start_line - 1 + page_size)
+    end_line = start_line + len(lines) - 1
+    st.caption(f"📄 {start_line:,} ~ {end_line:,} / 전체 {line_count:,} 라인 ({log_index['size']:,} bytes)")
+    st.code('\n'.join(f"{line_number:>7} | {line}" for line_number, line in enumerate(lines, start=start_line)),
+            language="text")
 
-def parse_single_result(data):
-    """단일 결과 데이터 파싱 (개선된 버전)"""
-    # vulnerability_details에서 추가 정보 추출
-    vuln_details = data.get("vulnerability_details", {})
-    vulnerable_files = []
-    
-    # 다양한 형태의 취약 파일 정보 추출
-    if "vulnerable_files_found" in vuln_details:
-        vulnerable_files = vuln_details["vulnerable_files_found"]
-    elif "file_list" in vuln_details:
-        vulnerable_files = vuln_details["file_list"]
-    elif "vulnerable_files" in vuln_details:
-        vulnerable_files = vuln_details["vulnerable_files"]
-    
-    return pd.DataFrame([{
-        "호스트": data.get("hostname", "알 수 없음"),
-        "진단 결과": data.get("diagnosis_result", "알 수 없음"),
-        "전체 취약 여부": data.get("is_vulnerable", False),
-        "조치 여부": data.get("remediation_applied", False),
-        "조치 결과": data.get("remediation_result", ""),
-        "조치 시간": data.get("remediation_timestamp", ""),
-        "작업 설명": data.get("task_description", ""),
-        "플레이북": data.get("playbook_name", ""),
-        "취약 사유": vuln_details.get("reason", ""),
-        "취약 파일 수": len(vulnerable_files) if vulnerable_files else 0,
-        "권장사항": vuln_details.get("recommendation", ""),
-        "현재 권한": vuln_details.get("current_mode", ""),
-        "현재 소유자": vuln_details.get("current_owner", "")
-    }])
+@st.fragment
+def render_error_log_viewer(timestamp):
+    """결과가 없는 실행의 로그 뷰어 (페이지 이동/검색 시 이 영역만 다시 실행)"""
+    log_index = get_log_index(timestamp)
+    if log_index is None:
+        st.warning("로그 파일을 찾을 수 없습니다.")
+        return
+    render_log_viewer(timestamp, log_index)
 
 def main(timestamp=None):
     """메인 분석 리포트 페이지"""
@@ -812,39 +1360,25 @@ def main(timestamp=None):
                     
                     st.subheader("📋 전체 실행 로그")
                     try:
-                        with open(error['log_file'], 'r', encoding='utf-8') as f:
-                            full_log = f.read()
-                        st.code(full_log, language="text")
+                        render_error_log_viewer(timestamp)
                     except Exception as e:
                         st.error(f"로그 파일 읽기 실패: {str(e)}")
             else:
                 st.error(f"❌ {error}")
             return            
 
-        if not result_data or not result_data['data']:
+        if not result_data or result_data['df'].empty:
             st.warning("📭 분석 결과 데이터가 없습니다.")
             return
     
-    # 데이터 파싱
+    # 데이터 파싱 (결과 저장소에서 컬럼 단위로 로드된 DataFrame 사용)
     try:
-        all_dataframes = []
-        
-        for data_item in result_data['data']:
-            if isinstance(data_item, dict):
-                df = parse_single_result(data_item)
-                all_dataframes.append(df)
-        
-        if not all_dataframes:
-            st.warning("📭 파싱 가능한 데이터가 없습니다.")
-            return
+        # ⭐ 실질적 양호 상태/조치 결과 분류는 로드 시 한 번만 계산된 컬럼 사용 (캐시된 DataFrame 은 수정하지 않음)
+        df = result_data['df']
         
-        df = pd.concat(all_dataframes, ignore_index=True)
-        
-        # ⭐ 실질적 양호 상태 계산 (조치 완료도 양호로 간주)
-        df['실질적_양호상태'] = (
-            (df['전체 취약 여부'] == False) | 
-            (df['조치 결과'].str.contains("조치 완료|완료|성공", case=False, na=False))
-        )
+        # 대시보드 지표/차트는 실행 완료 시 계산된 요약 집계 사용
+        summary = load_timestamp_summary(timestamp, result_data)
+        totals = summary['totals']
         
         # 성공 메시지와 기본 통계 (실질적 상태 기준)
         col1, col2, col3, col4 = st.columns(4)
@@ -856,7 +1390,7 @@ def main(timestamp=None):
             st.warning(f"📁 **{result_data['total_files']}**개 결과 파일")
         with col4:
             # 실질적 취약점 수 (조치 완료 제외)
-            actual_vulnerable_count = len(df[df['실질적_양호상태'] == False])
+            actual_vulnerable_count = totals['actual_vulnerable']
             if actual_vulnerable_count > 0:
                 st.error(f"⚠️ **{actual_vulnerable_count}**개 실질적 취약점")
             else:
@@ -866,604 +1400,24 @@ def main(timestamp=None):
         st.error(f"❌ 데이터 파싱 중 오류 발생: {str(e)}")
         return
     
-    # 탭 구성 (파일 시스템 분석 제거)
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "📊 종합 대시보드", 
-        "🖥️ 서버별 분석", 
-        "🔍 취약점 상세", 
-        "⏱️ 실행 분석", 
-        "📄 원본 데이터"
-    ])
-    
-    with tab1:
-        # === 종합 대시보드 ===
-        st.header("📋 보안 점검 종합 현황")
-        
-        # 핵심 메트릭 (실질적 상태 기준으로 모두 수정)
-        total_checks = len(df)
-        
-        # 실질적 취약/양호 상태 계산
-        actual_vulnerable_items = len(df[df['실질적_양호상태'] == False])
-        actual_safe_items = len(df[df['실질적_양호상태'] == True])
-        
-        remediation_needed = df[df['조치 결과'].str.contains("수동 조치 필요", case=False, na=False)].shape[0]
-        remediation_complete = df[df['조치 결과'].str.contains("완료|성공", case=False, na=False)].shape[0]
-        
-        # 개선 효과 분석 추가 (실질적 상태 기준)
-        originally_safe = df[(df['실질적_양호상태'] == True) & (df['조치 여부'] == False)]
-        remediated_safe = df[(df['조치 여부'] == True) & 
-                           (df['조치 결과'].str.contains("조치 완료|완료|성공", case=False, na=False))]
-        
-        col1, col2, col3, col4, col5 = st.columns(5)
-        col1.metric("🔍 총 점검 항목", total_checks)
-        col2.metric("⚠️ 실질적 취약점", actual_vulnerable_items, delta=f"{(actual_vulnerable_items/total_checks*100):.1f}%")
-        col3.metric("✅ 실질적 양호", actual_safe_items, delta=f"{(actual_safe_items/total_checks*100):.1f}%")
-        col4.metric("🔧 조치 필요", remediation_needed)
-        col5.metric("🛡️ 조치 완료", remediation_complete)
-        
-        # 보안 개선 효과 메트릭 추가
-        st.markdown("### 🚀 보안 개선 효과 분석")
-        col1, col2, col3, col4 = st.columns(4)
-        
-        col1.metric("🟢 원래부터 양호", len(originally_safe), 
-                   help="처음 점검 시부터 보안 설정이 올바르게 되어 있던 항목")
-        col2.metric("🔄 조치 후 양호", len(remediated_safe), 
-                   help="취약점이 발견되었지만 Ansible 자동 조치로 양호해진 항목")
-        
-        if len(remediated_safe) > 0:
-            # 전체 발견된 문제 중에서 자동 해결된 비율
-            total_issues_found = len(df[df['조치 여부'] == True])  # 조치가 시도된 항목들
-            if total_issues_found > 0:
-                improvement_rate = len(remediated_safe) / total_issues_found * 100
-                col3.metric("📈 자동 해결율", f"{improvement_rate:.1f}%",
-                           help="조치가 시도된 항목 중 성공적으로 해결된 비율")
-            else:
-                col3.metric("📈 자동 해결율", "0%")
-        else:
-            col3.metric("📈 자동 해결율", "0%")
-            
-        col4.metric("🎯 전체 보안율", f"{(actual_safe_items/total_checks*100):.1f}%",
-                   help="조치 완료 포함한 실질적으로 양호한 항목의 비율")
-        
-        st.markdown(" ")
-        
-        # 보안 개선 효과 차트
-        fig_improvement1, fig_improvement2, improvement_data = create_security_improvement_analysis(df)
-        if fig_improvement1 and fig_improvement2:
-            col1, col2 = st.columns(2)
-            with col1:
-                st.plotly_chart(fig_improvement1, use_container_width=True)
-            with col2:
-                st.plotly_chart(fig_improvement2, use_container_width=True)
-            
-            # 개선 효과 상세 테이블
-            with st.expander("📊 보안 개선 효과 상세 통계"):
-                st.dataframe(improvement_data['stats'], use_container_width=True, hide_index=True)
-                
-                if len(improvement_data['remediated_safe']) > 0:
-                    st.subheader("🔄 자동 조치로 개선된 항목들")
-                    remediated_display = improvement_data['remediated_safe'][['호스트', '작업 설명', '조치 결과']].copy()
-                    st.dataframe(remediated_display, use_container_width=True)
-                else:
-                    st.info("자동 조치로 개선된 항목이 없습니다.")
-        
-        # 서버 비교 차트 (실질적 상태가 포함된 df 전달)
-        fig_server_comparison = create_server_comparison_chart(df)
-        if fig_server_comparison:
-            st.plotly_chart(fig_server_comparison, use_container_width=True)
-    
-    with tab2:
-        # === 서버별 분석 ===
-        st.header("🖥️ 서버별 상세 분석")
-        
-        # 서버 선택
-        selected_server = st.selectbox(
-            "분석할 서버 선택:",
-            options=['전체'] + result_data['servers'],
-            index=0
-        )
-        
-        if selected_server == '전체':
-            server_df = df
-        else:
-            server_df = df[df['호스트'] == selected_server]
-        
-        if len(server_df) > 0:
-            # 서버별 통계 (실질적 상태 기준) - 2열로 변경
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.subheader("📊 점검 현황 (실질적 상태)")
-                server_stats = server_df.groupby('호스트').agg({
-                    '실질적_양호상태': ['count', lambda x: x.sum(), lambda x: (~x).sum()]
-                }).round(2)
-                server_stats.columns = ['총점검', '실질적_양호', '실질적_취약']
-                st.dataframe(server_stats, use_container_width=True)
-            
-            with col2:
-                st.subheader("🔧 조치 현황")
-                # 조치 현황을 더 세분화해서 표시
-                remediation_detailed = server_df.groupby('호스트').apply(lambda x: pd.Series({
-                    '원래부터 양호': len(x[(x['실질적_양호상태'] == True) & (x['조치 여부'] == False)]),
-                    '조치 완료': len(x[x['조치 결과'].str.contains("조치 완료|완료|성공", case=False, na=False)]),
-                    '수동 조치 필요': len(x[x['조치 결과'].str.contains("수동 조치 필요", case=False, na=False)]),
-                    '조치 불필요': len(x[x['조치 결과'].str.contains("조치 불필요", case=False, na=False)])
-                })).fillna(0).astype(int)
-                
-                st.dataframe(remediation_detailed, use_container_width=True)
-            
-            # 점검 유형을 별도 행으로 이동
-            st.subheader("📋 점검 유형 (전체)")
-            task_stats = server_df['작업 설명'].value_counts()  # head(10) 제거
-            
-            # 표 형태로 변환
-            task_df = pd.DataFrame({
-                '점검 항목': task_stats.index,
-                '점검 횟수': task_stats.values
-            })
-            
-            st.dataframe(task_df, use_container_width=True, hide_index=True)
-            
-            # 서버별 취약점 히트맵 (실질적 상태 기준)
-            if len(result_data['servers']) > 1:
-                st.subheader("🔥 서버-취약점 히트맵 (실질적 상태)")
-                heatmap_data = df.pivot_table(
-                    index='작업 설명', 
-                    columns='호스트', 
-                    values='실질적_양호상태', 
-                    aggfunc=lambda x: (~x).sum(),  # 실질적 취약점 수
-                    fill_value=0
-                )
-                
-                if not heatmap_data.empty:
-                    fig_heatmap = px.imshow(
-                        heatmap_data.values,
-                        labels=dict(x="서버", y="점검 항목", color="실질적 취약점 수"),
-                        x=heatmap_data.columns,
-                        y=heatmap_data.index,
-                        color_continuous_scale='Reds',
-                        aspect="auto"
-                    )
-                    fig_heatmap.update_layout(height=600)
-                    st.plotly_chart(fig_heatmap, use_container_width=True)
-        else:
-            st.info("선택한 서버의 데이터가 없습니다.")
-    
-    with tab3:
-        # === 취약점 상세 ===
-        st.header("🔍 취약점 및 실패 상세 분석")
-        
-        # 실질적으로 취약한 항목만 표시 (조치 완료 제외)
-        vulnerable_df = df[df['실질적_양호상태'] == False]
-        
-        if len(vulnerable_df) > 0:
-            st.subheader(f"⚠️ 실질적 취약점 ({len(vulnerable_df)}개)")
-            st.info("💡 '조치 완료'된 항목은 해결된 것으로 간주하여 제외됩니다.")
-            
-            # 취약점 상세 차트 (실질적 취약점 기준)
-            fig1, fig2 = create_vulnerability_details_analysis(vulnerable_df)  # vulnerable_df 사용
-            if fig1:
-                st.plotly_chart(fig1, use_container_width=True)
-            if fig2:
-                st.plotly_chart(fig2, use_container_width=True)
-                
-        else:
-            st.success("🛡️ 모든 취약점이 해결되었습니다!")
-            st.info("일부 항목은 '조치 완료' 상태로 자동 해결되었습니다.")
-        
-        # 조치 완료된 항목들도 별도로 표시
-        resolved_items = df[(df['조치 여부'] == True) & 
-                          (df['조치 결과'].str.contains("조치 완료|완료|성공", case=False, na=False))]
-        
-        if len(resolved_items) > 0:
-            st.subheader(f"✅ 자동 해결된 항목들 ({len(resolved_items)}개)")
-            
-            with st.expander("🔧 Ansible이 자동으로 해결한 취약점들"):
-                for idx, row in resolved_items.iterrows():
-                    st.markdown(f"**{row['호스트']}** - {row['작업 설명']}")
-                    st.markdown(f"- 상태: {row['조치 결과']}")
-                    if row['취약 사유']:
-                        st.markdown(f"- 원인: {row['취약 사유']}")
-                    st.markdown("---")
-        
-        # 실질적 취약점이 있는 경우에만 상세 분석 표시
-        if len(vulnerable_df) > 0:
-            # 취약점 상세 테이블
-            st.subheader("📋 실질적 취약점 상세 목록")
-            
-            # 필터링 옵션
-            col1, col2 = st.columns(2)
-            with col1:
-                filter_server = st.multiselect(
-                    "서버 필터:", 
-                    options=vulnerable_df['호스트'].unique(),
-                    default=vulnerable_df['호스트'].unique()
-                )
-            with col2:
-                filter_remediation = st.selectbox(
-                    "조치 상태 필터:",
-                    options=['전체', '수동 조치 필요', '미조치', '실패'],
-                    index=0
-                )
-            
-            # 필터 적용
-            filtered_vuln = vulnerable_df[vulnerable_df['호스트'].isin(filter_server)]
-            if filter_remediation != '전체':
-                filtered_vuln = filtered_vuln[filtered_vuln['조치 결과'].str.contains(filter_remediation, case=False, na=False)]
-            
-            # 상세 정보 표시
-            for idx, row in filtered_vuln.iterrows():
-                with st.expander(f"🚨 {row['호스트']} - {row['작업 설명']}", expanded=False):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.write(f"**진단 결과:** {row['진단 결과']}")
-                        st.write(f"**플레이북:** {row['플레이북']}")
-                        st.write(f"**조치 상태:** {row['조치 결과']}")
-                        if row['취약 파일 수'] > 0:
-                            st.write(f"**영향받는 파일:** {row['취약 파일 수']}개")
-                    
-                    with col2:
-                        if row['취약 사유']:
-                            st.write("**취약 사유:**")
-                            st.info(row['취약 사유'])
-                        if row['권장사항']:
-                            st.write("**권장사항:**")
-                            st.success(row['권장사항'])
-                    
-                    # 추가 기술적 세부사항
-                    if row['현재 권한'] or row['현재 소유자']:
-                        st.markdown("**🔧 기술적 세부사항:**")
-                        tech_details = []
-                        if row['현재 권한']:
-                            tech_details.append(f"현재 권한: `{row['현재 권한']}`")
-                        if row['현재 소유자']:
-                            tech_details.append(f"현재 소유자: `{row['현재 소유자']}`")
-                        st.markdown(" | ".join(tech_details))
-        
-        # 🆕 실패 분석 섹션 추가
-        st.markdown("---")
-        st.subheader("❌ 실행 실패 분석")
-        
-        # 실패한 작업 분석
-        fig_fail1, fig_fail2, failure_data = create_failure_analysis(df)
-        
-        if failure_data and 'message' in failure_data:
-            st.success("✅ " + failure_data['message'])
-        elif failure_data:
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("총 실패 작업", failure_data['total_failures'])
-            with col2:
-                st.metric("영향받은 서버", failure_data['affected_servers'])
-            with col3:
-                failure_rate = failure_data['total_failures'] / len(df) * 100 if len(df) > 0 else 0
-                st.metric("실패율", f"{failure_rate:.1f}%")
-            
-            # 실패 차트
-            if fig_fail1 and fig_fail2:
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.plotly_chart(fig_fail1, use_container_width=True)
-                with col2:
-                    st.plotly_chart(fig_fail2, use_container_width=True)
-            
-            # 실패 상세 목록
-            with st.expander("🔍 실패한 작업 상세 목록", expanded=False):
-                for failure in failure_data['detailed_failures']:
-                    st.markdown(f"**{failure['호스트']}** - {failure['작업 설명']}")
-                    st.markdown(f"- 실패 사유: {failure['조치 결과']}")
-                    if failure['취약 사유']:
-                        st.markdown(f"- 원인: {failure['취약 사유']}")
-                    st.markdown("---")
-        
-        # 🆕 접근 불가능한 서버 분석
-        st.subheader("🔌 서버 접근성 분석")
-        
-        fig_unreachable, unreachable_data = create_unreachable_hosts_analysis(df, result_data)
-        
-        if unreachable_data and 'message' in unreachable_data:
-            st.success("✅ " + unreachable_data['message'])
-        elif unreachable_data:
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("접근 불가 서버", unreachable_data['total_unreachable'])
-            with col2:
-                st.metric("접근 가능 서버", len(unreachable_data['reachable_servers']))
-            with col3:
-                st.metric("접근 성공률", f"{unreachable_data['success_rate']:.1f}%")
-            
-            if fig_unreachable:
-                st.plotly_chart(fig_unreachable, use_container_width=True)
-            
-            # 접근 불가 서버 목록
-            if unreachable_data['unreachable_servers']:
-                with st.expander("⚠️ 접근 불가능한 서버 목록"):
-                    for server in unreachable_data['unreachable_servers']:
-                        st.markdown(f"- **{server}**: 네트워크 연결 실패 또는 SSH 접근 불가")
-                        
-                    st.info("💡 해결 방법: SSH 키 설정, 네트워크 연결, 방화벽 설정을 확인하세요.")
-                    
-            # 조치 시도했지만 무시된 항목들 별도 표시
-            ignored_items = df[(df['조치 여부'] == True) & 
-                            (df['조치 결과'].str.contains("무시|ignore", case=False, na=False))]
-
-            if len(ignored_items) > 0:
-                st.subheader(f"⚠️ 조치 시도했지만 무시된 항목들 ({len(ignored_items)}개)")
-                st.info("💡 이 항목들은 실행 중 문제가 발생했지만 ignore_errors 설정으로 전체 실행은 계속되었습니다.")
-                
-                with st.expander("🔧 무시된 항목들 상세보기"):
-                    for idx, row in ignored_items.iterrows():
-                        st.markdown(f"**{row['호스트']}** - {row['작업 설명']}")
-                        st.markdown(f"- 상태: {row['조치 결과']}")
-                        if row['취약 사유']:
-                            st.markdown(f"- 원인: {row['취약 사유']}")
-                        st.markdown("---")
-    
-    with tab4:
-        # === 실행 분석 ===
-        st.header("⏱️ Ansible 실행 분석")
-        
-        # 실행 타임라인
-        fig_timeline = create_execution_timeline(timestamp)
-        if fig_timeline:
-            st.plotly_chart(fig_timeline, use_container_width=True)
-        else:
-            st.info("실행 타임라인 데이터를 생성할 수 없습니다.")
-        
-        # 실행 통계 (실질적 상태 기준)
-        st.subheader("📊 실행 통계")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            # 실제 실행 시간 계산
-            execution_time = calculate_execution_time(timestamp)
-            if execution_time:
-                st.metric("⏱️ 전체 실행 시간", execution_time)
-            
-            st.metric("📊 평균 서버당 점검", f"{len(df) / len(result_data['servers']) if result_data['servers'] else 0:.1f}개 점검/서버")
-        
-        # 🆕 실패 현황 메트릭 추가 (ignore 포함)
-        attempted_failed_tasks = len(df[df['조치 결과'].str.contains("실패|오류|ERROR|FAILED|무시|ignore|건너뛰|skip", case=False, na=False)])
-        ignored_tasks = len(df[df['조치 결과'].str.contains("무시|ignore", case=False, na=False)])
-        unreachable_count = len(set(result_data.get('servers', [])) - set(df['호스트'].unique()))
-
-        col5, col6 = st.columns(2)
-        with col5:
-            if attempted_failed_tasks > 0:
-                st.warning(f"⚠️ **{attempted_failed_tasks}**개 조치 문제")
-                if ignored_tasks > 0:
-                    st.caption(f"└ 그 중 {ignored_tasks}개는 무시됨")
-            else:
-                st.success("✅ **모든 조치 성공**")
-
-        with col6:
-            if unreachable_count > 0:
-                st.warning(f"🔌 **{unreachable_count}**개 서버 접근불가")
-            else:
-                st.success("🌐 **모든 서버 접근가능**")
-        
-        with col2:
-            # 실질적 성공률
-            success_rate = (len(df[df['실질적_양호상태'] == True]) / len(df) * 100) if len(df) > 0 else 0
-            st.metric("✅ 실질적 성공률", f"{success_rate:.1f}%")
-            
-            automation_rate = (len(df[df['조치 결과'].str.contains("완료", case=False, na=False)]) / len(df) * 100) if len(df) > 0 else 0
-            st.metric("🔧 자동 조치율", f"{automation_rate:.1f}%")
-        
-        with col3:
-            st.metric("🖥️ 점검된 서버 수", len(result_data['servers']))
-            st.metric("📋 점검 항목 유형", len(result_data['check_types']))
-        
-        # 실행 로그 요약
-        st.subheader("📋 실행 로그 요약")
-        
-        log_file = f"logs/ansible_execute_log_{timestamp}.log"
-        if os.path.exists(log_file):
-            try:
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    log_content = f.read()
-                
-                # 로그 통계 추출
-                total_lines = len(log_content.split('\n'))
-                error_count = log_content.lower().count('error')
-                warning_count = log_content.lower().count('warning')
-                success_count = log_content.lower().count('success')
-                
-                col1, col2, col3, col4 = st.columns(4)
-                col1.metric("총 로그 라인", total_lines)
-                col2.metric("성공 메시지", success_count)
-                col3.metric("경고 메시지", warning_count)
-                col4.metric("오류 메시지", error_count)
-                
-                # 로그 미리보기 (마지막 20줄)
-                log_lines = log_content.split('\n')
-                preview_lines = log_lines[-20:] if len(log_lines) > 20 else log_lines
-                
-                with st.expander("📄 로그 미리보기 (마지막 20줄)"):
-                    st.code('\n'.join(preview_lines), language="text")
-                    
-            except Exception as e:
-                st.error(f"로그 파일 읽기 실패: {str(e)}")
-        else:
-            st.warning("로그 파일을 찾을 수 없습니다.")
-    
-    with tab5:
-        # === 원본 데이터 ===
-        st.header("📄 원본 데이터 및 다운로드")
-        
-        # 파일 정보 표시
-        st.subheader("📂 로드된 파일 정보")
-        
-        if result_data['file_info']:
-            file_info_df = pd.DataFrame(result_data['file_info'])
-            
-            # 파일 크기를 읽기 쉽게 변환
-            def format_file_size(size_bytes):
-                if size_bytes < 1024:
-                    return f"{size_bytes} B"
-                elif size_bytes < 1024**2:
-                    return f"{size_bytes/1024:.1f} KB"
-                else:
-                    return f"{size_bytes/(1024**2):.1f} MB"
-            
-            file_info_df['readable_size'] = file_info_df['size'].apply(format_file_size)
-            
-            # 표시할 컬럼 선택
-            display_file_info = file_info_df[['filename', 'readable_size', 'data_type']].copy()
-            display_file_info.columns = ['파일명', '크기', '데이터 타입']
-            
-            st.dataframe(display_file_info, use_container_width=True)
-        else:
-            st.info("파일 정보가 없습니다.")
-        
-        # 데이터 요약 통계
-        st.subheader("📊 데이터 요약")
-        col1, col2, col3, col4 = st.columns(4)
-        
-        col1.metric("총 데이터 항목", len(df))
-        col2.metric("처리된 서버", len(result_data['servers']))
-        col3.metric("점검 유형", len(result_data['check_types']))
-        col4.metric("결과 파일", result_data['total_files'])
-        
-        # 전체 데이터 테이블
-        st.subheader("🔍 세부 데이터 보기")
-        
-        # 컬럼 선택 기능
-        available_columns = df.columns.tolist()
-        selected_columns = st.multiselect(
-            "표시할 컬럼 선택:",
-            options=available_columns,
-            default=['호스트', '작업 설명', '진단 결과', '실질적_양호상태', '조치 결과']
-        )
-        
-        if selected_columns:
-            # 필터링 옵션 (실질적 상태 기준)
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                show_only_vulnerable = st.checkbox("실질적 취약점만 표시", value=False)
-            
-            with col2:
-                show_only_manual = st.checkbox("수동 조치 필요 항목만 표시", value=False)
-            
-            # 필터 적용
-            filtered_df = df.copy()
-            
-            if show_only_vulnerable:
-                filtered_df = filtered_df[filtered_df['실질적_양호상태'] == False]
-            
-            if show_only_manual:
-                filtered_df = filtered_df[filtered_df['조치 결과'].str.contains("수동", case=False, na=False)]
-            
-            # 데이터 표시
-            if len(filtered_df) > 0:
-                st.dataframe(filtered_df[selected_columns], use_container_width=True)
-                
-                # 수동 조치 필요 항목 강조 표시
-                manual_items = filtered_df[filtered_df['조치 결과'].str.contains("수동 조치 필요", case=False, na=False)]
-                if len(manual_items) > 0:
-                    st.warning(f"🔧 **수동 조치 필요 항목: {len(manual_items)}개**")
-                    
-                    with st.expander("🚨 수동 조치 필요 항목 상세보기"):
-                        for idx, row in manual_items.iterrows():
-                            st.markdown(f"**{row['호스트']}** - {row['작업 설명']}")
-                            if row['취약 사유']:
-                                st.markdown(f"- 사유: {row['취약 사유']}")
-                            if row['권장사항']:
-                                st.markdown(f"- 권장사항: {row['권장사항']}")
-                            st.markdown("---")
-            else:
-                st.info("필터 조건에 맞는 데이터가 없습니다.")
-        else:
-            st.info("표시할 컬럼을 선택해주세요.")
-        
-        # 다운로드 섹션
-        st.subheader("⬇️ 데이터 다운로드")
-        
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            # CSV 다운로드
-            csv = df.to_csv(index=False, encoding='utf-8-sig')
-            st.download_button(
-                "📊 전체 데이터 CSV 다운로드", 
-                csv, 
-                f"security_analysis_{timestamp}.csv", 
-                "text/csv"
-            )
-        
-        with col2:
-            # 실질적 취약점만 CSV 다운로드
-            vulnerable_only = df[df['실질적_양호상태'] == False]
-            if len(vulnerable_only) > 0:
-                vulnerable_csv = vulnerable_only.to_csv(index=False, encoding='utf-8-sig')
-                st.download_button(
-                    "⚠️ 실질적 취약점 CSV 다운",
-                    vulnerable_csv,
-                    f"actual_vulnerabilities_{timestamp}.csv",
-                    "text/csv"
-                )
-            else:
-                st.button("⚠️ 실질적 취약점 CSV 다운", disabled=True, help="실질적 취약점이 없습니다")
-        
-        with col3:
-            # JSON 원본 데이터 다운로드
-            if result_data['data']:
-                json_data = json.dumps(result_data['data'], ensure_ascii=False, indent=2)
-                st.download_button(
-                    "📋 원본 JSON 다운로드",
-                    json_data,
-                    f"raw_data_{timestamp}.json",
-                    "application/json"
-                )
-                
-        with col4:
-            # 로그 파일 다운로드 추가
-            log_content = get_log_content(timestamp)
-            if log_content:
-                st.download_button(
-                    "📥 실행 로그 다운로드",
-                    log_content,
-                    f"ansible_log_{timestamp}.log",
-                    "text/plain",
-                    key=f"download_log_{timestamp}"
-                )
-            else:
-                st.button("📥 실행 로그 다운로드", disabled=True, help="로그 파일을 찾을 수 없습니다")
-                
-        # 로그 파일 내용 표시
-        st.subheader("📋 실행 로그 전체보기")
-        
-        log_file = f"logs/ansible_execute_log_{timestamp}.log"
-        if os.path.exists(log_file):
-            try:
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    log_content = f.read()
-                
-                # 로그 검색 기능
-                search_term = st.text_input("🔍 로그 검색:", placeholder="검색할 키워드를 입력하세요")
-                
-                if search_term:
-                    # 검색 결과 하이라이팅
-                    matching_lines = [line for line in log_content.split('\n') if search_term.lower() in line.lower()]
-                    
-                    st.info(f"검색 결과: {len(matching_lines)}개 라인에서 '{search_term}' 발견")
-                    
-                    if matching_lines:
-                        st.markdown("**검색 결과 미리보기 (최대 10개):**")
-                        for line in matching_lines[:10]:
-                            st.code(line.strip())
-                        st.markdown("---")
-                
-                # 전체 로그 표시 (바로 표시)
-                st.code(log_content, language="text")
-                
-            except Exception as e:
-                st.error(f"로그 파일 읽기 실패: {str(e)}")
-        else:
-            st.warning(f"로그 파일을 찾을 수 없습니다: {log_file}")
+    # 선택한 탭만 렌더링 (st.tabs 는 보이지 않는 탭까지 매번 모두 계산하므로 선택형 탭 사용)
+    tab_renderers = dict(zip(REPORT_TAB_LABELS, [
+        render_dashboard_tab,
+        render_server_tab,
+        render_vulnerability_tab,
+        render_execution_tab,
+        render_raw_data_tab
+    ]))
+    selected_tab = st.segmented_control(
+        "리포트 탭",
+        options=REPORT_TAB_LABELS,
+        default=REPORT_TAB_LABELS[0],
+        key=f"report_tab_{timestamp}",
+        label_visibility="collapsed"
+    ) or REPORT_TAB_LABELS[0]
+    
+    # 각 탭은 fragment 라서 탭 안의 위젯 조작은 해당 탭만 다시 실행
+    tab_renderers[selected_tab](timestamp, df, result_data, summary)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
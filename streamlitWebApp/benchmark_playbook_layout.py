@@ -0,0 +1,166 @@
+"""
+플레이북 레이아웃 벤치마크 - import_playbook 방식 vs flat(단일 플레이 병합) 방식 비교
+
+사용 예:
+    python benchmark_playbook_layout.py                       # 전체 점검, 가상 호스트 20대로 --list-tasks 비교
+    python benchmark_playbook_layout.py --hosts 200 --repeat 5
+    python benchmark_playbook_layout.py --inventory inventory.ini --run   # 실제 호스트에 --check 모드로 실행 비교
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import subprocess
+import yaml
+from datetime import datetime
+
+from modules.playbook_manager import save_generated_playbook
+
+LAYOUTS = ["import", "flat"]
+
+"""가상 호스트로 구성된 벤치마크용 인벤토리 생성 (--list-tasks 는 실제 접속하지 않음)"""
+def write_dummy_inventory(path, host_count):
+    lines = ["[target_servers]"]
+    for i in range(host_count):
+        lines.append(f"bench-host-{i:03d} ansible_host=127.0.0.1 ansible_connection=local")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+    return path
+
+"""생성된 플레이북의 정적 규모 측정 (플레이 수, 태스크 수)"""
+def count_playbook_size(playbook_path):
+    with open(playbook_path, 'r', encoding='utf-8') as f:
+        content = yaml.safe_load(f) or []
+
+    plays = 0
+    tasks = 0
+
+    def count_tasks(task_list):
+        total = 0
+        for task in task_list or []:
+            if isinstance(task, dict) and 'block' in task:
+                total += count_tasks(task.get('block')) + count_tasks(task.get('rescue')) + count_tasks(task.get('always'))
+            else:
+                total += 1
+        return total
+
+    for entry in content:
+        if 'import_playbook' in entry:
+            # import 대상 파일도 플레이 단위로 합산
+            imported_path = os.path.normpath(os.path.join(os.path.dirname(playbook_path), entry['import_playbook']))
+            with open(imported_path, 'r', encoding='utf-8') as f:
+                for play in yaml.safe_load(f) or []:
+                    plays += 1
+                    tasks += count_tasks(play.get('tasks'))
+        else:
+            plays += 1
+            tasks += count_tasks(entry.get('tasks'))
+
+    return plays, tasks
+
+"""ansible-playbook 실행 시간 측정"""
+def time_ansible(cmd, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+        durations.append(time.perf_counter() - start)
+        if result.returncode not in (0, 2, 4):
+            print(f"⚠️ 명령 실패 (코드 {result.returncode}): {' '.join(cmd)}")
+            print(result.stdout[-2000:])
+            return None
+    return min(durations), sum(durations) / len(durations)
+
+def run_benchmark(task_files, host_count, repeat, inventory_path=None, run_playbook=False, keep=False):
+    bench_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    ansible_available = shutil.which('ansible-playbook') is not None
+    results = []
+    created_folders = []
+
+    if not ansible_available:
+        print("⚠️ ansible-playbook 을 찾을 수 없어 정적 규모만 비교합니다.")
+
+    for layout in LAYOUTS:
+        # import 방식의 ../../tasks 상대 경로가 유지되도록 playbooks/ 하위에 생성
+        result_folder_path = os.path.join("playbooks", f"layout_benchmark_{layout}_{bench_id}")
+        os.makedirs(result_folder_path, exist_ok=True)
+        created_folders.append(result_folder_path)
+
+        start = time.perf_counter()
+        playbook_path, _, _ = save_generated_playbook(
+            [], task_files, result_folder_path,
+            analysis_mode="unified", playbook_layout=layout
+        )
+        generate_seconds = time.perf_counter() - start
+
+        plays, tasks = count_playbook_size(playbook_path)
+        row = {
+            'layout': layout,
+            'plays': plays,
+            'tasks': tasks,
+            'generate_s': generate_seconds,
+            'list_tasks_s': None,
+            'run_s': None
+        }
+
+        if ansible_available:
+            bench_inventory = inventory_path or write_dummy_inventory(
+                os.path.join(result_folder_path, "bench_inventory.ini"), host_count
+            )
+
+            # 플레이 파싱/컴파일 비용 (호스트 접속 없음)
+            timing = time_ansible(['ansible-playbook', '-i', bench_inventory, playbook_path, '--list-tasks'], repeat)
+            if timing:
+                row['list_tasks_s'] = timing
+
+            # 실제 실행 비용 (--check 모드, 조치 태스크는 변경하지 않음)
+            if run_playbook and inventory_path:
+                timing = time_ansible(['ansible-playbook', '-i', inventory_path, playbook_path,
+                                       '--limit', 'target_servers', '--check'], repeat)
+                if timing:
+                    row['run_s'] = timing
+
+        results.append(row)
+
+    if not keep:
+        for folder in created_folders:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    return results
+
+def print_results(results, task_count, host_count):
+    print(f"\n{'='*80}")
+    print(f"📊 플레이북 레이아웃 벤치마크 (점검 {task_count}개, 호스트 {host_count}대)")
+    print(f"{'='*80}")
+    print(f"{'레이아웃':<10}{'플레이':>8}{'태스크':>8}{'생성(s)':>10}{'list-tasks 최소/평균(s)':>26}{'--check 최소/평균(s)':>24}")
+    for row in results:
+        list_tasks = f"{row['list_tasks_s'][0]:.2f}/{row['list_tasks_s'][1]:.2f}" if row['list_tasks_s'] else "-"
+        run = f"{row['run_s'][0]:.2f}/{row['run_s'][1]:.2f}" if row['run_s'] else "-"
+        print(f"{row['layout']:<10}{row['plays']:>8}{row['tasks']:>8}{row['generate_s']:>10.3f}{list_tasks:>26}{run:>24}")
+    print(f"{'='*80}\n")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="import_playbook 레이아웃과 flat 레이아웃 비교")
+    parser.add_argument("--checks", type=int, default=0, help="사용할 점검 수 (0 = 전체)")
+    parser.add_argument("--hosts", type=int, default=20, help="가상 인벤토리 호스트 수")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 측정 횟수")
+    parser.add_argument("--inventory", default=None, help="실제 인벤토리 경로 (target_servers 그룹 필요)")
+    parser.add_argument("--run", action="store_true", help="인벤토리 대상에 --check 모드로 실제 실행 시간도 측정")
+    parser.add_argument("--keep", action="store_true", help="생성된 벤치마크 플레이북 폴더 유지")
+    args = parser.parse_args()
+
+    with open("filename_mapping.json", 'r', encoding='utf-8') as f:
+        filename_mapping = json.load(f)
+
+    task_files = list(filename_mapping.values())
+    if args.checks > 0:
+        task_files = task_files[:args.checks]
+
+    if args.run and not args.inventory:
+        print("❌ --run 옵션은 --inventory 와 함께 사용해야 합니다.")
+        sys.exit(1)
+
+    benchmark_results = run_benchmark(task_files, args.hosts, args.repeat, args.inventory, args.run, args.keep)
+    print_results(benchmark_results, len(task_files), args.hosts)
@@ -0,0 +1,68 @@
+"""
+KISA 점검 결과 수집 콜백 플러그인
+
+점검 태스크가 설정한 보고서 팩트(kisa_report_<점검 코드>)를 태스크 결과에서 직접 받아
+점검 코드(task_code)를 붙여 (호스트, 점검)별로 메모리에 보관하고, 플레이북 실행이 끝나면 KISA_RESULT_STORE 경로에
+보고서 리스트 하나로 저장합니다. (modules/result_collector.py 의 build_result_collector_env 로 활성화)
+"""
+import os
+import json
+
+from ansible.plugins.callback import CallbackBase
+
+DOCUMENTATION = '''
+    name: kisa_result_collector
+    type: aggregate
+    short_description: KISA 점검 보고서 팩트를 실행당 하나의 결과 저장소로 수집
+    description:
+      - kisa_report_ 로 시작하는 set_fact 결과를 호스트/점검별로 모아 실행 종료 시 JSON 리스트로 저장합니다.
+    requirements:
+      - KISA_RESULT_STORE 환경 변수 (저장할 파일 경로)
+'''
+
+REPORT_FACT_PREFIX = "kisa_report_"
+REPORT_TASK_CODE_KEY = "task_code"   # modules/result_collector.py 와 같은 키 (결과 저장소를 점검 코드로 조회)
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = 'aggregate'
+    CALLBACK_NAME = 'kisa_result_collector'
+    CALLBACK_NEEDS_ENABLED = True
+    CALLBACK_NEEDS_WHITELIST = True   # ansible 2.10 이하 호환
+
+    def __init__(self):
+        super(CallbackModule, self).__init__()
+        self.store_path = os.environ.get('KISA_RESULT_STORE')
+        self.reports = {}   # (호스트, 팩트 이름) → 보고서 (조치 단계 병합본이 진단 보고서를 덮어씀)
+
+    def v2_runner_on_ok(self, result):
+        facts = result._result.get('ansible_facts') or {}
+        host = result._host.get_name()
+
+        for fact_name, report in facts.items():
+            if not fact_name.startswith(REPORT_FACT_PREFIX):
+                continue
+            if isinstance(report, str):
+                try:
+                    report = json.loads(report)
+                except ValueError:
+                    self._display.warning(f"{host}: {fact_name} 보고서를 JSON 으로 해석할 수 없습니다.")
+                    continue
+            if isinstance(report, dict):
+                # playbook_name 은 점검 파일명과 다른 경우가 많아, 팩트 이름의 점검 코드를 보고서에 함께 저장
+                self.reports[(host, fact_name)] = {**report, REPORT_TASK_CODE_KEY: fact_name[len(REPORT_FACT_PREFIX):]}
+
+    def v2_playbook_on_stats(self, stats):
+        if not self.store_path or not self.reports:
+            return
+
+        reports = [self.reports[key] for key in sorted(self.reports)]
+        temp_path = self.store_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.store_path), exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(reports, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.store_path)
+            self._display.display(f"📦 점검 결과 {len(reports)}건 저장: {self.store_path}")
+        except Exception as e:
+            self._display.warning(f"점검 결과 저장 실패 ({self.store_path}): {str(e)}")
@@ -0,0 +1,102 @@
+"""
+KISA 점검 태스크 실행 시간 프로파일 콜백 플러그인
+
+호스트마다 태스크가 시작/종료된 실제 시각을 기록하고, 플레이북 실행이 끝나면 KISA_TASK_PROFILE 경로에
+(호스트, 점검 코드, 태스크, 상태, 시작, 종료) 행 목록으로 저장합니다.
+(modules/playbook_manager.py 의 build_callback_env 로 활성화)
+"""
+import os
+import re
+import json
+import time
+
+from ansible.plugins.callback import CallbackBase
+
+DOCUMENTATION = '''
+    name: kisa_task_profiler
+    type: aggregate
+    short_description: 호스트별 태스크 시작/종료 시각을 실행당 하나의 프로파일 파일로 기록
+    description:
+      - 태스크 × 호스트마다 실제 시작/종료 시각과 결과 상태를 모아 실행 종료 시 JSON 으로 저장합니다.
+      - 점검 코드는 flat 레이아웃의 점검 block 이름([점검 코드] ...) 또는 import 된 점검 플레이북 파일명에서 구합니다.
+    requirements:
+      - KISA_TASK_PROFILE 환경 변수 (저장할 파일 경로)
+'''
+
+PROFILE_COLUMNS = ['host', 'check', 'task', 'status', 'start', 'end']
+CHECK_BLOCK_PATTERN = re.compile(r'^\[([^\]]+)\]')
+CHECK_FILE_PATTERN = re.compile(r'^(\d+_\d+_\d+[^/\\]*)\.ya?ml(?::\d+)?$')
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = 'aggregate'
+    CALLBACK_NAME = 'kisa_task_profiler'
+    CALLBACK_NEEDS_ENABLED = True
+    CALLBACK_NEEDS_WHITELIST = True   # ansible 2.10 이하 호환
+
+    def __init__(self):
+        super(CallbackModule, self).__init__()
+        self.profile_path = os.environ.get('KISA_TASK_PROFILE')
+        self.tasks = {}        # 태스크 uuid → (점검 코드, 태스크 이름, 태스크 시작 시각)
+        self.host_starts = {}  # (호스트, 태스크 uuid) → 호스트별 시작 시각
+        self.rows = []
+
+    def _check_code(self, task):
+        # flat 레이아웃: 상위 점검 block 이름의 [점검 코드]
+        parent = task._parent
+        while parent is not None:
+            match = CHECK_BLOCK_PATTERN.match(getattr(parent, 'name', None) or '')
+            if match:
+                return match.group(1)
+            parent = getattr(parent, '_parent', None)
+
+        # import 레이아웃: 태스크가 정의된 점검 플레이북 파일명
+        match = CHECK_FILE_PATTERN.match(os.path.basename(task.get_path() or ''))
+        return match.group(1) if match else ''
+
+    def _task_started(self, task):
+        self.tasks[task._uuid] = (self._check_code(task), task.get_name().strip(), time.time())
+
+    def v2_playbook_on_task_start(self, task, is_conditional):
+        self._task_started(task)
+
+    def v2_playbook_on_handler_task_start(self, task):
+        self._task_started(task)
+
+    def v2_runner_on_start(self, host, task):
+        self.host_starts[(host.get_name(), task._uuid)] = time.time()
+
+    def _record(self, result, status):
+        end = time.time()
+        host = result._host.get_name()
+        task = result._task
+        check_code, task_name, task_start = self.tasks.get(task._uuid) or (self._check_code(task), task.get_name().strip(), end)
+        # v2_runner_on_start 이 없는 ansible 버전은 태스크 시작 시각 사용
+        start = self.host_starts.pop((host, task._uuid), task_start)
+        self.rows.append([host, check_code, task_name, status, round(start, 3), round(end, 3)])
+
+    def v2_runner_on_ok(self, result):
+        self._record(result, 'changed' if result._result.get('changed') else 'ok')
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._record(result, 'failed')
+
+    def v2_runner_on_skipped(self, result):
+        self._record(result, 'skipped')
+
+    def v2_runner_on_unreachable(self, result):
+        self._record(result, 'unreachable')
+
+    def v2_playbook_on_stats(self, stats):
+        if not self.profile_path or not self.rows:
+            return
+
+        temp_path = self.profile_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.profile_path), exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'columns': PROFILE_COLUMNS, 'data': self.rows}, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_path, self.profile_path)
+            self._display.display(f"⏱️ 태스크 프로파일 {len(self.rows)}건 저장: {self.profile_path}")
+        except Exception as e:
+            self._display.warning(f"태스크 프로파일 저장 실패 ({self.profile_path}): {str(e)}")
@@ -0,0 +1,172 @@
+"""
+Ansible 실행 스케줄링 관련 함수들 (forks / strategy 자동 결정)
+"""
+import os
+import json
+import time
+import socket
+import statistics
+import yaml
+import psutil
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.inventory_handler import load_inventory_hosts
+
+# forks 산정 기준
+MAX_FORKS = 100               # 절대 상한
+FORKS_PER_CPU = 5             # SSH 대기 위주의 작업이므로 코어당 여러 워커 허용
+FORK_MEMORY_MB = 100          # 워커 1개당 예상 메모리 사용량
+RTT_BASELINE_MS = 50          # 이 값보다 느린 네트워크일수록 forks 를 늘려 대기 시간을 숨김
+RTT_SAMPLE_SIZE = 5           # RTT 측정에 사용할 최대 호스트 수
+RTT_TIMEOUT = 2               # RTT 측정 타임아웃 (초)
+
+# 원격 호스트 상태를 바꾸는 모듈 (free 전략 사용 여부 판단용)
+STATE_CHANGING_MODULES = {
+    'file', 'copy', 'template', 'lineinfile', 'blockinfile', 'replace', 'ini_file',
+    'service', 'systemd', 'systemd_service', 'sysvinit', 'user', 'group',
+    'package', 'apt', 'yum', 'dnf', 'pip', 'mount', 'cron', 'sysctl',
+    'ufw', 'firewalld', 'iptables', 'unarchive', 'get_url', 'pam_limits', 'pamd',
+    'mysql_user', 'mysql_variables', 'mysql_query', 'reboot', 'dconf'
+}
+COMMAND_MODULES = {'command', 'shell', 'raw', 'script'}
+
+# 태스크 딕셔너리에서 모듈이 아닌 키워드
+TASK_KEYWORDS = {
+    'name', 'when', 'register', 'loop', 'loop_control', 'with_items', 'with_dict', 'with_fileglob',
+    'become', 'become_user', 'become_method', 'ignore_errors', 'ignore_unreachable', 'changed_when',
+    'failed_when', 'delegate_to', 'delegate_facts', 'run_once', 'notify', 'tags', 'vars', 'args',
+    'environment', 'no_log', 'until', 'retries', 'delay', 'check_mode', 'diff', 'listen',
+    'block', 'rescue', 'always', 'any_errors_fatal', 'timeout', 'throttle', 'async', 'poll'
+}
+
+"""태스크의 모듈 이름 반환 (ansible.builtin.file → file)"""
+def _task_module(task):
+    for key in task:
+        if key not in TASK_KEYWORDS and not key.startswith('with_'):
+            return key.split('.')[-1]
+    return None
+
+"""태스크 목록이 원격 호스트 상태를 변경하지 않는지 확인"""
+def _tasks_are_read_only(tasks):
+    for task in tasks or []:
+        if not isinstance(task, dict):
+            continue
+
+        if 'block' in task:
+            if not all(_tasks_are_read_only(task.get(section)) for section in ('block', 'rescue', 'always')):
+                return False
+            continue
+
+        # 컨트롤 노드에서 실행되는 보고서 저장 등은 대상 호스트를 바꾸지 않음
+        if task.get('delegate_to') in ('localhost', '127.0.0.1'):
+            continue
+
+        module = _task_module(task)
+        if module in STATE_CHANGING_MODULES:
+            return False
+        if module in COMMAND_MODULES and str(task.get('changed_when', True)).lower() != 'false':
+            return False
+
+    return True
+
+"""생성된 플레이북(import 대상 포함)이 읽기 전용 점검으로만 구성되었는지 확인"""
+def is_read_only_playbook(playbook_path):
+    try:
+        with open(playbook_path, 'r', encoding='utf-8') as f:
+            plays = yaml.safe_load(f) or []
+
+        for play in plays:
+            if 'import_playbook' in play:
+                imported_path = os.path.normpath(os.path.join(os.path.dirname(playbook_path), play['import_playbook']))
+                if not is_read_only_playbook(imported_path):
+                    return False
+                continue
+
+            for section in ('pre_tasks', 'tasks', 'post_tasks', 'handlers'):
+                if not _tasks_are_read_only(play.get(section)):
+                    return False
+
+        return True
+
+    except Exception as e:
+        print(f"⚠️ 플레이북 읽기 전용 여부 확인 실패: {str(e)}")
+        return False
+
+"""호스트 SSH 포트까지의 TCP 연결 시간 측정 (ms)"""
+def _tcp_connect_ms(address, port):
+    start = time.perf_counter()
+    try:
+        with socket.create_connection((address, port), timeout=RTT_TIMEOUT):
+            return (time.perf_counter() - start) * 1000
+    except OSError:
+        return None
+
+"""샘플 호스트들의 SSH 왕복 시간 중앙값 측정 (ms, 측정 실패 시 None)"""
+def measure_ssh_rtt(hosts_info, sample_size=RTT_SAMPLE_SIZE):
+    targets = []
+    for host_name, host_vars in list(hosts_info.items())[:sample_size]:
+        address = host_vars.get('ansible_host', host_name)
+        port = int(host_vars.get('ansible_port', 22))
+        targets.append((address, port))
+
+    if not targets:
+        return None
+
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        samples = [ms for ms in executor.map(lambda target: _tcp_connect_ms(*target), targets) if ms is not None]
+
+    return round(statistics.median(samples), 1) if samples else None
+
+"""호스트 수, 컨트롤 노드 자원, SSH RTT, 점검 특성을 기반으로 forks / strategy 결정"""
+def plan_execution(inventory_path, playbook_path):
+    hosts_info = load_inventory_hosts(inventory_path)
+    host_count = max(len(hosts_info), 1)
+
+    cpu_count = os.cpu_count() or 1
+    memory_available_mb = int(psutil.virtual_memory().available / (1024 * 1024))
+    rtt_ms = measure_ssh_rtt(hosts_info)
+
+    # CPU 기준 상한: 네트워크가 느릴수록 워커가 대기하는 시간이 길어지므로 더 많은 forks 허용
+    latency_factor = 1.0 if rtt_ms is None else min(max(rtt_ms / RTT_BASELINE_MS, 1.0), 4.0)
+    cpu_limit = int(cpu_count * FORKS_PER_CPU * latency_factor)
+
+    # 메모리 기준 상한
+    memory_limit = max(memory_available_mb // FORK_MEMORY_MB, 1)
+
+    forks = max(1, min(host_count, cpu_limit, memory_limit, MAX_FORKS))
+
+    # 읽기 전용 점검이면 free 전략으로 빠른 호스트가 느린 호스트를 기다리지 않도록 함
+    read_only = is_read_only_playbook(playbook_path)
+    strategy = 'free' if read_only and host_count > 1 else 'linear'
+
+    return {
+        'forks': forks,
+        'strategy': strategy,
+        'host_count': len(hosts_info),
+        'cpu_count': cpu_count,
+        'memory_available_mb': memory_available_mb,
+        'ssh_rtt_ms': rtt_ms,
+        'read_only': read_only,
+        'limits': {
+            'cpu': cpu_limit,
+            'memory': memory_limit,
+            'max': MAX_FORKS
+        }
+    }
+
+"""선택된 실행 계획을 결과 폴더에 기록 (실행 간 비교용)"""
+def save_execution_plan(plan, result_folder_path, timestamp):
+    plan_path = os.path.join(result_folder_path, "execution_plan.json")
+    try:
+        with open(plan_path, 'w', encoding='utf-8') as f:
+            json.dump({'timestamp': timestamp, **plan}, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        print(f"⚠️ 실행 계획 저장 실패: {str(e)}")
+    return plan_path
+
+"""실행 계획을 한 줄 요약 문자열로 변환 (로그 헤더용)"""
+def format_execution_plan(plan):
+    rtt = f"{plan['ssh_rtt_ms']}ms" if plan.get('ssh_rtt_ms') is not None else "측정 실패"
+    return (f"forks={plan['forks']}, strategy={plan['strategy']}, hosts={plan['host_count']}, "
+            f"cpu={plan['cpu_count']}, mem_available={plan['memory_available_mb']}MB, ssh_rtt={rtt}, "
+            f"read_only={plan['read_only']}")
@@ -0,0 +1,179 @@
+"""
+실행 데이터 내보내기 번들 관련 함수들 (요청 시 한 번 생성, 디스크 캐시, 스트리밍 압축)
+
+리포트 다운로드 영역이 렌더링마다 CSV/JSON/로그 전체를 메모리에 만들어 두지 않도록, 사용자가 요청할 때만
+실행 하나의 결과(Parquet/CSV), 압축 로그, 요약 집계를 ZIP 번들 하나로 임시 파일에 스트리밍 기록합니다.
+만든 번들은 static/exports/<토큰>/kisa_export_<ts>.zip 에 남겨 두고, 원본 파일이 바뀌지 않았으면 모든 세션이 재사용합니다.
+번들은 Streamlit 정적 파일 서빙(server.enableStaticServing)으로 내려보내므로 파이썬 메모리에 올라가지 않으며,
+로그인 없이 접근하는 정적 경로에서 실행 시각만으로 주소를 추측할 수 없도록 실행마다 비밀 키 기반 토큰 폴더를 씁니다.
+"""
+import os
+import io
+import gzip
+import hmac
+import json
+import hashlib
+import secrets
+import shutil
+import zipfile
+import threading
+from datetime import datetime
+
+import pyarrow.parquet as pq
+
+from modules.log_writer import COMPRESSED_SUFFIX, resolve_log_path
+from modules.result_store import RESULT_SCHEMA, compact_run_results, get_result_store_path, is_result_store_fresh
+from modules.report_summary import classify_result_statuses, build_run_summary, get_report_summary_path, is_report_summary_fresh
+from modules.task_profile import get_task_profile_path
+
+EXPORT_DIR = os.path.join("static", "exports")     # 앱 폴더의 static/ 아래 (정적 파일 서빙 대상)
+EXPORT_STATIC_URL = "app/static/exports"           # 정적 파일 서빙 주소 (앱 기준 상대 경로)
+EXPORT_STATIC_MAX_BYTES = 200 * 1024 * 1024        # Streamlit 정적 파일 서빙이 내려보내는 최대 파일 크기
+EXPORT_SECRET_PATH = os.path.join("catalog", "export_secret.key")
+EXPORT_BATCH_ROWS = 50000                      # CSV 변환 시 한 번에 읽을 결과 행 수
+EXPORT_COPY_BUFFER = 1024 * 1024               # 로그 압축 복사 버퍼 크기
+EXPORT_RESULT_COLUMNS = RESULT_SCHEMA.names + ['실질적_양호상태', '상세_상태', '실패_유형']
+
+_build_locks = {}
+_build_locks_lock = threading.Lock()
+_secret_lock = threading.Lock()
+
+"""번들 주소 토큰용 비밀 키 (정적 경로 밖에 저장, 없으면 한 번 생성)"""
+def _get_export_secret():
+    with _secret_lock:
+        if os.path.exists(EXPORT_SECRET_PATH):
+            with open(EXPORT_SECRET_PATH, 'rb') as f:
+                return f.read()
+        os.makedirs(os.path.dirname(EXPORT_SECRET_PATH), exist_ok=True)
+        secret = secrets.token_bytes(32)
+        temp_path = f"{EXPORT_SECRET_PATH}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(secret)
+        os.replace(temp_path, EXPORT_SECRET_PATH)
+        return secret
+
+"""실행의 내보내기 번들 폴더 (실행 시각과 비밀 키로 만든 토큰 폴더, 번들 하나만 담음)"""
+def get_export_bundle_dir(timestamp, export_dir=EXPORT_DIR):
+    token = hmac.new(_get_export_secret(), timestamp.encode('utf-8'), hashlib.sha256).hexdigest()[:32]
+    return os.path.join(export_dir, token)
+
+"""실행의 내보내기 번들 경로"""
+def get_export_bundle_path(timestamp, export_dir=EXPORT_DIR):
+    return os.path.join(get_export_bundle_dir(timestamp, export_dir), f"kisa_export_{timestamp}.zip")
+
+"""번들의 정적 파일 서빙 주소 (static/ 기준 상대 경로를 URL 로)"""
+def get_export_bundle_url(bundle_path, export_dir=EXPORT_DIR):
+    relative_path = os.path.relpath(bundle_path, export_dir).replace(os.sep, '/')
+    return f"{EXPORT_STATIC_URL}/{relative_path}"
+
+def _result_folder(timestamp):
+    return os.path.join("playbooks", f"playbook_result_{timestamp}")
+
+"""번들에 들어가는 원본 파일 (결과 저장소, 요약, 태스크 프로파일, 로그 중 있는 것만)"""
+def _bundle_sources(timestamp):
+    result_folder_path = _result_folder(timestamp)
+    sources = [
+        get_result_store_path(result_folder_path),
+        get_report_summary_path(result_folder_path),
+        get_task_profile_path(result_folder_path),
+        resolve_log_path(timestamp)
+    ]
+    return [path for path in sources if os.path.exists(path)]
+
+"""번들이 원본 파일들보다 최신인지 확인 (원본이 하나라도 바뀌면 다시 생성)"""
+def is_export_bundle_fresh(timestamp):
+    bundle_path = get_export_bundle_path(timestamp)
+    if not os.path.exists(bundle_path):
+        return False
+    if not is_result_store_fresh(_result_folder(timestamp)):
+        return False
+    bundle_mtime = os.path.getmtime(bundle_path)
+    return all(os.path.getmtime(path) <= bundle_mtime for path in _bundle_sources(timestamp))
+
+def _write_results_csv(bundle, store_path, arcname, vulnerable_only=False):
+    # 결과 저장소를 배치 단위로 읽어 분류 컬럼을 붙인 뒤 ZIP 항목에 바로 이어 씀 (엑셀 호환 BOM 포함)
+    row_count = 0
+    with bundle.open(arcname, 'w', force_zip64=True) as entry, \
+            io.TextIOWrapper(entry, encoding='utf-8-sig', newline='') as writer:
+        header = True
+        for batch in pq.ParquetFile(store_path).iter_batches(batch_size=EXPORT_BATCH_ROWS):
+            df = classify_result_statuses(batch.to_pandas())
+            if vulnerable_only:
+                df = df[~df['실질적_양호상태']]
+            df[EXPORT_RESULT_COLUMNS].to_csv(writer, index=False, header=header)
+            header = False
+            row_count += len(df)
+        if header:
+            writer.write(','.join(EXPORT_RESULT_COLUMNS) + '\n')
+    return row_count
+
+def _write_log(bundle, log_path, timestamp):
+    # 이미 압축된 로그는 그대로, 일반 로그는 gzip 으로 압축하며 복사 (두 번 압축하지 않도록 ZIP 항목은 무압축)
+    arcname = f"ansible_log_{timestamp}.log.gz"
+    if log_path.endswith(COMPRESSED_SUFFIX):
+        bundle.write(log_path, arcname, compress_type=zipfile.ZIP_STORED)
+        return arcname
+
+    entry_info = zipfile.ZipInfo(arcname, date_time=datetime.now().timetuple()[:6])
+    entry_info.compress_type = zipfile.ZIP_STORED
+    with open(log_path, 'rb') as source, bundle.open(entry_info, 'w', force_zip64=True) as entry, \
+            gzip.GzipFile(filename=os.path.basename(log_path), mode='wb', fileobj=entry) as target:
+        shutil.copyfileobj(source, target, EXPORT_COPY_BUFFER)
+    return arcname
+
+"""실행 하나의 내보내기 번들 생성 (임시 파일에 스트리밍 기록 후 교체, 결과가 없으면 None)"""
+def build_export_bundle(timestamp):
+    result_folder_path = _result_folder(timestamp)
+
+    # 리포트와 같은 원본 사용 (Parquet 결과 저장소/요약이 없거나 오래됐으면 먼저 생성)
+    if not is_result_store_fresh(result_folder_path):
+        compact_run_results(result_folder_path)
+    store_path = get_result_store_path(result_folder_path)
+    if not os.path.exists(store_path):
+        return None
+    if not is_report_summary_fresh(result_folder_path):
+        build_run_summary(result_folder_path)
+
+    bundle_path = get_export_bundle_path(timestamp)
+    os.makedirs(os.path.dirname(bundle_path), exist_ok=True)
+    temp_path = bundle_path + ".tmp"
+
+    manifest = {'timestamp': timestamp, 'created_at': datetime.now().isoformat(timespec='seconds'), 'files': {}}
+    with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as bundle:
+        # Parquet 은 이미 zstd 압축이므로 무압축으로 담음
+        bundle.write(store_path, "results.parquet", compress_type=zipfile.ZIP_STORED)
+        manifest['files']['results.parquet'] = {'rows': pq.ParquetFile(store_path).metadata.num_rows}
+        manifest['files']['results.csv'] = {'rows': _write_results_csv(bundle, store_path, "results.csv")}
+        manifest['files']['actual_vulnerabilities.csv'] = {
+            'rows': _write_results_csv(bundle, store_path, "actual_vulnerabilities.csv", vulnerable_only=True)
+        }
+
+        summary_path = get_report_summary_path(result_folder_path)
+        if os.path.exists(summary_path):
+            bundle.write(summary_path, "report_summary.json")
+            manifest['files']['report_summary.json'] = {}
+
+        profile_path = get_task_profile_path(result_folder_path)
+        if os.path.exists(profile_path):
+            bundle.write(profile_path, "task_profile.parquet", compress_type=zipfile.ZIP_STORED)
+            manifest['files']['task_profile.parquet'] = {'rows': pq.ParquetFile(profile_path).metadata.num_rows}
+
+        log_path = resolve_log_path(timestamp)
+        if os.path.exists(log_path):
+            manifest['files'][_write_log(bundle, log_path, timestamp)] = {'source': os.path.basename(log_path)}
+
+        bundle.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2))
+
+    os.replace(temp_path, bundle_path)
+    print(f"📦 내보내기 번들 생성 완료: {bundle_path} ({os.path.getsize(bundle_path):,} bytes)")
+    return bundle_path
+
+"""내보내기 번들 경로 반환 (최신 번들이 있으면 그대로, 없거나 오래됐으면 생성, 같은 실행은 한 번만 생성)"""
+def get_export_bundle(timestamp):
+    with _build_locks_lock:
+        build_lock = _build_locks.setdefault(timestamp, threading.Lock())
+
+    with build_lock:
+        if is_export_bundle_fresh(timestamp):
+            return get_export_bundle_path(timestamp)
+        return build_export_bundle(timestamp)
@@ -2,7 +2,14 @@ import os
 import glob
 import re
 import streamlit as st
-from datetime import datetime
+
+from modules.log_writer import list_execution_logs
+from modules.run_catalog import get_run_catalog
+from modules.report_cache import invalidate_run_cache, get_report_cache_stats
+from modules.retention import (
+    RETENTION_MIN_COMPACT_DAYS, load_retention_policy, save_retention_policy, load_retention_state, apply_retention,
+    is_retention_policy_saved
+)
 
 """기존 분석 기록 확인 및 디버깅"""
 def debug_existing_logs():
@@ -14,7 +21,7 @@ def debug_existing_logs():
         log_files = glob.glob("logs/*.log")
         print(f"📄 logs 폴더 내 .log 파일 수: {len(log_files)}")
         
-        ansible_logs = glob.glob("logs/ansible_execute_log_*.log")
+        ansible_logs = list_execution_logs()
         print(f"📋 ansible_execute_log_*.log 파일 수: {len(ansible_logs)}")
         
         if ansible_logs:
@@ -24,7 +31,7 @@ def debug_existing_logs():
                 
                 # 타임스탬프 추출 테스트
                 filename = os.path.basename(log_file)
-                timestamp_match = re.search(r'ansible_execute_log_(\d{8}_\d{6})\.log', filename)
+                timestamp_match = re.search(r'ansible_execute_log_(\d{8}_\d{6})\.log(\.gz)?$', filename)
                 if timestamp_match:
                     timestamp = timestamp_match.group(1)
                     print(f"    → 타임스탬프: {timestamp}")
@@ -75,69 +82,13 @@ def debug_existing_logs():
     
     print("=== 기존 분석 기록 스캔 완료 ===\n")
 
-"""분석 실행 기록 목록을 로드 (개선된 버전)"""
-def load_analysis_history():
-
-    history = []
-    # logs 폴더에서 ansible_execute_log_*.log 파일들 스캔
-    if os.path.exists("logs"):
-        log_files = glob.glob("logs/ansible_execute_log_*.log")
-        print(f"📋 발견된 로그 파일 수: {len(log_files)}")
-        
-        for log_file in log_files:
-            try:
-                # 파일명에서 타임스탬프 추출
-                filename = os.path.basename(log_file)
-                timestamp_match = re.search(r'ansible_execute_log_(\d{8}_\d{6})\.log', filename)
-                
-                if timestamp_match:
-                    timestamp = timestamp_match.group(1)
-                    
-                    # 해당하는 결과 폴더가 있는지 확인
-                    result_folder = f"playbooks/playbook_result_{timestamp}"
-                    
-                    # 로그 파일이 있으면 기록에 추가 (결과 폴더가 없어도)
-                    file_stat = os.stat(log_file)
-                    file_size = file_stat.st_size
-                    mtime = file_stat.st_mtime
-                    execution_time = datetime.fromtimestamp(mtime)
-                    
-                    # 결과 폴더 및 JSON 파일 확인
-                    has_results = False
-                    json_count = 0
-                    if os.path.exists(result_folder):
-                        results_path = f"{result_folder}/results"
-                        if os.path.exists(results_path):
-                            json_files = glob.glob(f"{results_path}/*.json")
-                            json_count = len(json_files)
-                            has_results = json_count > 0
-                    
-                    record = {
-                        'timestamp': timestamp,
-                        'execution_time': execution_time,
-                        'log_file': log_file,
-                        'result_folder': result_folder,
-                        'display_name': execution_time.strftime("%Y-%m-%d %H:%M:%S"),
-                        'file_size': file_size,
-                        'has_results': has_results,
-                        'json_count': json_count,
-                        'status': '완료' if has_results else '실패 (실행만)'
-                    }
-                    
-                    history.append(record)
-                    print(f"  ✅ {timestamp} - {record['status']} (JSON: {json_count}개)")
-                    
-                else:
-                    print(f"  ❌ 타임스탬프 추출 실패: {filename}")
-                    
-            except Exception as e:
-                print(f"  ❌ 파일 처리 오류 {log_file}: {str(e)}")
-    else:
-        print("📁 logs 폴더가 존재하지 않습니다.")
-    
-    # 최신 순으로 정렬
-    history.sort(key=lambda x: x['execution_time'], reverse=True)
-    return history
+"""분석 실행 기록 목록을 로드 (실행 기록 카탈로그에서 최신 순으로 조회)"""
+def load_analysis_history(limit=None):
+    try:
+        return get_run_catalog().list_runs(limit)
+    except Exception as e:
+        print(f"❌ 실행 기록 카탈로그 조회 오류: {str(e)}")
+        return []
 
 """확장된 사이드바 렌더링 (개선된 버전)"""
 def render_sidebar_with_history(vulnerability_categories=None, filename_mapping=None):
@@ -173,6 +124,11 @@ def render_sidebar_with_history(vulnerability_categories=None, filename_mapping=
             st.query_params.from_dict({"page": "dynamic_analysis"})  # 🆕 수정
             st.rerun()
 
+        # 점검 추이 분석 페이지로 이동 버튼
+        if st.sidebar.button("📈 점검 추이 (Trend Analysis)", use_container_width=True):
+            st.query_params.from_dict({"page": "trend_analysis"})
+            st.rerun()
+
         # # 스케줄링 페이지로 이동 버튼
         # if st.sidebar.button("⏰ 스케줄링 (Scheduling)", use_container_width=True):
         #     st.query_params.from_dict({"page": "scheduling"})  # 🆕 수정
@@ -192,21 +148,24 @@ def render_sidebar_with_history(vulnerability_categories=None, filename_mapping=
     # 기존 기록 디버깅 버튼 (개발 시에만)
     if st.sidebar.button("🔍 기존 기록 스캔 (새로고침)", use_container_width=True):
         debug_existing_logs()
+        get_run_catalog().rebuild()
+        invalidate_run_cache()
     
-    # 분석 기록 로드
-    analysis_history = load_analysis_history()
+    # 분석 기록 로드 (카탈로그에서 최근 10개만 조회)
+    analysis_history = load_analysis_history(limit=10)
     
     if analysis_history:
-        st.sidebar.markdown(f"**총 {len(analysis_history)}개의 실행 기록**")
+        total_count = get_run_catalog().count_runs()
+        st.sidebar.markdown(f"**총 {total_count}개의 실행 기록**")
+        if st.session_state.get('role') == 'admin':
+            cache_stats = get_report_cache_stats()
+            st.sidebar.caption(
+                f"🗃️ 리포트 캐시: 적중 {cache_stats['hits']} / 미스 {cache_stats['misses']} "
+                f"({cache_stats['hit_rate']:.0f}%), {cache_stats['entries']}/{cache_stats['maxsize']}개"
+            )
         
         # 각 기록을 버튼으로 표시 (상태 포함)
-        for i, record in enumerate(analysis_history):
-            # 최근 10개만 표시
-            if i >= 10:
-                remaining = len(analysis_history) - 10
-                st.sidebar.text(f"... 외 {remaining}개 더")
-                break
-            
+        for record in analysis_history:
             # 상태 아이콘 결정
             status_icon = "✅" if record['has_results'] else "❌"
             
@@ -224,6 +183,10 @@ def render_sidebar_with_history(vulnerability_categories=None, filename_mapping=
                 st.query_params.from_dict({"report": record['timestamp']})
                 st.rerun()
         
+        # 최근 10개만 표시
+        if total_count > len(analysis_history):
+            st.sidebar.text(f"... 외 {total_count - len(analysis_history)}개 더")
+        
         st.sidebar.markdown("---")
         
         # # 기록 통계 표시
@@ -239,6 +202,64 @@ def render_sidebar_with_history(vulnerability_categories=None, filename_mapping=
         st.sidebar.info("아직 분석 기록이 없습니다.")
         st.sidebar.markdown("취약점 점검을 실행하면 기록이 표시됩니다.")
 
+    if st.session_state.get('role') == 'admin':
+        render_retention_settings()
+
+"""보관 정책 설정/수동 적용 (관리자 사이드바)"""
+def render_retention_settings():
+    with st.sidebar.expander("🧹 보관 정책 (로그/결과 정리)"):
+        policy = load_retention_policy()
+        enabled = st.checkbox("자동 정리 사용", value=policy['enabled'], key="retention_enabled")
+        compact_after_days = st.number_input(
+            "압축 보관 (일 경과 후)", min_value=RETENTION_MIN_COMPACT_DAYS, value=policy['compact_after_days'],
+            help="결과 Parquet / 요약 / gzip 로그만 남기고 결과 JSON, 생성 플레이북, inventory 정리",
+            key="retention_compact_days"
+        )
+        delete_after_days = st.number_input(
+            "삭제 (일 경과 후, 0 = 삭제 안 함)", min_value=0, value=policy['delete_after_days'],
+            key="retention_delete_days"
+        )
+
+        if st.button("💾 정책 저장", use_container_width=True, key="retention_save"):
+            saved = save_retention_policy({
+                'enabled': enabled,
+                'compact_after_days': compact_after_days,
+                'delete_after_days': delete_after_days
+            })
+            st.success(f"저장됨: {saved['compact_after_days']}일 후 압축, "
+                       f"{str(saved['delete_after_days']) + '일 후 삭제' if saved['delete_after_days'] else '삭제 안 함'}")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            preview = st.button("🔍 대상 확인", use_container_width=True, key="retention_preview")
+        with col2:
+            run_now = st.button("🧹 지금 정리", use_container_width=True, key="retention_run",
+                                disabled=not is_retention_policy_saved())
+        if not is_retention_policy_saved():
+            st.caption("정책을 저장하기 전에는 자동/수동 정리를 하지 않습니다.")
+
+        if preview:
+            plan = apply_retention(dry_run=True)
+            if plan is None:
+                st.info("다른 정리가 진행 중입니다.")
+            else:
+                st.caption(f"압축 대상 {len(plan['compact'])}개, 삭제 대상 {len(plan['delete'])}개")
+        if run_now:
+            with st.spinner("보관 정책 적용 중..."):
+                result = apply_retention()
+            if result is None:
+                st.info("다른 정리가 진행 중입니다.")
+            else:
+                st.success(f"압축 {len(result['compact'])}개, 삭제 {len(result['delete'])}개 "
+                           f"({result['freed_bytes'] / (1024 * 1024):.1f} MB 확보)")
+                for timestamp, error in result['failed'].items():
+                    st.warning(f"{timestamp}: {error}")
+
+        state = load_retention_state()
+        if state:
+            st.caption(f"마지막 정리: {state['finished_at']} · 압축 {state['compacted']} / 삭제 {state['deleted']} · "
+                       f"{state['freed_bytes'] / (1024 * 1024):.1f} MB 확보")
+
 """분석 리포트 표시 - analysis_report로 리다이렉션"""
 def show_analysis_report(timestamp):
 
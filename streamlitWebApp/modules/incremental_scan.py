@@ -0,0 +1,336 @@
+"""
+증분(차등) 점검 관련 함수들
+
+점검별 입력(대상 설정 파일의 stat/해시, 설치 패키지 목록, 실행 중인 서비스 목록, 점검 플레이북 자체)을
+호스트마다 가볍게 지문(fingerprint)으로 수집하고, 이전 실행과 지문이 같은 (호스트, 점검) 조합은
+이전 결과 JSON 을 그대로 재사용합니다. 지문이 달라졌거나 입력을 확정할 수 없는 점검만 다시 실행합니다.
+"""
+import os
+import re
+import json
+import hashlib
+import threading
+import subprocess
+import yaml
+from datetime import datetime, timedelta
+
+from modules.inventory_handler import load_inventory_hosts, filter_inventory_file
+from modules.result_collector import RESULT_STORE_PREFIX, build_task_code, load_result_reports, write_result_store
+
+INCREMENTAL_DIR = "incremental"
+FINGERPRINT_INDEX_PATH = os.path.join(INCREMENTAL_DIR, "fingerprint_index.json")
+CHECK_MAPPING_FILENAME = "check_mapping.json"      # 플레이북 생성 시 저장되는 호스트별 점검 목록
+INCREMENTAL_MAX_AGE_DAYS = 7      # 지문이 같아도 이 기간이 지난 결과는 다시 점검
+FINGERPRINT_SCAN_DEPTH = 3        # 디렉터리 입력은 하위 항목 메타데이터를 이 깊이까지 지문에 반영
+
+# 점검 플레이북에서 입력 파일/디렉터리로 볼 절대 경로 (최상위 디렉터리 자체는 제외)
+INPUT_PATH_PATTERN = re.compile(
+    r"""(?<![\w.{$/-])(/(?:etc|var|usr|boot|root|home|opt|srv|bin|sbin|lib)(?:/[A-Za-z0-9_.+@-]+)+)"""
+)
+
+# 파일 지문만으로 결과가 같다고 볼 수 없는 점검 (파일시스템 전체 검색, 프로세스/DB 상태, 동적 경로)
+NON_CACHEABLE_PATTERNS = {
+    'filesystem_scan': re.compile(r'\bfind\b'),
+    'process_state': re.compile(r'\bps\s+-?[aefux]'),
+    'database_state': re.compile(r'mysql'),
+    'glob_path': re.compile(r'/[\w./-]*\*'),
+    'dynamic_path': re.compile(r'\{\{[^}]*\}\}/')
+}
+
+# 설치 패키지 버전만으로 결과가 정해지는 점검 (입력 파일 없이도 재사용 가능)
+PACKAGE_ONLY_CHECK_PATTERN = re.compile(r'(_version_check|security_patch_check|secure_os_version)')
+
+_index_lock = threading.Lock()
+
+"""점검 플레이북(tasks/*.yml)에서 지문 대상 입력과 재사용 가능 여부 분석"""
+def analyze_check_inputs(task_file, tasks_dir):
+    with open(os.path.join(tasks_dir, task_file), 'r', encoding='utf-8') as f:
+        source = f.read()
+
+    inputs = {
+        'task_hash': hashlib.sha256(source.encode('utf-8')).hexdigest(),
+        'paths': sorted(set(INPUT_PATH_PATTERN.findall(source))),
+        'cacheable': True,
+        'reason': None
+    }
+
+    for reason, pattern in NON_CACHEABLE_PATTERNS.items():
+        if pattern.search(source):
+            inputs['cacheable'] = False
+            inputs['reason'] = reason
+            return inputs
+
+    if not inputs['paths'] and not PACKAGE_ONLY_CHECK_PATTERN.search(task_file):
+        inputs['cacheable'] = False
+        inputs['reason'] = 'no_known_inputs'
+
+    return inputs
+
+"""호스트별 입력 지문 수집 플레이북 생성"""
+def build_fingerprint_playbook(paths, output_dir):
+    return [{
+        'name': 'KISA Security Check - Incremental Input Fingerprints',
+        'hosts': 'target_servers',
+        'become': True,
+        'gather_facts': False,
+        'any_errors_fatal': False,
+        'ignore_errors': True,
+        'ignore_unreachable': True,
+        'vars': {
+            'fingerprint_paths': paths,
+            'fingerprint_scan_depth': FINGERPRINT_SCAN_DEPTH,
+            'fingerprint_output_dir': os.path.abspath(output_dir)
+        },
+        'tasks': [
+            {
+                'name': 'Fingerprint check input files',
+                'ansible.builtin.shell': (
+                    "for p in {{ fingerprint_paths | map('quote') | join(' ') }}; do\n"
+                    "  if [ -d \"$p\" ]; then\n"
+                    "    printf '%s\\t%s\\n' \"$p\" \"$(find \"$p\" -xdev -maxdepth {{ fingerprint_scan_depth }} "
+                    "-printf '%p %m %U %G %s %T@\\n' 2>/dev/null | sort | sha1sum | cut -c1-40)\"\n"
+                    "  elif [ -e \"$p\" ]; then\n"
+                    "    printf '%s\\t%s %s\\n' \"$p\" \"$(stat -c '%a %u %g %s %Y' \"$p\")\" \"$(sha1sum < \"$p\" | cut -c1-40)\"\n"
+                    "  else\n"
+                    "    printf '%s\\tmissing\\n' \"$p\"\n"
+                    "  fi\n"
+                    "done\n"
+                ),
+                'register': 'fingerprint_files',
+                'changed_when': False
+            },
+            {
+                'name': 'Fingerprint installed packages',
+                'ansible.builtin.shell': "{ rpm -qa 2>/dev/null; dpkg-query -W 2>/dev/null; } | sort | sha1sum | cut -c1-40",
+                'register': 'fingerprint_packages',
+                'changed_when': False
+            },
+            {
+                'name': 'Fingerprint running services',
+                'ansible.builtin.shell': (
+                    "systemctl list-units --type=service --state=running --no-legend --plain 2>/dev/null "
+                    "| awk '{print $1}' | sort | sha1sum | cut -c1-40"
+                ),
+                'register': 'fingerprint_services',
+                'changed_when': False
+            },
+            {
+                'name': 'Save host fingerprint on control node',
+                'ansible.builtin.copy': {
+                    'content': (
+                        "{{ {'complete': fingerprint_files is succeeded and fingerprint_packages is succeeded, "
+                        "'files': fingerprint_files.stdout_lines | default([]), "
+                        "'packages': fingerprint_packages.stdout | default(''), "
+                        "'services': fingerprint_services.stdout | default('')} | to_nice_json }}"
+                    ),
+                    'dest': "{{ fingerprint_output_dir }}/{{ inventory_hostname }}.json",
+                    'mode': '0644'
+                },
+                'delegate_to': 'localhost',
+                'become': False
+            }
+        ]
+    }]
+
+"""지문 수집 플레이북 실행 후 호스트별 지문 반환 (수집 실패 호스트는 제외)"""
+def collect_fingerprints(inventory_path, paths, result_folder_path, timestamp, env, emit):
+    output_dir = os.path.join(result_folder_path, "fingerprints")
+    os.makedirs(output_dir, exist_ok=True)
+
+    playbook_path = os.path.join(result_folder_path, f"fingerprint_{timestamp}.yml")
+    with open(playbook_path, 'w', encoding='utf-8') as f:
+        yaml.dump(build_fingerprint_playbook(paths, output_dir), f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+
+    process = subprocess.Popen(
+        ['ansible-playbook', '-i', inventory_path, playbook_path, '--limit', 'target_servers'],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+        bufsize=1,
+        cwd=os.getcwd(),
+        env=env
+    )
+    for line in process.stdout:
+        # 본 점검의 PLAY RECAP 과 구분되도록 이름 변경
+        emit(f"(fingerprint) {line.strip().replace('PLAY RECAP', 'FINGERPRINT RECAP')}")
+    process.wait()
+
+    fingerprints = {}
+    for file_name in os.listdir(output_dir):
+        if not file_name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(output_dir, file_name), 'r', encoding='utf-8') as f:
+                fingerprints[file_name[:-len(".json")]] = json.load(f)
+        except Exception as e:
+            print(f"⚠️ 지문 파일 읽기 실패 ({file_name}): {str(e)}")
+    return fingerprints
+
+"""호스트 지문과 점검 입력으로 (호스트, 점검) 지문 계산 (재사용 불가 시 None)"""
+def compute_check_fingerprint(inputs, host_fingerprint):
+    if not inputs['cacheable'] or not host_fingerprint or not host_fingerprint.get('complete'):
+        return None
+
+    file_lines = {line.split('\t', 1)[0]: line for line in host_fingerprint.get('files', [])}
+    if any(path not in file_lines for path in inputs['paths']):
+        return None
+
+    material = {
+        'task': inputs['task_hash'],
+        'packages': host_fingerprint.get('packages', ''),
+        'services': host_fingerprint.get('services', ''),
+        'files': [file_lines[path] for path in inputs['paths']]
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode('utf-8')).hexdigest()
+
+def load_fingerprint_index():
+    if not os.path.exists(FINGERPRINT_INDEX_PATH):
+        return {}
+    try:
+        with open(FINGERPRINT_INDEX_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️ 지문 인덱스 읽기 실패, 전체 점검으로 진행합니다: {str(e)}")
+        return {}
+
+def save_fingerprint_index(index):
+    os.makedirs(INCREMENTAL_DIR, exist_ok=True)
+    temp_path = FINGERPRINT_INDEX_PATH + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, FINGERPRINT_INDEX_PATH)
+
+"""플레이북 생성 시 저장한 호스트별 점검 목록을 inventory 호스트 기준으로 전개"""
+def load_host_checks(result_folder_path, inventory_path):
+    mapping_path = os.path.join(result_folder_path, CHECK_MAPPING_FILENAME)
+    with open(mapping_path, 'r', encoding='utf-8') as f:
+        mapping = json.load(f)
+
+    host_checks = {}
+    for host in load_inventory_hosts(inventory_path):
+        task_files = mapping['hosts'].get(host, mapping.get('default') or [])
+        if task_files:
+            host_checks[host] = list(task_files)
+    return host_checks
+
+"""증분 점검 준비: 지문 수집 → 재사용 가능한 결과 복사 → 다시 실행할 호스트만 담은 inventory / 건너뛸 점검 변수 생성"""
+def prepare_incremental_run(inventory_path, result_folder_path, timestamp, tasks_dir, env, emit):
+    host_checks = load_host_checks(result_folder_path, inventory_path)
+    all_checks = sorted({task_file for task_files in host_checks.values() for task_file in task_files})
+    check_inputs = {task_file: analyze_check_inputs(task_file, tasks_dir) for task_file in all_checks}
+
+    cacheable_count = sum(1 for inputs in check_inputs.values() if inputs['cacheable'])
+    emit(f"🔁 증분 점검: 점검 {len(all_checks)}개 중 {cacheable_count}개가 지문 기반 재사용 대상입니다.")
+
+    fingerprint_paths = sorted({path for inputs in check_inputs.values() if inputs['cacheable'] for path in inputs['paths']})
+    fingerprints = collect_fingerprints(inventory_path, fingerprint_paths, result_folder_path, timestamp, env, emit) if cacheable_count else {}
+
+    with _index_lock:
+        index = load_fingerprint_index()
+
+    results_dir = os.path.join(result_folder_path, "results")
+    os.makedirs(results_dir, exist_ok=True)
+    expire_before = datetime.now() - timedelta(days=INCREMENTAL_MAX_AGE_DAYS)
+
+    # 이전 실행 결과 폴더별 보고서 (같은 폴더는 한 번만 읽음)
+    report_cache = {}
+    reused_reports = []
+
+    def previous_reports(previous_results_dir):
+        if not previous_results_dir:
+            return {}
+        if previous_results_dir not in report_cache:
+            report_cache[previous_results_dir] = load_result_reports(previous_results_dir)
+        return report_cache[previous_results_dir]
+
+    plan = {
+        'timestamp': timestamp,
+        'reused': [],
+        'executed': [],
+        'skip': {},
+        'fingerprints': {},
+        'run_hosts': []
+    }
+
+    for host, task_files in sorted(host_checks.items()):
+        host_fingerprint = fingerprints.get(host)
+        for task_file in task_files:
+            task_code = task_file.replace('.yml', '')
+            report_key = (host, build_task_code(task_file))
+            inputs = check_inputs[task_file]
+            fingerprint = compute_check_fingerprint(inputs, host_fingerprint)
+            plan['fingerprints'].setdefault(host, {})[task_file] = fingerprint
+
+            previous = index.get(host, {}).get(task_file)
+            if fingerprint is None:
+                reason = inputs['reason'] or 'no_fingerprint'
+            elif not previous:
+                reason = 'new'
+            elif previous['fingerprint'] != fingerprint:
+                reason = 'changed'
+            elif datetime.fromisoformat(previous['recorded_at']) < expire_before:
+                reason = 'expired'
+            elif report_key not in previous_reports(previous.get('results_dir')):
+                reason = 'missing_result'
+            else:
+                # 지문이 같으면 이전 보고서를 이번 실행 결과로 재사용
+                reused_reports.append(previous_reports(previous['results_dir'])[report_key])
+                plan['reused'].append({'host': host, 'check': task_file, 'source': previous['results_dir']})
+                plan['skip'].setdefault(host, []).append(task_code)
+                continue
+
+            plan['executed'].append({'host': host, 'check': task_file, 'reason': reason})
+
+    plan['run_hosts'] = sorted({item['host'] for item in plan['executed']})
+
+    # 재사용한 보고서는 이번 실행 결과 폴더에 별도 결과 저장소로 저장
+    if reused_reports:
+        write_result_store(os.path.join(results_dir, f"{RESULT_STORE_PREFIX}_reused.json"), reused_reports)
+
+    # 다시 실행할 호스트만 담은 inventory 와 건너뛸 점검 목록 변수 파일
+    plan['inventory_path'] = filter_inventory_file(
+        inventory_path, plan['run_hosts'], f"{os.path.splitext(inventory_path)[0]}_incremental.ini"
+    )
+    plan['extra_vars'] = {'incremental_skip': plan['skip']}
+    plan['extra_vars_path'] = os.path.join(result_folder_path, f"incremental_skip_{timestamp}.json")
+    with open(plan['extra_vars_path'], 'w', encoding='utf-8') as f:
+        json.dump(plan['extra_vars'], f, ensure_ascii=False, indent=2)
+
+    with open(os.path.join(result_folder_path, "incremental_plan.json"), 'w', encoding='utf-8') as f:
+        json.dump({key: plan[key] for key in ('timestamp', 'run_hosts', 'reused', 'executed')}, f, ensure_ascii=False, indent=2)
+
+    emit(f"🔁 증분 점검: 재사용 {len(plan['reused'])}개, 재실행 {len(plan['executed'])}개 "
+         f"(대상 호스트 {len(plan['run_hosts'])}/{len(host_checks)}대)")
+    return plan
+
+"""실행 완료 후 지문 인덱스 갱신 (재실행되어 결과가 생긴 조합은 새 지문으로, 재사용 조합은 이번 결과 폴더로)"""
+def finalize_incremental_run(plan, result_folder_path):
+    results_dir = os.path.abspath(os.path.join(result_folder_path, "results"))
+    reused = {(item['host'], item['check']) for item in plan['reused']}
+    collected_reports = load_result_reports(results_dir)
+    now = datetime.now().isoformat(timespec='seconds')
+
+    with _index_lock:
+        index = load_fingerprint_index()
+
+        for host, checks in plan['fingerprints'].items():
+            host_index = index.setdefault(host, {})
+            for task_file, fingerprint in checks.items():
+                if fingerprint is None or (host, build_task_code(task_file)) not in collected_reports:
+                    host_index.pop(task_file, None)
+                elif (host, task_file) in reused and task_file in host_index:
+                    # 최초 점검 시각은 유지하여 최대 재사용 기간이 이어지도록 함
+                    host_index[task_file]['results_dir'] = results_dir
+                    host_index[task_file]['run_timestamp'] = plan['timestamp']
+                else:
+                    host_index[task_file] = {
+                        'fingerprint': fingerprint,
+                        'results_dir': results_dir,
+                        'run_timestamp': plan['timestamp'],
+                        'recorded_at': now
+                    }
+
+        try:
+            save_fingerprint_index(index)
+        except Exception as e:
+            print(f"⚠️ 지문 인덱스 저장 실패: {str(e)}")
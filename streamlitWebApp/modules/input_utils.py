@@ -1,10 +1,44 @@
 import re
-from collections import defaultdict
 
 """
 취약점 점검 관련 유틸리티 함수들
 """
 
+RECAP_STAT_KEYS = ['ok', 'changed', 'unreachable', 'failed', 'skipped', 'rescued', 'ignored']
+RECAP_STAT_MARKERS = ["ok=", "changed=", "failed=", "unreachable="]   # 통계 라인 판단용
+RECAP_STAT_PATTERN = re.compile(r'(ok|changed|unreachable|failed|skipped|rescued|ignored)=(\d+)')
+RECAP_TIMESTAMP_PATTERN = re.compile(r'^\[.*?\]\s*')
+
+# 결과 통계 항목 → PLAY RECAP 키
+RESULT_SUMMARY_KEYS = {
+    "성공한 태스크": 'ok',
+    "변경된 설정": 'changed',
+    "실패한 태스크": 'failed',
+    "무시된 태스크": 'ignored',
+    "접근 불가 서버": 'unreachable',
+    "건너뛴 태스크": 'skipped'
+}
+
+# 실행 중 실시간 집계 키와, 태스크 결과 상태별로 올리는 키 (ansible 통계와 같이 changed 도 ok 에 포함)
+LIVE_STAT_KEYS = ['ok', 'changed', 'failed', 'skipped', 'unreachable', 'ignored']
+LIVE_STATUS_INCREMENTS = {
+    'ok': ('ok',),
+    'changed': ('ok', 'changed'),
+    'failed': ('failed',),
+    'skipped': ('skipped',),
+    'unreachable': ('unreachable',)
+}
+
+# ansible 기본 출력의 태스크 결과 라인 (샤드 접두사, 루프 항목 라인 구분)과 태스크 경계 라인
+TASK_RESULT_LINE_PATTERN = re.compile(
+    r'^(\(shard \d+/\d+\) )?(ok|changed|skipping|fatal|failed): \[([^\]]+)\](\s*(?:=>\s*)?\(item=)?(.*)$'
+)
+TASK_BOUNDARY_PATTERN = re.compile(r'^(\(shard \d+/\d+\) )?(?:(?:TASK|RUNNING HANDLER|PLAY) \[|SHARD \d+/\d+ RECAP)')
+TASK_RESULT_STATUSES = {'ok': 'ok', 'changed': 'changed', 'skipping': 'skipped', 'fatal': 'failed', 'failed': 'failed'}
+ITEM_STATUS_PRIORITY = ['skipped', 'ok', 'changed', 'failed']   # 루프 항목 상태 → 태스크 결과 (성공/실패 루프는 항목 라인만 출력됨)
+IGNORING_LINE_PATTERN = re.compile(r'^(\(shard \d+/\d+\) )?\.\.\.ignoring$')
+IGNORABLE_STATUSES = ('failed', 'unreachable')        # 뒤이은 '...ignoring' 이면 ok + ignored 로 집계되는 결과
+
 """선택된 점검 항목 수 계산 (확장 버전)"""
 def count_selected_checks(selected_checks, vulnerability_categories):
     total_checks = 0
@@ -28,9 +62,9 @@ def count_selected_checks(selected_checks, vulnerability_categories):
     
     return total_checks
 
-""" Ansible PLAY RECAP 로그를 파싱하여 결과 통계를 반환 """
-def parse_play_recap(log_lines):
-    result_summary = {
+""" 빈 결과 통계 (parse_play_recap / build_result_summary / PlayRecapAggregator 공통 형식) """
+def _new_result_summary():
+    return {
         "성공한 태스크": 0,
         "변경된 설정": 0,
         "실패한 태스크": 0,
@@ -39,6 +73,32 @@ def parse_play_recap(log_lines):
         "건너뛴 태스크": 0,
         "서버 상세": {}
     }
+
+""" 서버 하나의 RECAP 통계를 결과 통계에 저장하고 전체 합계에 누적 """
+def _add_server_stats(result_summary, server_name, stats):
+    result_summary["서버 상세"][server_name] = stats
+    for summary_key, stat_key in RESULT_SUMMARY_KEYS.items():
+        result_summary[summary_key] += stats[stat_key]
+
+""" PLAY RECAP 이후의 라인 하나를 파싱해 결과 통계에 반영 (통계 라인이 아니면 무시) """
+def _add_recap_line(result_summary, line):
+    if ":" not in line:
+        return
+    # 타임스탬프 제거 ([14:19:07] 부분)
+    clean_line = RECAP_TIMESTAMP_PATTERN.sub('', line.strip())
+    if ":" not in clean_line or not any(marker in clean_line for marker in RECAP_STAT_MARKERS):
+        return
+
+    # 서버명과 결과 분리 후 통계 키=값을 한 번에 추출 (같은 키가 여러 번 나오면 첫 값)
+    server_name, stats_part = clean_line.split(":", 1)
+    found = {}
+    for match in RECAP_STAT_PATTERN.finditer(stats_part):
+        found.setdefault(match.group(1), int(match.group(2)))
+    _add_server_stats(result_summary, server_name.strip(), {key: found.get(key, 0) for key in RECAP_STAT_KEYS})
+
+""" Ansible PLAY RECAP 로그를 파싱하여 결과 통계를 반환 """
+def parse_play_recap(log_lines):
+    result_summary = _new_result_summary()
     
     # PLAY RECAP 섹션 찾기
     recap_started = False
@@ -50,45 +110,125 @@ def parse_play_recap(log_lines):
             continue
             
         # PLAY RECAP 이후의 서버별 결과 파싱
-        if recap_started and ":" in line:
-            # 타임스탬프 제거 ([14:19:07] 부분)
-            clean_line = re.sub(r'^\[.*?\]\s*', '', line.strip())
-            
-            # 서버명과 결과 분리
-            if ":" in clean_line and any(stat in clean_line for stat in ["ok=", "changed=", "failed=", "unreachable="]):
-                parts = clean_line.split(":", 1)
-                if len(parts) == 2:
-                    server_name = parts[0].strip()
-                    stats_part = parts[1].strip()
-                    
-                    # 각 통계 추출
-                    stats = {}
-                    patterns = {
-                        'ok': r'ok=(\d+)',
-                        'changed': r'changed=(\d+)', 
-                        'unreachable': r'unreachable=(\d+)',
-                        'failed': r'failed=(\d+)',
-                        'skipped': r'skipped=(\d+)',
-                        'rescued': r'rescued=(\d+)',
-                        'ignored': r'ignored=(\d+)'
-                    }
-                    
-                    for stat_name, pattern in patterns.items():
-                        match = re.search(pattern, stats_part)
-                        if match:
-                            stats[stat_name] = int(match.group(1))
-                        else:
-                            stats[stat_name] = 0
-                    
-                    # 서버별 상세 정보 저장
-                    result_summary["서버 상세"][server_name] = stats
-                    
-                    # 전체 통계에 합산
-                    result_summary["성공한 태스크"] += stats.get('ok', 0)
-                    result_summary["변경된 설정"] += stats.get('changed', 0)
-                    result_summary["실패한 태스크"] += stats.get('failed', 0)
-                    result_summary["무시된 태스크"] += stats.get('ignored', 0)    # 🆕 추가
-                    result_summary["접근 불가 서버"] += stats.get('unreachable', 0)
-                    result_summary["건너뛴 태스크"] += stats.get('skipped', 0)
+        if recap_started:
+            _add_recap_line(result_summary, line)
     
     return result_summary
+
+""" 호스트별 PLAY RECAP 통계(구조화 이벤트)로 parse_play_recap 과 같은 형식의 결과 통계를 생성 """
+def build_result_summary(host_stats):
+    result_summary = _new_result_summary()
+    
+    for server_name, host_stat in host_stats.items():
+        _add_server_stats(result_summary, server_name, {key: int(host_stat.get(key, 0)) for key in RECAP_STAT_KEYS})
+    
+    return result_summary
+
+class PlayRecapAggregator:
+    """실행 출력 라인/구조화 이벤트를 받는 대로 누적하는 호스트별 통계 집계기
+
+    실행 중에는 태스크 결과(ansible-runner host_result 이벤트, 없으면 ansible 기본 출력의 결과 라인)마다
+    ansible 통계와 같은 규칙(changed/무시된 실패·접근 불가도 ok 에 포함)으로 live_counts / live_hosts 를 갱신하고,
+    PLAY RECAP 라인은 들어오는 즉시 한 번만 파싱합니다. summary() 는 마지막 PLAY RECAP 블록을
+    parse_play_recap 으로 파싱한 결과와 같습니다.
+    (ansible.cfg 의 display_skipped_hosts = False 이면 건너뛴 태스크는 출력되지 않아 라인 기반 skipped 는 0 입니다.)
+    """
+
+    def __init__(self):
+        self.live_counts = {key: 0 for key in LIVE_STAT_KEYS}
+        self.live_hosts = {}          # 호스트 → LIVE_STAT_KEYS 카운트 + 처리한 태스크 수(tasks)
+        self._structured = False      # host_result 이벤트를 받은 뒤로는 라인 기반 집계 중단
+        self._last_failures = {}      # 샤드 접두사 → 다음 '...ignoring' 이 가리킬 실패/접근 불가 결과 (호스트 키, 상태, 항목 여부)
+        self._pending_items = {}      # (샤드 접두사, 호스트) → 현재 태스크의 루프 항목 결과 상태
+        self._recap_started = False
+        self._summary = _new_result_summary()
+
+    def feed_line(self, line):
+        """출력 라인 하나 반영 (새 PLAY RECAP 블록이 시작되면 이전 블록 요약은 버림)"""
+        if "PLAY RECAP" in line:
+            self._flush_items()
+            self._recap_started = True
+            self._summary = _new_result_summary()
+            return
+        if self._recap_started:
+            _add_recap_line(self._summary, line)
+        elif not self._structured:
+            self._count_result_line(line)
+
+    def feed_event(self, event):
+        """host_result 이벤트 하나 반영"""
+        if not self._structured:
+            # 이벤트마다 결과 라인이 바로 앞에 함께 오므로 라인으로 센 값은 버리고 이벤트로만 집계
+            self._structured = True
+            # (작업 상태가 같은 dict 를 참조하므로 새로 만들지 않고 제자리에서 초기화)
+            self.live_counts.update({key: 0 for key in LIVE_STAT_KEYS})
+            self.live_hosts.clear()
+            self._pending_items.clear()
+        self._record(event.get('host') or "", event['status'], event.get('ignored', False))
+
+    def summary(self):
+        return self._summary
+
+    def _flush_items(self, prefix=None):
+        # 태스크가 끝났는데 최종 결과 라인 없이 항목 라인만 있던 호스트는 태스크 결과 하나로 반영
+        for key in [key for key in self._pending_items if prefix is None or key[0] == prefix]:
+            self._record(key[1], self._pending_items.pop(key))
+
+    def _count_result_line(self, line):
+        boundary = TASK_BOUNDARY_PATTERN.match(line)
+        if boundary:
+            self._last_failures.pop(boundary.group(1) or '', None)
+            self._flush_items(boundary.group(1) or '')
+            return
+
+        ignoring = IGNORING_LINE_PATTERN.match(line)
+        if ignoring:
+            self._ignore_last_failure(ignoring.group(1) or '')
+            return
+
+        match = TASK_RESULT_LINE_PATTERN.match(line)
+        if not match:
+            return
+        prefix, result, host, item, rest = match.groups()
+        host = host.split(' -> ')[0].strip()
+        if result == 'fatal' and 'UNREACHABLE!' in rest:
+            status = 'unreachable'
+        else:
+            status = TASK_RESULT_STATUSES[result]
+
+        key = (prefix or '', host)
+        if status in IGNORABLE_STATUSES:
+            self._last_failures[key[0]] = (key, status, bool(item))
+        if item:
+            # 루프는 항목 라인만 나오고 최종 결과 라인이 없을 수 있으므로 태스크가 끝날 때 한 번에 반영
+            if status in ITEM_STATUS_PRIORITY:
+                previous = self._pending_items.get(key, status)
+                self._pending_items[key] = max(previous, status, key=ITEM_STATUS_PRIORITY.index)
+            return
+        self._pending_items.pop(key, None)
+        self._record(host, status)
+
+    def _ignore_last_failure(self, prefix):
+        # '...ignoring' 은 같은 샤드의 가장 최근 실패/접근 불가 결과를 무시된 결과(ok + ignored)로 바꿈
+        # (루프 항목 라인은 호스트끼리 섞여 나오므로 바로 앞 라인이 아니라 마지막 실패 결과 기준)
+        last_failure = self._last_failures.pop(prefix, None)
+        if last_failure is None:
+            return
+        key, status, item = last_failure
+        if item:
+            if self._pending_items.pop(key, None) is not None:
+                self._record(key[1], 'failed', ignored=True)
+            return
+        for stat_key in LIVE_STATUS_INCREMENTS[status]:
+            self.live_hosts[key[1]][stat_key] -= 1
+            self.live_counts[stat_key] -= 1
+        for stat_key in ('ok', 'ignored'):
+            self.live_hosts[key[1]][stat_key] += 1
+            self.live_counts[stat_key] += 1
+
+    def _record(self, host, status, ignored=False):
+        host_counts = self.live_hosts.setdefault(host, {**{key: 0 for key in LIVE_STAT_KEYS}, 'tasks': 0})
+        host_counts['tasks'] += 1
+        for key in (('ok', 'ignored') if status == 'failed' and ignored else LIVE_STATUS_INCREMENTS.get(status, ())):
+            host_counts[key] += 1
+            self.live_counts[key] += 1
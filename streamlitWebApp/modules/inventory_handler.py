@@ -263,3 +263,123 @@ def save_inventory_file(servers_info, selected_servers, result_folder_path):
     
     print(f"\n파일 저장 완료: {inventory_path}")
     return inventory_path
+
+"""생성된 inventory 파일에서 특정 그룹의 호스트와 접속 변수 로드 ([all:vars] 포함)"""
+def load_inventory_hosts(inventory_path, group='target_servers'):
+    hosts = {}
+    global_vars = {}
+    current_section = None
+    
+    with open(inventory_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#') or line.startswith(';'):
+                continue
+            
+            if line.startswith('[') and line.endswith(']'):
+                current_section = line[1:-1]
+                continue
+            
+            if current_section == 'all:vars':
+                if '=' in line:
+                    key, value = line.split('=', 1)
+                    global_vars[key.strip()] = value.strip()
+            elif current_section == group:
+                parts = line.split()
+                host_vars = {}
+                for part in parts[1:]:
+                    if '=' in part:
+                        key, value = part.split('=', 1)
+                        host_vars[key.strip()] = value.strip()
+                hosts[parts[0]] = host_vars
+    
+    # 전역 변수 적용 (개별 설정 우선)
+    for host_vars in hosts.values():
+        for key, value in global_vars.items():
+            host_vars.setdefault(key, value)
+    
+    return hosts
+
+"""inventory 파일의 호스트 섹션을 keep_hosts 에 포함된 호스트로만 제한하여 새 파일로 저장 (vars / children 섹션은 그대로)"""
+def filter_inventory_file(inventory_path, keep_hosts, output_path):
+    keep_hosts = set(keep_hosts)
+    
+    with open(inventory_path, 'r', encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    
+    filtered_lines = []
+    current_section = None
+    
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith('[') and stripped.endswith(']'):
+            current_section = stripped[1:-1]
+            filtered_lines.append(line)
+            continue
+        
+        is_host_section = current_section and ':' not in current_section
+        if is_host_section and stripped and not stripped.startswith('#'):
+            if stripped.split()[0] not in keep_hosts:
+                continue
+        filtered_lines.append(line)
+    
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(filtered_lines))
+    
+    return output_path
+
+"""생성된 inventory 파일을 target_servers 호스트 기준으로 N개의 샤드 inventory 파일로 분할"""
+def split_inventory_file(inventory_path, shard_count, group='target_servers'):
+    hosts = list(load_inventory_hosts(inventory_path, group).keys())
+    shard_count = max(1, min(shard_count, len(hosts)))
+    
+    if shard_count <= 1:
+        return [inventory_path]
+    
+    # 호스트를 순서대로 라운드 로빈 분배
+    shard_hosts = [set(hosts[index::shard_count]) for index in range(shard_count)]
+    
+    base_path, extension = os.path.splitext(inventory_path)
+    shard_paths = []
+    
+    for index, assigned_hosts in enumerate(shard_hosts, 1):
+        # 호스트 섹션에서는 이 샤드에 배정된 호스트만 유지
+        shard_path = filter_inventory_file(inventory_path, assigned_hosts, f"{base_path}_shard{index}{extension}")
+        shard_paths.append(shard_path)
+        print(f"🧱 샤드 {index}/{shard_count} inventory 생성: {shard_path} ({len(assigned_hosts)}개 호스트)")
+    
+    return shard_paths
+
+"""점검 세트가 같은 서버 그룹을 나누지 않고 N개의 샤드 inventory 파일로 분할
+
+그룹별 작업량(서버 수 × 점검 수)이 큰 순서로 가장 한가한 샤드에 배정하여 샤드별 작업량을 고르게 맞춥니다.
+host_groups: [{'hosts': [...], 'checks': [...]}] (inventory 에 없는 서버는 제외)
+"""
+def split_inventory_by_host_groups(inventory_path, host_groups, shard_count, group='target_servers'):
+    inventory_hosts = set(load_inventory_hosts(inventory_path, group).keys())
+    groups = [
+        (sorted(inventory_hosts.intersection(host_group['hosts'])), len(host_group['checks']))
+        for host_group in host_groups
+    ]
+    groups = [(hosts, check_count) for hosts, check_count in groups if hosts]
+    shard_count = max(1, min(shard_count, len(groups)))
+    
+    if shard_count <= 1:
+        return [inventory_path]
+    
+    shard_hosts = [set() for _ in range(shard_count)]
+    shard_loads = [0] * shard_count
+    for hosts, check_count in sorted(groups, key=lambda item: len(item[0]) * item[1], reverse=True):
+        index = shard_loads.index(min(shard_loads))
+        shard_hosts[index].update(hosts)
+        shard_loads[index] += len(hosts) * check_count
+    
+    base_path, extension = os.path.splitext(inventory_path)
+    shard_paths = []
+    
+    for index, assigned_hosts in enumerate(shard_hosts, 1):
+        shard_path = filter_inventory_file(inventory_path, assigned_hosts, f"{base_path}_shard{index}{extension}")
+        shard_paths.append(shard_path)
+        print(f"🧱 샤드 {index}/{shard_count} inventory 생성: {shard_path} ({len(assigned_hosts)}개 호스트, 작업량 {shard_loads[index - 1]})")
+    
+    return shard_paths
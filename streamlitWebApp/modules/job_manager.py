@@ -0,0 +1,294 @@
+"""
+백그라운드 점검 작업 관리 관련 함수들 (작업 ID, 상태 저장, 동시 실행 제한, 실행 로그 재접속)
+
+스트림릿 서버 프로세스 안에서 하나의 JobManager 가 모든 세션에 공유됩니다.
+작업은 스크립트 실행(rerun)이나 브라우저 연결과 무관하게 백그라운드 스레드에서 실행되며,
+어느 세션에서든 작업 ID 로 진행 상황과 실시간 로그에 다시 접속할 수 있습니다.
+"""
+import os
+import json
+import uuid
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+
+from modules.playbook_manager import execute_ansible_playbook
+from modules.input_utils import LIVE_STAT_KEYS, PlayRecapAggregator, build_result_summary
+from modules.run_catalog import get_run_catalog
+from modules.result_store import compact_run_results
+from modules.report_summary import build_run_summary
+from modules.task_profile import compact_task_profile
+from modules.trend_store import ingest_run
+
+JOBS_DIR = "jobs"                 # 작업 상태 파일 저장 위치 (jobs/<job_id>.json)
+MAX_CONCURRENT_JOBS = 2           # 동시에 실행할 최대 점검 작업 수 (나머지는 대기열)
+JOB_OUTPUT_LINES = 1000           # 작업별로 메모리에 유지할 최근 출력 라인 수 (재접속 시 제공)
+ACTIVE_STATUSES = ('queued', 'running')
+
+_manager = None
+_manager_lock = threading.Lock()
+
+class JobManager:
+    """점검 작업 대기열 / 실행 / 상태 저장 관리"""
+
+    def __init__(self, jobs_dir=JOBS_DIR, max_concurrent=MAX_CONCURRENT_JOBS):
+        self.jobs_dir = jobs_dir
+        self.max_concurrent = max_concurrent
+        self._lock = threading.RLock()
+        self._jobs = {}        # job_id → 작업 상태 (파일로 저장되는 내용)
+        self._outputs = {}     # job_id → deque[(순번, 라인)] (메모리 전용)
+        self._pending = deque()
+        self._running = set()
+
+        os.makedirs(jobs_dir, exist_ok=True)
+        self._load_jobs()
+
+    def _job_path(self, job_id):
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+
+    def _save_job(self, job):
+        # 임시 파일에 쓴 뒤 교체하여 다른 세션이 반쯤 쓰인 상태 파일을 읽지 않도록 함
+        job_path = self._job_path(job['job_id'])
+        temp_path = job_path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(job, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, job_path)
+        except Exception as e:
+            print(f"⚠️ 작업 상태 저장 실패 ({job['job_id']}): {str(e)}")
+
+    def _load_jobs(self):
+        """이전 서버 프로세스에서 저장된 작업 상태 복원"""
+        for file_name in sorted(os.listdir(self.jobs_dir)):
+            if not file_name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.jobs_dir, file_name), 'r', encoding='utf-8') as f:
+                    job = json.load(f)
+            except Exception as e:
+                print(f"⚠️ 작업 상태 파일 읽기 실패 ({file_name}): {str(e)}")
+                continue
+
+            if job.get('status') == 'running':
+                # 실행 중이던 프로세스는 서버 재시작과 함께 종료되었으므로 중단 처리
+                job['status'] = 'interrupted'
+                job['error'] = "서버 재시작으로 실행이 중단되었습니다."
+                job['finished_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                self._save_job(job)
+            elif job.get('status') == 'queued':
+                self._pending.append(job['job_id'])
+
+            self._jobs[job['job_id']] = job
+            self._outputs[job['job_id']] = deque(maxlen=JOB_OUTPUT_LINES)
+
+        if self._pending:
+            print(f"🔁 대기 중이던 점검 작업 {len(self._pending)}개를 다시 대기열에 추가합니다.")
+        self._dispatch()
+
+    def submit_job(self, owner, playbook_path, inventory_path, limit_hosts, result_folder_path, timestamp, options=None):
+        """점검 작업을 대기열에 추가하고 작업 ID 반환"""
+        job_id = f"job_{timestamp}_{uuid.uuid4().hex[:6]}"
+        job = {
+            'job_id': job_id,
+            'owner': owner,
+            'status': 'queued',
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'started_at': None,
+            'finished_at': None,
+            'playbook_path': playbook_path,
+            'inventory_path': inventory_path,
+            'limit_hosts': list(limit_hosts or []),
+            'result_folder_path': result_folder_path,
+            'timestamp': timestamp,
+            'options': options or {},
+            'return_code': None,
+            'error': None,
+            'total_lines': 0,
+            'current_task': "",
+            'live_counts': {key: 0 for key in LIVE_STAT_KEYS},
+            'live_hosts': {},
+            'result_summary': None
+        }
+
+        with self._lock:
+            self._jobs[job_id] = job
+            self._outputs[job_id] = deque(maxlen=JOB_OUTPUT_LINES)
+            self._pending.append(job_id)
+            self._save_job(job)
+            print(f"🆕 점검 작업 등록: {job_id} (대기 {len(self._pending)}개, 실행 {len(self._running)}개)")
+            self._dispatch()
+
+        return job_id
+
+    def cancel_job(self, job_id):
+        """대기 중인 작업 취소 (이미 실행 중인 작업은 취소하지 않음)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job['status'] != 'queued':
+                return False
+            self._pending.remove(job_id)
+            job['status'] = 'cancelled'
+            job['finished_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self._save_job(job)
+            return True
+
+    def get_job(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return json.loads(json.dumps(job)) if job else None
+
+    def list_jobs(self, limit=20):
+        """최근 등록 순 작업 목록"""
+        with self._lock:
+            jobs = sorted(self._jobs.values(), key=lambda job: job['created_at'], reverse=True)[:limit]
+            return [json.loads(json.dumps(job)) for job in jobs]
+
+    def queue_position(self, job_id):
+        with self._lock:
+            return list(self._pending).index(job_id) + 1 if job_id in self._pending else None
+
+    def read_output(self, job_id, after_seq=0):
+        """after_seq 이후의 출력 라인과 마지막 순번 반환 (메모리에 남은 최근 라인 범위 내)"""
+        with self._lock:
+            output = self._outputs.get(job_id)
+            if not output:
+                return [], after_seq
+            lines = [line for seq, line in output if seq > after_seq]
+            return lines, output[-1][0]
+
+    def _dispatch(self):
+        with self._lock:
+            while self._pending and len(self._running) < self.max_concurrent:
+                job_id = self._pending.popleft()
+                self._running.add(job_id)
+                threading.Thread(target=self._run_job, args=(job_id,), daemon=True).start()
+
+    def _append_output(self, job, line):
+        job['total_lines'] += 1
+        self._outputs[job['job_id']].append((job['total_lines'], line))
+
+    def _run_job(self, job_id):
+        with self._lock:
+            job = self._jobs[job_id]
+            job['status'] = 'running'
+            job['started_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self._save_job(job)
+
+        host_stats = None
+        final_status = 'error'   # 후처리(결과 압축/요약/색인)가 끝난 뒤에 작업 상태로 공개
+        # 실행 중 출력/이벤트를 받는 대로 호스트별 통계 누적 (작업 상태와 같은 dict 를 갱신)
+        aggregator = PlayRecapAggregator()
+        with self._lock:
+            job['live_counts'] = aggregator.live_counts
+            job['live_hosts'] = aggregator.live_hosts
+
+        try:
+            print(f"🔥 백그라운드 점검 작업 실행 시작: {job_id}")
+            output_queue, thread = execute_ansible_playbook(
+                job['playbook_path'],
+                job['inventory_path'],
+                job['limit_hosts'],
+                job['result_folder_path'],
+                job['timestamp'],
+                **job['options']
+            )
+
+            while True:
+                try:
+                    msg_type, content = output_queue.get(timeout=1)
+                except queue.Empty:
+                    if not thread.is_alive() and output_queue.empty():
+                        raise RuntimeError("실행 스레드가 종료 메시지 없이 끝났습니다.")
+                    continue
+
+                with self._lock:
+                    if msg_type == 'output':
+                        if content and content.strip():
+                            cleaned_content = content.strip()
+                            self._append_output(job, cleaned_content)
+                            aggregator.feed_line(cleaned_content)
+
+                    elif msg_type == 'event':
+                        if content['type'] == 'host_stats':
+                            host_stats = content['hosts']
+                        elif content['type'] == 'task_start':
+                            job['current_task'] = content.get('task') or ""
+                        elif content['type'] == 'host_result':
+                            aggregator.feed_event(content)
+
+                    elif msg_type == 'finished':
+                        job['return_code'] = content
+                        final_status = 'finished' if content == 0 else 'failed'
+                        break
+
+                    elif msg_type == 'error':
+                        job['error'] = content
+                        break
+
+            thread.join(timeout=5)
+
+        except Exception as e:
+            final_status = 'error'
+            with self._lock:
+                job['error'] = str(e)
+            print(f"❌ 백그라운드 점검 작업 오류 ({job_id}): {str(e)}")
+
+        finally:
+            # 작업 상태는 running 으로 둔 채 결과 압축/요약/색인을 먼저 끝냄
+            # (완료 직후 리포트를 연 세션이 작업 스레드와 동시에 같은 결과를 다시 압축하지 않도록)
+            with self._lock:
+                job['current_task'] = "결과 정리 중 (Parquet 압축 / 리포트 요약 / 카탈로그 색인)"
+            self._finalize_run(job)
+
+            with self._lock:
+                # 구조화 호스트 통계 (없으면 실행 중 누적한 PLAY RECAP 집계)로 결과 요약 저장
+                job['result_summary'] = build_result_summary(host_stats) if host_stats is not None else aggregator.summary()
+                job['status'] = final_status
+                job['finished_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                self._save_job(job)
+                self._running.discard(job_id)
+                print(f"✅ 백그라운드 점검 작업 종료: {job_id} ({job['status']})")
+                self._dispatch()
+
+    def _finalize_run(self, job):
+        """실행이 끝난 결과를 리포트/추이/카탈로그용으로 정리 (단계별 실패는 기록만 하고 계속)"""
+        job_id = job['job_id']
+
+        # 실행 결과 JSON 을 리포트용 Parquet 결과 저장소로 압축
+        try:
+            compact_run_results(job['result_folder_path'])
+        except Exception as e:
+            print(f"⚠️ 결과 Parquet 압축 실패 ({job_id}): {str(e)}")
+
+        # 콜백이 기록한 호스트별 태스크 시작/종료 시각을 Parquet 프로파일로 압축
+        try:
+            compact_task_profile(job['result_folder_path'])
+        except Exception as e:
+            print(f"⚠️ 태스크 프로파일 압축 실패 ({job_id}): {str(e)}")
+
+        # 리포트 대시보드 집계를 미리 계산해 요약 파일로 저장
+        try:
+            build_run_summary(job['result_folder_path'])
+        except Exception as e:
+            print(f"⚠️ 리포트 요약 생성 실패 ({job_id}): {str(e)}")
+
+        # 실행 간 추이 분석용 팩트 테이블에 이번 실행 추가
+        try:
+            ingest_run(job['timestamp'], job['result_folder_path'])
+        except Exception as e:
+            print(f"⚠️ 점검 추이 적재 실패 ({job_id}): {str(e)}")
+
+        # 실행이 끝난 기록을 카탈로그에 바로 반영 (사이드바/게스트 화면 조회용)
+        try:
+            get_run_catalog().index_run(job['timestamp'])
+        except Exception as e:
+            print(f"⚠️ 실행 기록 카탈로그 색인 실패 ({job_id}): {str(e)}")
+
+"""프로세스 전체에서 공유하는 작업 관리자 반환 (최초 호출 시 생성)"""
+def get_job_manager():
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+        return _manager
@@ -0,0 +1,273 @@
+"""
+실행 로그 색인 관련 함수들 (한 번의 스트리밍 파싱, mmap/gzip 지원, 프로세스 공유 캐시)
+
+리포트의 타임라인/실행 시간/오류 추출/로그 요약/로그 뷰어가 각자 로그 전체를 read() 하고
+split('\\n') 하지 않도록, 로그를 한 번만 청크 단위로 훑어 색인을 만듭니다.
+  - 라인별 시작 바이트 오프셋과 [HH:MM:SS] 타임스탬프(초)
+  - PLAY / TASK 경계 (라인 번호, 오프셋, 시간)
+  - PLAY RECAP 이전의 오류/실패 라인과 PLAY RECAP 블록
+일반 로그는 mmap 으로, .gz 압축 로그는 해제하며 스트리밍으로 읽습니다.
+"""
+import gzip
+import mmap
+import os
+import re
+from collections import deque
+
+import numpy as np
+
+from modules.log_writer import COMPRESSED_SUFFIX, resolve_log_path
+from modules.report_cache import get_cached_run_data
+
+LOG_INDEX_CHUNK_SIZE = 8 * 1024 * 1024    # 한 번에 처리할 바이트 수 (gzip 해제/mmap 슬라이스 단위)
+LOG_ERROR_LINE_LIMIT = 200                # 색인에 보관할 최근 오류/실패 라인 수
+LOG_KEYWORDS = ('error', 'warning', 'success')
+LOG_SEARCH_LIMIT = 1000                   # 검색 결과로 보관할 최대 라인 수 (전체 일치 수는 따로 셈)
+
+# [HH:MM:SS] (shard i/n) TASK [..] / PLAY [..] / PLAY RECAP
+EVENT_LINE_PATTERN = re.compile(
+    rb'^\[\d\d:\d\d:\d\d\] ((?:\(shard \d+/\d+\) )?(PLAY|TASK)\b[^\r\n]*)', re.MULTILINE
+)
+RECAP_LINE_PATTERN = re.compile(rb'^[^\n]*\bPLAY RECAP\b', re.MULTILINE)
+ERROR_KEYWORD_PATTERN = re.compile(rb'error|failed|fatal|unreachable')   # 소문자로 바꾼 버퍼에서 검색
+RECAP_STAT_KEYWORD_PATTERN = re.compile(rb'(?:ok|changed|failed|unreachable)=')
+RECAP_STAT_PATTERN = re.compile(rb'[^\n]*:[^\n]*(?:ok=|changed=|failed=|unreachable=)')   # 호스트별 통계 라인
+
+def _decode(line):
+    return line.decode('utf-8', errors='replace').rstrip('\r')
+
+"""로그 파일을 바이트 청크로 읽기 (일반 로그는 mmap 슬라이스, 압축 로그는 gzip 해제 스트림)"""
+def _iter_log_chunks(log_path, chunk_size=LOG_INDEX_CHUNK_SIZE):
+    if log_path.endswith(COMPRESSED_SUFFIX):
+        with gzip.open(log_path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        return
+
+    if os.path.getsize(log_path) == 0:
+        return
+    with open(log_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for start in range(0, len(mm), chunk_size):
+            yield mm[start:start + chunk_size]
+
+"""청크를 라인 경계에서 잘라 (버퍼 시작 오프셋, 완전한 라인들로 된 버퍼) 반환"""
+def _iter_log_buffers(log_path):
+    base_offset = 0
+    remainder = b''
+    for chunk in _iter_log_chunks(log_path):
+        buffer = remainder + chunk
+        cut = buffer.rfind(b'\n') + 1
+        if cut == 0:
+            remainder = buffer
+            continue
+        buffer, remainder = buffer[:cut], buffer[cut:]
+        yield base_offset, buffer
+        base_offset += len(buffer)
+    if remainder:
+        yield base_offset, remainder
+
+"""[HH:MM:SS] 로 시작하는 라인의 초 단위 시간 (없으면 -1), 라인 시작 위치 배열 기준으로 벡터 계산"""
+def _line_seconds(buffer, starts):
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    seconds = np.full(len(starts), -1, dtype=np.int32)
+    candidates = starts[starts + 10 <= len(data)]
+    if len(candidates) == 0:
+        return seconds
+
+    positions = candidates[:, None] + np.arange(10)
+    window = data[positions].astype(np.int32)
+    digits = window[:, [1, 2, 4, 5, 7, 8]] - ord('0')
+    valid = (
+        (window[:, 0] == ord('[')) & (window[:, 3] == ord(':')) & (window[:, 6] == ord(':')) &
+        (window[:, 9] == ord(']')) & ((digits >= 0) & (digits <= 9)).all(axis=1)
+    )
+    values = (digits[:, 0] * 10 + digits[:, 1]) * 3600 + (digits[:, 2] * 10 + digits[:, 3]) * 60 + \
+        digits[:, 4] * 10 + digits[:, 5]
+    seconds[:len(candidates)] = np.where(valid, values, -1)
+    return seconds
+
+def _concat(parts, dtype):
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+
+"""로그를 한 번 훑어 색인 생성 (events 는 line/offset/seconds 배열과 event/type 목록의 컬럼 형태)"""
+def build_log_index(log_path):
+    offsets_parts = []
+    seconds_parts = []
+    event_parts = []
+    error_lines = deque(maxlen=LOG_ERROR_LINE_LIMIT)
+    error_line_count = 0
+    recap_start_line = None
+    recap_lines = []
+    keyword_counts = {keyword: 0 for keyword in LOG_KEYWORDS}
+
+    line_number = 0       # buffer 첫 라인의 라인 번호 (0부터)
+    size = 0
+
+    # base_offset: buffer[0] 의 파일 내 오프셋 (압축 로그는 해제된 내용 기준)
+    def process(base_offset, buffer):
+        nonlocal error_line_count, recap_start_line
+        newlines = np.flatnonzero(np.frombuffer(buffer, dtype=np.uint8) == ord('\n'))
+        starts = np.concatenate(([0], newlines + 1)).astype(np.int64)
+        if len(starts) and starts[-1] >= len(buffer):
+            starts = starts[:-1]   # 마지막 개행 뒤의 빈 라인 제외
+        offsets_parts.append(starts + base_offset)
+        line_seconds = _line_seconds(buffer, starts)
+        seconds_parts.append(line_seconds)
+
+        def lines_of(positions):
+            # 매치 위치 → 버퍼 내 라인 인덱스 (한 번에 벡터 계산)
+            return np.searchsorted(starts, np.asarray(positions, dtype=np.int64), side='right') - 1
+
+        def line_bytes(index):
+            end = starts[index + 1] - 1 if index + 1 < len(starts) else len(buffer)
+            return buffer[starts[index]:end]
+
+        # 첫 PLAY RECAP 이전은 오류 라인 후보, 이후는 RECAP 블록 (호스트별 통계 라인)
+        error_end = len(buffer)
+        recap_from = 0
+        if recap_start_line is None:
+            recap_match = RECAP_LINE_PATTERN.search(buffer)
+            if recap_match:
+                recap_start_line = line_number + int(lines_of([recap_match.start()])[0])
+                recap_lines.append(_decode(recap_match.group(0)))
+                error_end = recap_match.start()
+                recap_from = buffer.find(b'\n', recap_match.end()) + 1 or len(buffer)
+        else:
+            error_end = 0
+
+        # PLAY/TASK 경계는 컬럼 배열로 (초는 라인 타임스탬프 배열에서 가져옴)
+        event_matches = list(EVENT_LINE_PATTERN.finditer(buffer))
+        event_lines = lines_of([match.start() for match in event_matches])
+        event_parts.append((
+            event_lines + line_number,
+            starts[event_lines] + base_offset,
+            line_seconds[event_lines],
+            [_decode(match.group(1)) for match in event_matches],
+            [match.group(2).decode('ascii') for match in event_matches]
+        ))
+
+        # 오류 키워드는 소문자 버퍼에서 찾아 라인 단위로 중복 제거 (보관은 최근 라인만 디코딩)
+        lowered = buffer.lower()
+        keyword_positions = [match.start() for match in ERROR_KEYWORD_PATTERN.finditer(lowered, 0, error_end)]
+        if keyword_positions:
+            error_indexes = np.unique(lines_of(keyword_positions))
+            error_line_count += len(error_indexes)
+            for index in error_indexes[-LOG_ERROR_LINE_LIMIT:]:
+                error_lines.append({'line': line_number + int(index), 'text': _decode(line_bytes(int(index))).strip()})
+
+        if recap_start_line is not None:
+            stat_positions = [match.start() for match in RECAP_STAT_KEYWORD_PATTERN.finditer(buffer, recap_from)]
+            for index in (np.unique(lines_of(stat_positions)) if stat_positions else []):
+                line = line_bytes(int(index))
+                if RECAP_STAT_PATTERN.match(line):
+                    recap_lines.append(_decode(line))
+
+        for keyword in LOG_KEYWORDS:
+            keyword_counts[keyword] += lowered.count(keyword.encode('ascii'))
+        return len(starts)
+
+    for base_offset, buffer in _iter_log_buffers(log_path):
+        line_number += process(base_offset, buffer)
+        size = base_offset + len(buffer)
+
+    line_offsets = _concat(offsets_parts, np.int64)
+    line_seconds = _concat(seconds_parts, np.int32)
+    events = {
+        'line': _concat([part[0] for part in event_parts], np.int64),
+        'offset': _concat([part[1] for part in event_parts], np.int64),
+        'seconds': _concat([part[2] for part in event_parts], np.int32),
+        'event': [text for part in event_parts for text in part[3]],
+        'type': [event_type for part in event_parts for event_type in part[4]]
+    }
+
+    # 첫/마지막 타임스탬프 기준 실행 시간 (종료가 시작보다 이르면 자정을 넘긴 것으로 보고 하루 더함)
+    timed = line_seconds[line_seconds >= 0]
+    duration_seconds = None
+    if len(timed):
+        duration_seconds = int(timed[-1] - timed[0])
+        if duration_seconds < 0:
+            duration_seconds += 24 * 3600
+
+    return {
+        'log_path': log_path,
+        'size': size,
+        'line_count': line_number,
+        'line_offsets': line_offsets,
+        'line_seconds': line_seconds,
+        'events': events,
+        'error_lines': list(error_lines),
+        'error_line_count': error_line_count,
+        'recap_start_line': recap_start_line,
+        'recap_lines': recap_lines,
+        'keyword_counts': keyword_counts,
+        'start_seconds': int(timed[0]) if len(timed) else None,
+        'end_seconds': int(timed[-1]) if len(timed) else None,
+        'duration_seconds': duration_seconds
+    }
+
+"""실행 로그 색인 반환 (로그가 바뀌지 않았으면 프로세스 공유 캐시에서, 로그가 없으면 None)"""
+def get_log_index(timestamp):
+    def load():
+        log_path = resolve_log_path(timestamp)
+        if not os.path.exists(log_path):
+            return None
+        return build_log_index(log_path)
+    return get_cached_run_data('log_index', timestamp, load)
+
+"""색인의 바이트 오프셋으로 [start, stop) 범위 라인만 읽기 (로그 전체를 읽지 않음)"""
+def read_log_lines(log_index, start, stop):
+    line_offsets = log_index['line_offsets']
+    start = max(0, start)
+    stop = min(log_index['line_count'], stop)
+    if start >= stop:
+        return []
+
+    begin = int(line_offsets[start])
+    end = int(line_offsets[stop]) if stop < len(line_offsets) else log_index['size']
+    log_path = log_index['log_path']
+    opener = gzip.open if log_path.endswith(COMPRESSED_SUFFIX) else open
+    with opener(log_path, 'rb') as f:
+        f.seek(begin)
+        data = f.read(end - begin)
+    return [_decode(line) for line in data.split(b'\n')[:stop - start]]
+
+"""로그를 청크 단위로 검색해 일치 라인 반환 (서버 측 grep, 로그 전체를 메모리에 올리지 않음)
+
+반환 형식: {'match_count': 전체 일치 라인 수, 'matches': [{'line': 라인 번호(0부터), 'text': ...}] (최대 limit 개)}
+정규식이 아니면 일반 문자열로 검색하고, case=False 면 대소문자를 무시합니다. (잘못된 정규식은 re.error)
+"""
+def search_log(log_index, term, regex=False, case=False, limit=LOG_SEARCH_LIMIT):
+    term_bytes = term.encode('utf-8')
+    pattern = re.compile(term_bytes if regex else re.escape(term_bytes), 0 if case else re.IGNORECASE)
+    line_offsets = log_index['line_offsets']
+    match_count = 0
+    matches = []
+
+    for base_offset, buffer in _iter_log_buffers(log_index['log_path']):
+        positions = [match.start() for match in pattern.finditer(buffer)]
+        if not positions:
+            continue
+        lines = np.unique(np.searchsorted(line_offsets, np.asarray(positions, dtype=np.int64) + base_offset, side='right') - 1)
+        match_count += len(lines)
+        for line in lines[:max(0, limit - len(matches))]:
+            begin = int(line_offsets[line]) - base_offset
+            end = int(line_offsets[line + 1]) - base_offset - 1 if line + 1 < len(line_offsets) else len(buffer)
+            matches.append({'line': int(line), 'text': _decode(buffer[begin:end])})
+
+    return {'match_count': match_count, 'matches': matches}
+
+"""로그의 TASK 목록 (같은 이름은 처음 나온 라인만, 샤드 접두사 제외) → [(태스크 이름, 라인 번호)]"""
+def list_log_tasks(log_index):
+    tasks = {}
+    events = log_index['events']
+    for event, event_type, line in zip(events['event'], events['type'], events['line']):
+        if event_type != 'TASK':
+            continue
+        name = event.split(') ', 1)[1] if event.startswith('(shard') else event
+        name = name.rstrip('* ').strip()
+        if name not in tasks:
+            tasks[name] = int(line)
+    return list(tasks.items())
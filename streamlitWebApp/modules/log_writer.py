@@ -0,0 +1,114 @@
+"""
+Ansible 실행 로그 저장/조회 관련 함수들 (스트리밍 기록, gzip 압축 로그 지원)
+"""
+import os
+import re
+import glob
+import gzip
+import shutil
+import threading
+import time
+from datetime import datetime
+
+LOG_DIR = "logs"
+LOG_FLUSH_LINES = 200          # 이 라인 수마다 디스크로 flush
+LOG_FLUSH_INTERVAL = 2.0       # 라인 수와 관계없이 최소 이 간격(초)마다 flush
+LOG_WRITE_BUFFER = 64 * 1024   # 파일 쓰기 버퍼 크기 (메모리 사용량 상한)
+COMPRESSED_SUFFIX = ".gz"
+
+"""타임스탬프에 해당하는 실행 로그 경로 반환 (압축 로그만 있으면 .gz 경로, 둘 다 없으면 기본 .log 경로)"""
+def resolve_log_path(timestamp, log_dir=LOG_DIR):
+    log_path = os.path.join(log_dir, f"ansible_execute_log_{timestamp}.log")
+    if not os.path.exists(log_path) and os.path.exists(log_path + COMPRESSED_SUFFIX):
+        return log_path + COMPRESSED_SUFFIX
+    return log_path
+
+"""실행 로그를 텍스트 모드로 열기 (.gz 압축 로그는 자동으로 해제하며 읽음)"""
+def open_log(log_path):
+    if log_path.endswith(COMPRESSED_SUFFIX):
+        return gzip.open(log_path, 'rt', encoding='utf-8')
+    return open(log_path, 'r', encoding='utf-8')
+
+"""logs 폴더의 실행 로그 목록 (압축 로그 포함, 같은 타임스탬프는 .log 우선)"""
+def list_execution_logs(log_dir=LOG_DIR):
+    log_files = {}
+    for log_file in glob.glob(os.path.join(log_dir, "ansible_execute_log_*.log*")):
+        timestamp_match = re.search(r'ansible_execute_log_(\d{8}_\d{6})\.log(\.gz)?$', os.path.basename(log_file))
+        if not timestamp_match:
+            continue
+        timestamp = timestamp_match.group(1)
+        if timestamp not in log_files or not log_file.endswith(COMPRESSED_SUFFIX):
+            log_files[timestamp] = log_file
+    return list(log_files.values())
+
+"""완료된 로그 파일을 gzip 으로 압축하고 원본 삭제 (압축 파일 경로 반환)"""
+def compress_log_file(log_path):
+    compressed_path = log_path + COMPRESSED_SUFFIX
+    temp_path = compressed_path + ".tmp"
+    with open(log_path, 'rb') as source, gzip.open(temp_path, 'wb') as target:
+        shutil.copyfileobj(source, target)
+    # 카탈로그가 로그 수정 시각을 실행 시각으로 쓰므로 압축본에도 원본 시각 유지 (보관 압축 시 순서 유지)
+    source_stat = os.stat(log_path)
+    os.utime(temp_path, (source_stat.st_atime, source_stat.st_mtime))
+    os.replace(temp_path, compressed_path)  # 압축 도중 중단되어도 반쯤 쓰인 .gz 가 남지 않도록
+    os.remove(log_path)
+    return compressed_path
+
+class StreamingLogWriter:
+    """실행 로그를 라인 단위로 파일에 바로 이어 쓰는 기록기
+
+    전체 로그를 메모리에 모으지 않고 쓰기 버퍼만 유지하며, 일정 라인 수/시간마다 flush 하여
+    실행 도중 프로세스가 종료되어도 그 시점까지의 로그가 남도록 합니다.
+    """
+
+    def __init__(self, log_path, flush_lines=LOG_FLUSH_LINES, flush_interval=LOG_FLUSH_INTERVAL):
+        self.log_path = log_path
+        self.flush_lines = flush_lines
+        self.flush_interval = flush_interval
+        self.line_count = 0
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._file = open(log_path, 'w', encoding='utf-8', buffering=LOG_WRITE_BUFFER)
+
+    def write(self, text):
+        """텍스트를 그대로 한 줄로 기록 (헤더/구분선 등)"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(text + '\n')
+            self.line_count += 1
+            self._pending += 1
+
+            now = time.monotonic()
+            if self._pending >= self.flush_lines or now - self._last_flush >= self.flush_interval:
+                self._flush_locked(now)
+
+    def write_line(self, text):
+        """[HH:MM:SS] 타임스탬프를 붙여 기록"""
+        self.write(f"[{datetime.now().strftime('%H:%M:%S')}] {text}")
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._flush_locked(time.monotonic())
+
+    def _flush_locked(self, now):
+        self._file.flush()
+        self._pending = 0
+        self._last_flush = now
+
+    def close(self, compress=False):
+        """파일을 닫고 최종 로그 경로 반환 (compress=True 면 gzip 압축본 경로)"""
+        with self._lock:
+            if self._file is None:
+                return self.log_path
+            self._file.close()
+            self._file = None
+
+        if compress:
+            try:
+                self.log_path = compress_log_file(self.log_path)
+            except Exception as e:
+                print(f"⚠️ 로그 압축 실패, 원본 로그를 유지합니다: {str(e)}")
+        return self.log_path
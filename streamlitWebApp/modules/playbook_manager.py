@@ -6,16 +6,255 @@ import yaml
 import subprocess
 import threading
 import queue
+import re
+import copy
+import json
 from datetime import datetime
 
+from modules.execution_scheduler import plan_execution, save_execution_plan, format_execution_plan
+from modules.inventory_handler import split_inventory_file, split_inventory_by_host_groups
+from modules.input_utils import RECAP_STAT_KEYS, parse_play_recap
+from modules.runner_events import convert_runner_event
+from modules.log_writer import StreamingLogWriter
+from modules.incremental_scan import CHECK_MAPPING_FILENAME, prepare_incremental_run, finalize_incremental_run
+from modules.result_collector import convert_report_tasks, build_result_collector_env
+from modules.task_profile import TASK_PROFILER_CALLBACK, build_task_profiler_env
+
+# 팩트 캐시 설정 (fact_gathering="once" 모드에서 사용)
+FACT_CACHE_DIR = "fact_cache"      # 호스트별 JSON 팩트 파일이 저장될 디렉터리
+FACT_CACHE_TIMEOUT = 86400         # 캐시 유효 시간 (초)
+
+"""실행 콜백 플러그인 환경 변수 (점검 결과 수집 + 태스크 실행 시간 프로파일, store_name 은 샤드별 파일 구분용)"""
+def build_callback_env(result_folder_path, store_name=None):
+    env = build_result_collector_env(result_folder_path, store_name)
+    env.update(build_task_profiler_env(result_folder_path, store_name))
+    enabled_callbacks = f"{env['ANSIBLE_CALLBACKS_ENABLED']},{TASK_PROFILER_CALLBACK}"
+    env['ANSIBLE_CALLBACKS_ENABLED'] = enabled_callbacks
+    env['ANSIBLE_CALLBACK_WHITELIST'] = enabled_callbacks   # ansible 2.10 이하 호환
+    return env
+
+"""팩트 수집 모드에 맞는 Ansible 환경 변수 반환"""
+def build_fact_cache_env(fact_gathering="per_check"):
+    # per_check: ansible.cfg 설정(memory 캐시) 그대로 사용
+    if fact_gathering != "once":
+        return {}
+    
+    # once: 디스크 캐시(jsonfile) + smart 수집 → 캐시가 유효하면 점검 플레이들은 setup을 건너뜀
+    os.makedirs(FACT_CACHE_DIR, exist_ok=True)
+    return {
+        'ANSIBLE_GATHERING': 'smart',
+        'ANSIBLE_CACHE_PLUGIN': 'jsonfile',
+        'ANSIBLE_CACHE_PLUGIN_CONNECTION': os.path.abspath(FACT_CACHE_DIR),
+        'ANSIBLE_CACHE_PLUGIN_TIMEOUT': str(FACT_CACHE_TIMEOUT)
+    }
+
+# 개별 KISA 점검 플레이북 위치 (flat 레이아웃에서 직접 읽어 병합)
+TASKS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tasks")
+
+# flat 레이아웃에서 점검 플레이 → block 으로 옮겨 담는 플레이 레벨 키워드
+BLOCK_LEVEL_KEYWORDS = ['become', 'ignore_errors', 'ignore_unreachable', 'any_errors_fatal']
+
+"""점검 태스크 파일별 결과 JSON 경로 (호스트별로 분리)"""
+def build_result_json_path(result_folder_path, task_file):
+    task_code = task_file.replace('.yml', '')
+    return f"{os.path.abspath(result_folder_path)}/results/{task_code}_{{{{ inventory_hostname }}}}.json"
+
+"""점검 플레이 안의 상대 경로 lookup('file', ...)을 tasks 폴더 기준 절대 경로로 변환"""
+def _absolutize_file_lookups(node):
+    if isinstance(node, dict):
+        return {key: _absolutize_file_lookups(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_absolutize_file_lookups(item) for item in node]
+    if isinstance(node, str) and "lookup(" in node:
+        return re.sub(
+            r"""lookup\((['"])file\1,\s*(['"])([^'"/][^'"]*)\2""",
+            lambda m: f"lookup({m.group(1)}file{m.group(1)}, {m.group(2)}{os.path.join(TASKS_DIR, m.group(3))}{m.group(2)}",
+            node
+        )
+    return node
+
+"""태스크 트리의 notify 대상을 점검별 네임스페이스 핸들러 이름으로 변경"""
+def _rename_notify(tasks, handler_names):
+    for task in tasks:
+        if not isinstance(task, dict):
+            continue
+        if 'notify' in task:
+            notify = task['notify']
+            if isinstance(notify, str):
+                task['notify'] = handler_names.get(notify, notify)
+            else:
+                task['notify'] = [handler_names.get(name, name) for name in notify]
+        for section in ('block', 'rescue', 'always'):
+            if isinstance(task.get(section), list):
+                _rename_notify(task[section], handler_names)
+
+"""점검 플레이북(tasks/*.yml) 하나를 flat 플레이용 block + 핸들러로 변환"""
+def build_check_block(task_file, result_folder_path, result_collection="callback"):
+    task_code = task_file.replace('.yml', '')
+    
+    with open(os.path.join(TASKS_DIR, task_file), 'r', encoding='utf-8') as f:
+        plays = yaml.safe_load(f) or []
+    
+    check_tasks = []
+    handlers = []
+    
+    for play in plays:
+        play = _absolutize_file_lookups(copy.deepcopy(play))
+        
+        # 플레이 vars → block vars (점검별 변수 스코프), 결과 경로도 점검별로 분리
+        block_vars = dict(play.get('vars') or {})
+        block_vars['result_json_path'] = build_result_json_path(result_folder_path, task_file)
+        
+        # 핸들러 이름/listen 을 점검 코드로 네임스페이스 처리 (서로 다른 점검의 동명 핸들러 충돌 방지)
+        handler_names = {}
+        for handler in play.get('handlers') or []:
+            for key in ('name', 'listen'):
+                if handler.get(key):
+                    handler_names[handler[key]] = f"{task_code} | {handler[key]}"
+        for handler in play.get('handlers') or []:
+            for key in ('name', 'listen'):
+                if handler.get(key):
+                    handler[key] = handler_names[handler[key]]
+            # 핸들러는 플레이 끝에서 실행되므로 점검 변수를 직접 붙여 둠
+            handler['vars'] = {**block_vars, **(handler.get('vars') or {})}
+            if result_collection == "callback":
+                handler = convert_report_tasks([handler], task_file)[0]
+            handlers.append(handler)
+        
+        tasks = play.get('tasks') or []
+        _rename_notify(tasks, handler_names)
+        # 결과 수집 모드: 결과 파일 저장/재조회 태스크를 보고서 팩트로 변환 (콜백 플러그인이 수집)
+        if result_collection == "callback":
+            tasks = convert_report_tasks(tasks, task_file)
+        
+        block = {
+            'name': f"[{task_code}] {play.get('name', task_code)}",
+            'vars': block_vars,
+            'block': tasks
+        }
+        for keyword in BLOCK_LEVEL_KEYWORDS:
+            if keyword in play:
+                block[keyword] = play[keyword]
+        check_tasks.append(block)
+        
+        # import 방식과 동일하게 점검이 끝날 때 해당 점검의 핸들러 실행
+        if play.get('handlers'):
+            check_tasks.append({
+                'name': f"[{task_code}] Flush handlers",
+                'meta': 'flush_handlers'
+            })
+    
+    return check_tasks, handlers
+
+"""import 레이아웃의 점검 플레이북 경로 (결과 수집 모드면 보고서 팩트로 변환한 사본을 결과 폴더에 저장해 사용)
+
+hosts/group_name 을 주면 점검 플레이의 대상을 서버 그룹 패턴으로 바꾼 사본을 checks/<group_name>/ 에 저장합니다.
+"""
+def build_check_import_path(task_file, result_folder_path, result_collection="callback", hosts=None, group_name=None):
+    if result_collection != "callback" and hosts is None:
+        return f"../../tasks/{task_file}"
+    
+    with open(os.path.join(TASKS_DIR, task_file), 'r', encoding='utf-8') as f:
+        plays = yaml.safe_load(f) or []
+    
+    converted_plays = []
+    for play in plays:
+        play = _absolutize_file_lookups(copy.deepcopy(play))
+        if hosts is not None:
+            play['hosts'] = hosts
+        if result_collection == "callback":
+            for section in ('tasks', 'handlers'):
+                if isinstance(play.get(section), list):
+                    play[section] = convert_report_tasks(play[section], task_file)
+        converted_plays.append(play)
+    
+    relative_dir = f"checks/{group_name}" if group_name else "checks"
+    checks_dir = os.path.join(result_folder_path, relative_dir)
+    os.makedirs(checks_dir, exist_ok=True)
+    with open(os.path.join(checks_dir, task_file), 'w', encoding='utf-8') as f:
+        yaml.dump(converted_plays, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+    
+    return f"{relative_dir}/{task_file}"
+
+"""증분 점검 모드: 이전 결과를 재사용하는 (호스트, 점검) 조합을 건너뛰는 조건 (incremental_skip 은 실행 시 extra vars 로 전달)"""
+def build_incremental_condition(task_file):
+    task_code = task_file.replace('.yml', '')
+    return f"'{task_code}' not in (incremental_skip | default({{}})).get(inventory_hostname, [])"
+
+"""기존 when 조건에 새 조건을 AND 로 추가"""
+def _combine_when(existing, condition):
+    if not existing:
+        return condition
+    return (existing if isinstance(existing, list) else [existing]) + [condition]
+
+"""선택된 점검들을 하나의 플레이로 병합 (flat 레이아웃)"""
+def build_flat_check_play(task_files, result_folder_path, hosts='target_servers',
+                          play_name='KISA Security Check - Flattened Checks', task_conditions=None,
+                          incremental=False, result_collection="callback"):
+    play_tasks = []
+    play_handlers = []
+    
+    for task_file in task_files:
+        try:
+            check_tasks, handlers = build_check_block(task_file, result_folder_path, result_collection)
+        except Exception as e:
+            print(f"   ❌ {task_file} 병합 실패: {str(e)}")
+            continue
+        
+        # 서버별 설정 모드: 점검 block 에 실행 대상 조건 부여
+        when_condition = (task_conditions or {}).get(task_file)
+        if incremental:
+            when_condition = _combine_when(when_condition, build_incremental_condition(task_file))
+        if when_condition:
+            for check_task in check_tasks:
+                if 'block' in check_task:
+                    check_task['when'] = when_condition
+        
+        play_tasks.extend(check_tasks)
+        play_handlers.extend(handlers)
+        print(f"   🧩 flat 병합: {task_file} ({len(handlers)}개 핸들러)")
+    
+    flat_play = {
+        'name': play_name,
+        'hosts': hosts,
+        'become': True,
+        'gather_facts': True,
+        'any_errors_fatal': False,
+        'ignore_unreachable': True,
+        'tasks': play_tasks
+    }
+    if play_handlers:
+        flat_play['handlers'] = play_handlers
+    
+    return flat_play
+
+"""동일한 점검 세트를 가진 서버끼리 묶어 (호스트 목록, 점검 파일 목록) 그룹 반환"""
+def group_hosts_by_checks(server_task_mapping):
+    groups = {}
+    for server_name, task_files in server_task_mapping.items():
+        if not task_files:
+            continue  # 점검 항목이 없는 서버는 어떤 플레이에도 포함하지 않음
+        groups.setdefault(frozenset(task_files), []).append(server_name)
+    
+    return sorted(
+        ((sorted(servers), sorted(task_files)) for task_files, servers in groups.items()),
+        key=lambda group: group[0]
+    )
+
 """생성된 플레이북을 파일로 저장 (서버별 개별 설정 완전 지원)"""
 def save_generated_playbook(active_servers, playbook_tasks, result_folder_path, 
                           analysis_mode="unified", server_specific_checks=None,
-                          vulnerability_categories=None, filename_mapping=None):
+                          vulnerability_categories=None, filename_mapping=None,
+                          fact_gathering="per_check", playbook_layout="import", partition_hosts=True,
+                          incremental=False, result_collection="callback"):
     
     # 🔧 디버깅 정보 출력
     print(f"\n🔧 save_generated_playbook 호출됨:")
     print(f"   analysis_mode: {analysis_mode}")
+    print(f"   fact_gathering: {fact_gathering}")
+    print(f"   playbook_layout: {playbook_layout}")
+    print(f"   incremental: {incremental}")
+    print(f"   result_collection: {result_collection}")
     print(f"   playbook_tasks 수: {len(playbook_tasks) if playbook_tasks else 0}")
     print(f"   server_specific_checks 존재: {server_specific_checks is not None}")
     print(f"   vulnerability_categories 존재: {vulnerability_categories is not None}")
@@ -28,6 +267,8 @@ def save_generated_playbook(active_servers, playbook_tasks, result_folder_path,
     
     # 메인 플레이북 구조 생성
     playbook_content = []
+    server_task_mapping = {}  # 서버별 태스크 매핑 (서버별 개별 설정 모드)
+    check_host_groups = []    # 서버 그룹별 플레이 (호스트 세트 분할 시)
     
     # 첫 번째 플레이: 초기 설정 (연결성 테스트)
     main_play = {
@@ -69,6 +310,19 @@ def save_generated_playbook(active_servers, playbook_tasks, result_folder_path,
             }
         ]
     }
+    
+    # 🆕 팩트 1회 수집 모드: 연결성 플레이에서만 수집하고 디스크 캐시에 저장
+    if fact_gathering == "once":
+        # 캐시된 팩트를 재사용하더라도 보고서 타임스탬프(ansible_date_time)는 매 실행마다 갱신
+        main_play['tasks'].insert(1, {
+            'name': 'Refresh date/time facts for this run',
+            'setup': {
+                'gather_subset': ['!all', '!min', 'date_time']
+            },
+            'ignore_errors': True
+        })
+        print(f"🗂️ 팩트 1회 수집 모드: 캐시 경로 {os.path.abspath(FACT_CACHE_DIR)} (TTL {FACT_CACHE_TIMEOUT}초)")
+    
     playbook_content.append(main_play)
     
     # 🔧 분석 모드에 따른 다른 플레이북 생성
@@ -78,7 +332,6 @@ def save_generated_playbook(active_servers, playbook_tasks, result_folder_path,
         
         # 🔧 모든 서버의 태스크를 수집하여 중복 제거된 전체 태스크 목록 생성
         all_server_tasks = set()
-        server_task_mapping = {}  # 서버별 태스크 매핑
         
         for server_name, server_checks in server_specific_checks.items():
             print(f"📍 서버 '{server_name}' 처리 중... 체크: {server_checks}")
@@ -117,52 +370,105 @@ def save_generated_playbook(active_servers, playbook_tasks, result_folder_path,
         
         print(f"🎯 전체 고유 태스크 수: {len(all_server_tasks)}")
         
-        # 🔧 중복 제거된 전체 태스크에 대해 조건부 import_playbook 생성
-        for task_file in sorted(all_server_tasks):
-            task_code = task_file.replace('.yml', '')
+        # 🆕 호스트 세트 분할: 점검 세트가 같은 서버끼리 묶고 hosts 패턴으로 대상 지정 (서버가 건너뛸 태스크를 거치지 않음)
+        #    flat 레이아웃은 그룹별 병합 플레이, import 레이아웃은 hosts 를 그룹 패턴으로 바꾼 그룹별 점검 사본을 import
+        #    (그룹 플레이는 순서대로 실행되므로 샤드 수가 2 이상이면 서버 그룹 단위로 샤드를 나눠 동시 실행)
+        if partition_hosts:
+            host_groups = group_hosts_by_checks(server_task_mapping)
             
-            # 이 태스크를 실행해야 하는 서버들 찾기
-            target_servers_for_task = [
-                server for server, tasks in server_task_mapping.items() 
-                if task_file in tasks
-            ]
+            # 점검 대상이 있는 서버만 연결성 테스트/팩트 수집
+            main_play['hosts'] = ':'.join(sorted(
+                server for server, tasks in server_task_mapping.items() if tasks
+            )) or 'target_servers'
             
-            if target_servers_for_task:
-                # when 조건 생성 (해당 서버들에서만 실행)
-                if len(target_servers_for_task) == 1:
-                    when_condition = f"inventory_hostname == '{target_servers_for_task[0]}'"
+            for group_index, (group_servers, group_tasks) in enumerate(host_groups, 1):
+                if playbook_layout == "flat":
+                    playbook_content.append(build_flat_check_play(
+                        group_tasks, result_folder_path,
+                        hosts=':'.join(group_servers),
+                        play_name=f"KISA Security Check - Host Group {group_index} ({len(group_servers)}개 서버, {len(group_tasks)}개 점검)",
+                        incremental=incremental, result_collection=result_collection
+                    ))
                 else:
-                    # 여러 서버의 경우 리스트로 처리
-                    server_list = str(target_servers_for_task).replace("'", '"')
-                    when_condition = f"inventory_hostname in {server_list}"
+                    for task_file in group_tasks:
+                        group_import = {
+                            'import_playbook': build_check_import_path(
+                                task_file, result_folder_path, result_collection,
+                                hosts=':'.join(group_servers), group_name=f"group{group_index}"
+                            ),
+                            'vars': {
+                                'result_json_path': build_result_json_path(result_folder_path, task_file)
+                            }
+                        }
+                        if incremental:
+                            group_import['when'] = build_incremental_condition(task_file)
+                        playbook_content.append(group_import)
+                print(f"   🎯 호스트 그룹 {group_index}: {group_servers} → {len(group_tasks)}개 태스크")
+            
+            # 실행 시 샤드 분할 기준으로 사용
+            check_host_groups = [{'hosts': group_servers, 'checks': group_tasks} for group_servers, group_tasks in host_groups]
+        else:
+            # 기존 방식: 중복 제거된 전체 태스크에 대해 조건부(when) import_playbook 생성
+            task_conditions = {}
+            for task_file in sorted(all_server_tasks):
+                # 이 태스크를 실행해야 하는 서버들 찾기
+                target_servers_for_task = [
+                    server for server, tasks in server_task_mapping.items() 
+                    if task_file in tasks
+                ]
+            
+                if target_servers_for_task:
+                    # when 조건 생성 (해당 서버들에서만 실행)
+                    if len(target_servers_for_task) == 1:
+                        when_condition = f"inventory_hostname == '{target_servers_for_task[0]}'"
+                    else:
+                        # 여러 서버의 경우 리스트로 처리
+                        server_list = str(target_servers_for_task).replace("'", '"')
+                        when_condition = f"inventory_hostname in {server_list}"
                 
-                # 조건부 import_playbook 추가
-                conditional_import = {
-                    'import_playbook': f"../../tasks/{task_file}",
-                    'when': when_condition,
-                    'vars': {
-                        'result_json_path': f"{os.path.abspath(result_folder_path)}/results/{task_code}_{{{{ inventory_hostname }}}}.json"
-                    }
-                }
-                playbook_content.append(conditional_import)
+                    if playbook_layout == "flat":
+                        # flat 레이아웃: 조건은 병합된 플레이의 block 에 부여
+                        task_conditions[task_file] = when_condition
+                    else:
+                        # 조건부 import_playbook 추가
+                        conditional_import = {
+                            'import_playbook': build_check_import_path(task_file, result_folder_path, result_collection),
+                            'when': _combine_when(when_condition, build_incremental_condition(task_file)) if incremental else when_condition,
+                            'vars': {
+                                'result_json_path': build_result_json_path(result_folder_path, task_file)
+                            }
+                        }
+                        playbook_content.append(conditional_import)
                 
-                print(f"   🎯 태스크 {task_file}: {target_servers_for_task}에서 실행")
+                    print(f"   🎯 태스크 {task_file}: {target_servers_for_task}에서 실행")
+        
+            if playbook_layout == "flat" and task_conditions:
+                playbook_content.append(build_flat_check_play(
+                    sorted(task_conditions), result_folder_path, task_conditions=task_conditions,
+                    incremental=incremental, result_collection=result_collection
+                ))
     
     elif analysis_mode == "unified" and playbook_tasks:
         print(f"🔄 통일 설정 모드로 플레이북 생성")
         
-        # 기존 방식: 모든 서버에 동일한 태스크 적용
-        for task_file in playbook_tasks:
-            task_code = task_file.replace('.yml', '')
-            
-            import_entry = {
-                'import_playbook': f"../../tasks/{task_file}",
-                'vars': {
-                    'result_json_path': f"{os.path.abspath(result_folder_path)}/results/{task_code}_{{{{ inventory_hostname }}}}.json"
+        if playbook_layout == "flat":
+            # flat 레이아웃: 선택된 점검 전체를 하나의 플레이로 병합
+            playbook_content.append(build_flat_check_play(
+                playbook_tasks, result_folder_path, incremental=incremental, result_collection=result_collection
+            ))
+        else:
+            # 기존 방식: 모든 서버에 동일한 태스크 적용
+            for task_file in playbook_tasks:
+                import_entry = {
+                    'import_playbook': build_check_import_path(task_file, result_folder_path, result_collection),
+                    'vars': {
+                        'result_json_path': build_result_json_path(result_folder_path, task_file)
+                    }
                 }
-            }
-            playbook_content.append(import_entry)
-            print(f"   📋 통일 태스크 추가: {task_file}")
+                if incremental:
+                    import_entry['when'] = build_incremental_condition(task_file)
+                playbook_content.append(import_entry)
+                print(f"   📋 통일 태스크 추가: {task_file}")
     
     else:
         print(f"❌ 조건이 맞지 않아 보안 태스크가 추가되지 않음!")
@@ -172,6 +478,15 @@ def save_generated_playbook(active_servers, playbook_tasks, result_folder_path,
         print(f"   vulnerability_categories 존재: {bool(vulnerability_categories)}")
         print(f"   filename_mapping 존재: {bool(filename_mapping)}")
     
+    # 🆕 호스트별 점검 목록 저장 (증분 점검 시 (호스트, 점검) 조합 판단, 서버 그룹 샤드 분할에 사용)
+    check_mapping = {
+        'default': list(playbook_tasks or []) if analysis_mode == "unified" else [],
+        'hosts': {server: sorted(tasks) for server, tasks in server_task_mapping.items()} if server_task_mapping else {},
+        'host_groups': check_host_groups
+    }
+    with open(os.path.join(result_folder_path, CHECK_MAPPING_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(check_mapping, f, ensure_ascii=False, indent=2)
+    
     # 파일명 생성
     folder_name = os.path.basename(result_folder_path)
     timestamp = folder_name.replace("playbook_result_", "")
@@ -194,12 +509,80 @@ def save_generated_playbook(active_servers, playbook_tasks, result_folder_path,
         # 🔧 추가 진단: import_playbook 개수 확인
         import_count = content.count('import_playbook:')
         print(f"\n🔍 import_playbook 항목 수: {import_count}")
+    print(f"🔍 플레이 수: {len(playbook_content)} (레이아웃: {playbook_layout}"
+          + (f", 서버 그룹 {len(check_host_groups)}개)" if check_host_groups else ")"))
     print(f"{'='*80}\n")
     
     return filepath, filename, timestamp
 
-"""백엔드에서 Ansible 플레이북 실행 (ansible.cfg 의존)"""
-def execute_ansible_playbook(playbook_path, inventory_path, limit_hosts, result_folder_path, timestamp):
+"""플레이북 생성 시 저장한 서버 그룹 목록 (호스트 세트 분할을 쓰지 않았으면 빈 리스트)"""
+def load_host_groups(result_folder_path):
+    mapping_path = os.path.join(result_folder_path, CHECK_MAPPING_FILENAME)
+    if not os.path.exists(mapping_path):
+        return []
+    try:
+        with open(mapping_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('host_groups') or []
+    except Exception as e:
+        print(f"⚠️ 서버 그룹 목록 읽기 실패, 일반 샤드 분할로 실행합니다: {str(e)}")
+        return []
+
+"""실행 inventory 를 샤드로 분할 (서버 그룹이 있으면 그룹을 나누지 않고 분할해 그룹 플레이들을 동시에 실행, 최대 shards 개)"""
+def split_run_inventory(inventory_path, shards, host_groups):
+    if shards <= 1:
+        return [inventory_path]
+    if len(host_groups) > 1:
+        return split_inventory_by_host_groups(inventory_path, host_groups, shards)
+    return split_inventory_file(inventory_path, shards)
+
+"""샤드별 호스트 통계를 호스트 기준으로 합산"""
+def merge_host_stats(shard_host_stats):
+    merged = {}
+    for host_stats in shard_host_stats:
+        for host, stats in host_stats.items():
+            merged_stats = merged.setdefault(host, {key: 0 for key in RECAP_STAT_KEYS})
+            for key in RECAP_STAT_KEYS:
+                merged_stats[key] += stats.get(key, 0)
+    return merged
+
+"""합산된 호스트 통계를 하나의 PLAY RECAP 블록 라인으로 변환"""
+def format_aggregated_recap(merged_host_stats, shard_count):
+    recap_lines = [f"PLAY RECAP ({shard_count}개 샤드 합산) {'*' * 50}"]
+    for host in sorted(merged_host_stats):
+        stats = merged_host_stats[host]
+        recap_lines.append(
+            f"{host:<26} : " + " ".join(f"{key}={stats[key]:<4}" for key in RECAP_STAT_KEYS).rstrip()
+        )
+    return recap_lines
+
+"""여러 샤드의 ansible-playbook 종료 코드를 하나의 종료 코드로 결합"""
+def combine_shard_return_codes(return_codes):
+    fatal_codes = [code for code in return_codes if code not in (0, 2, 4)]
+    
+    if fatal_codes and len(fatal_codes) == len(return_codes):
+        return fatal_codes[0]   # 모든 샤드 실패
+    if fatal_codes:
+        return 2                # 일부 샤드만 실패 → 나머지 샤드 결과는 유효 (부분 실패)
+    return max(return_codes) if return_codes else 0
+
+"""ansible-runner 모듈 로드 (설치되어 있지 않으면 None → ansible-playbook 서브프로세스로 실행)"""
+def load_ansible_runner():
+    try:
+        import ansible_runner
+        return ansible_runner
+    except ImportError:
+        print("⚠️ ansible-runner 를 불러올 수 없어 ansible-playbook 출력 파싱 방식으로 실행합니다.")
+        return None
+
+"""백엔드에서 Ansible 플레이북 실행 (ansible.cfg 의존)
+
+출력 큐 메시지:
+    ('output', 로그 라인), ('event', 구조화 이벤트 - modules.runner_events 참고),
+    ('finished', 종료 코드), ('error', 오류 메시지)
+"""
+def execute_ansible_playbook(playbook_path, inventory_path, limit_hosts, result_folder_path, timestamp,
+                             fact_gathering="per_check", scheduling="auto", shards=1, engine="runner",
+                             compress_log=False, incremental=False):
     # 로그 파일 경로 생성 (플레이북과 동일한 타임스탬프 사용)
     log_filename = f"ansible_execute_log_{timestamp}.log"
     log_path = os.path.join("logs", log_filename)
@@ -215,15 +598,50 @@ def execute_ansible_playbook(playbook_path, inventory_path, limit_hosts, result_
     else:
         print(f"✅ ansible.cfg 파일 발견: {ansible_cfg_path}")
     
+    # 🆕 실행 엔진: ansible-runner (구조화 이벤트) 또는 ansible-playbook 서브프로세스 (stdout 파싱)
+    ansible_runner = load_ansible_runner() if engine == "runner" else None
+    engine = "runner" if ansible_runner else "subprocess"
+    
+    # 🆕 forks / strategy 자동 스케줄링 (auto) 또는 ansible.cfg 설정 그대로 사용 (config)
+    execution_plan = None
+    if scheduling == "auto":
+        try:
+            execution_plan = plan_execution(inventory_path, playbook_path)
+            save_execution_plan(execution_plan, result_folder_path, timestamp)
+        except Exception as e:
+            print(f"⚠️ 실행 스케줄링 실패, ansible.cfg 설정으로 실행합니다: {str(e)}")
+    
+    # 🆕 샤드 분할: inventory 를 N개로 나눠 N개의 ansible-playbook 프로세스로 동시 실행
+    #    (서버 그룹별 플레이가 있으면 그룹 단위로 분할, 증분 점검은 재실행할 호스트가 정해진 뒤 실행 스레드에서 분할)
+    host_groups = load_host_groups(result_folder_path)
+    shard_inventories = split_run_inventory(inventory_path, shards, host_groups) if not incremental else [inventory_path]
+    shard_count = len(shard_inventories)
+    
+    # 샤드 실행 시 컨트롤 노드 전체 forks 를 샤드끼리 나눠 사용
+    shard_forks = max(1, execution_plan['forks'] // shard_count) if execution_plan else None
+    
+    # 🆕 증분 점검: 건너뛸 (호스트, 점검) 목록 extra vars
+    extra_vars = None
+    extra_vars_path = None
+    
     # 실행 명령어 구성 (표준 옵션만 사용)
-    cmd = [
-        'ansible-playbook',
-        '-i', inventory_path,
-        playbook_path,
-        '--limit', 'target_servers',
-        '--forks', '5',  # 안정적인 병렬 실행 수
-        '-v'  # 기본 로그 레벨
-    ]
+    def build_command(target_inventory):
+        command = [
+            'ansible-playbook',
+            '-i', target_inventory,
+            playbook_path,
+            '--limit', 'target_servers'
+        ]
+        if shard_forks:
+            command.extend(['--forks', str(shard_forks)])
+        if extra_vars_path:
+            command.extend(['-e', f"@{os.path.abspath(extra_vars_path)}"])
+        command.append('-v')  # 기본 로그 레벨
+        return command
+    
+    cmd = build_command(inventory_path)
+    
+    schedule_summary = format_execution_plan(execution_plan) if execution_plan else "ansible.cfg 설정 (forks/strategy)"
     
     # 백엔드 콘솔에 명령어 출력
     print(f"\n{'='*80}")
@@ -236,13 +654,132 @@ def execute_ansible_playbook(playbook_path, inventory_path, limit_hosts, result_
     print(f"⚙️ 설정: ansible.cfg의 any_errors_fatal=False 전역 설정 적용")
     print(f"📄 로그 파일: {log_path} (타임스탬프: {timestamp})")
     print(f"📁 결과 저장 폴더: {result_folder_path}/results")
+    print(f"🗂️ 팩트 수집 모드: {fact_gathering}")
+    print(f"🧮 스케줄링: {schedule_summary}")
+    print(f"🧱 샤드 수: {shard_count}" + (f" (서버 그룹 {len(host_groups)}개 단위 분할)" if len(host_groups) > 1 and shard_count > 1 else ""))
+    print(f"🔁 증분 점검: {incremental}")
+    print(f"🛰️ 실행 엔진: {engine}")
     print(f"{'='*80}\n")
     
     # 실행 결과를 담을 큐
     output_queue = queue.Queue()
     
+    # 🆕 로그는 전체를 메모리에 모으지 않고 실행 중 바로 파일에 이어 씀
+    log_writer = StreamingLogWriter(log_path)
+    log_lock = threading.Lock()
+    
+    def emit(line_text):
+        with log_lock:
+            # 백엔드 콘솔 / 로그 파일 / 스트림릿 큐에 동시에 전달
+            print(f"[ANSIBLE] {line_text}")
+            log_writer.write_line(line_text)
+            output_queue.put(('output', line_text))
+    
+    def emit_event(typed_event):
+        output_queue.put(('event', typed_event))
+    
+    def stream_process(target_inventory, env_overrides, on_line, on_event, ident):
+        # ansible-runner: 이벤트별 stdout 은 로그 라인으로, 이벤트 자체는 구조화 이벤트로 전달
+        if ansible_runner:
+            def handle_event(event):
+                for line in (event.get('stdout') or '').splitlines():
+                    on_line(line.strip())
+                typed_event = convert_runner_event(event)
+                if typed_event:
+                    on_event(typed_event)
+                return False  # job_events 아티팩트는 디스크에 남기지 않음
+            
+            runner_thread, runner = ansible_runner.run_async(
+                private_data_dir=os.path.abspath(os.path.join(result_folder_path, "runner")),
+                ident=ident,
+                project_dir=os.getcwd(),  # ansible.cfg 탐색 기준 디렉터리 유지
+                playbook=os.path.abspath(playbook_path),
+                inventory=os.path.abspath(target_inventory),
+                limit='target_servers',
+                forks=shard_forks,
+                extravars=extra_vars,
+                verbosity=1,
+                envvars={**env_overrides, 'ANSIBLE_NOCOLOR': 'True'},
+                event_handler=handle_event,
+                suppress_output_file=True,
+                quiet=True
+            )
+            runner_thread.join()
+            return runner.rc if runner.rc is not None else -1
+        
+        # 서브프로세스: stdout 라인만 전달 (구조화 이벤트 없음)
+        process = subprocess.Popen(
+            build_command(target_inventory),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+            bufsize=1,
+            cwd=os.getcwd(),
+            env={**os.environ, **env_overrides}
+        )
+        for line in process.stdout:
+            on_line(line.strip())
+        return process.wait()
+    
+    def run_shards(env_overrides):
+        return_codes = [None] * shard_count
+        shard_recaps = [[] for _ in range(shard_count)]
+        shard_stats = [None] * shard_count
+        
+        def run_shard(index):
+            label = f"(shard {index + 1}/{shard_count})"
+            in_recap = False
+            
+            def on_line(line_stripped):
+                nonlocal in_recap
+                # 샤드별 PLAY RECAP 은 합산용으로 따로 모으고, 최종 합산 RECAP 과 구분되도록 이름 변경
+                if "PLAY RECAP" in line_stripped:
+                    in_recap = True
+                    shard_recaps[index].append(line_stripped)
+                    line_stripped = line_stripped.replace("PLAY RECAP", f"SHARD {index + 1}/{shard_count} RECAP")
+                elif in_recap and line_stripped:
+                    shard_recaps[index].append(line_stripped)
+                
+                emit(f"{label} {line_stripped}" if line_stripped else line_stripped)
+            
+            def on_event(typed_event):
+                # 샤드별 호스트 통계는 합산 후 한 번만 전달
+                if typed_event['type'] == 'host_stats':
+                    shard_stats[index] = typed_event['hosts']
+                else:
+                    emit_event({**typed_event, 'shard': index + 1})
+            
+            try:
+                # 샤드 프로세스마다 별도 결과 저장소/프로파일에 기록 (동시 쓰기 충돌 방지)
+                shard_env = {**env_overrides, **build_callback_env(result_folder_path, f"shard{index + 1}")}
+                return_codes[index] = stream_process(shard_inventories[index], shard_env, on_line, on_event,
+                                                     ident=f"{timestamp}_shard{index + 1}")
+            except Exception as e:
+                # 한 샤드의 실패가 다른 샤드를 중단시키지 않음
+                emit(f"{label} ERROR: 샤드 실행 실패 - {str(e)}")
+                return_codes[index] = -1
+            
+            emit(f"{label} 샤드 종료 - 종료 코드: {return_codes[index]}")
+        
+        shard_threads = [threading.Thread(target=run_shard, args=(index,), daemon=True) for index in range(shard_count)]
+        for shard_thread in shard_threads:
+            shard_thread.start()
+        for shard_thread in shard_threads:
+            shard_thread.join()
+        
+        # 전체 샤드의 PLAY RECAP 합산 (구조화 통계가 없으면 샤드 RECAP 라인 파싱)
+        merged_host_stats = merge_host_stats([
+            stats if stats is not None else parse_play_recap(recap)["서버 상세"]
+            for stats, recap in zip(shard_stats, shard_recaps)
+        ])
+        for recap_line in format_aggregated_recap(merged_host_stats, shard_count):
+            emit(recap_line)
+        emit_event({'type': 'host_stats', 'hosts': merged_host_stats})
+        
+        return combine_shard_return_codes(return_codes)
+    
     def run_command():
-        log_lines = []  # 로그 파일에 저장할 내용
+        nonlocal shard_inventories, shard_count, shard_forks, extra_vars, extra_vars_path
         
         try:
             # 로그 파일 헤더 작성
@@ -255,71 +792,91 @@ def execute_ansible_playbook(playbook_path, inventory_path, limit_hosts, result_
                 f"대상 그룹: target_servers",
                 f"설정: ansible.cfg 전역 설정 (any_errors_fatal=False)",
                 f"결과 저장: {result_folder_path}/results",
+                f"팩트 수집 모드: {fact_gathering}",
+                f"스케줄링: {schedule_summary}",
+                f"샤드 수: {shard_count}" + (f" ({', '.join(shard_inventories)})" if shard_count > 1 else "")
+                + (f" - 서버 그룹 {len(host_groups)}개 단위 분할" if len(host_groups) > 1 and shard_count > 1 else ""),
+                f"실행 엔진: {engine}",
+                f"증분 점검: {incremental}",
                 f"{'='*50}",
                 ""
             ]
-            log_lines.extend(log_header)
+            for header_line in log_header:
+                log_writer.write(header_line)
             
             # 환경 변수 설정 (SSH 연결 최적화)
-            env = os.environ.copy()
-            env.update({
+            env_overrides = {
                 'ANSIBLE_HOST_KEY_CHECKING': 'False',
                 'ANSIBLE_SSH_RETRIES': '2',
                 'ANSIBLE_TIMEOUT': '30'
-            })
-            
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                bufsize=1,
-                cwd=os.getcwd(),
-                env=env
-            )
+            }
+            # 팩트 1회 수집 모드면 디스크 팩트 캐시 설정 추가
+            env_overrides.update(build_fact_cache_env(fact_gathering))
+            # 스케줄러가 선택한 전략 적용 (import 된 점검 플레이 포함 전체 플레이에 적용)
+            if execution_plan:
+                env_overrides['ANSIBLE_STRATEGY'] = execution_plan['strategy']
+            # 점검 보고서 팩트를 실행당 하나의 결과 저장소로 모으는 콜백과 태스크 실행 시간 프로파일 콜백 활성화
+            env_overrides.update(build_callback_env(result_folder_path))
             
-            # 실시간 출력 수집 및 백엔드 콘솔 출력
-            for line in process.stdout:
-                line_stripped = line.strip()
-                
-                # 백엔드 콘솔에 실시간 출력
-                print(f"[ANSIBLE] {line_stripped}")
+            # 🆕 증분 점검: 지문이 같은 (호스트, 점검) 결과는 재사용하고 나머지만 실행
+            incremental_plan = None
+            run_inventory = inventory_path
+            if incremental:
+                try:
+                    incremental_plan = prepare_incremental_run(
+                        inventory_path, result_folder_path, timestamp, TASKS_DIR,
+                        {**os.environ, **env_overrides}, emit
+                    )
+                    run_inventory = incremental_plan['inventory_path']
+                    extra_vars = incremental_plan['extra_vars']
+                    extra_vars_path = incremental_plan['extra_vars_path']
+                except Exception as e:
+                    emit(f"⚠️ 증분 점검 준비 실패, 전체 점검으로 진행합니다: {str(e)}")
                 
-                # 로그 파일용 라인 추가
-                log_lines.append(f"[{datetime.now().strftime('%H:%M:%S')}] {line_stripped}")
-                
-                # 스트림릿용 큐에도 추가
-                output_queue.put(('output', line_stripped))
+                shard_inventories = split_run_inventory(run_inventory, shards, host_groups)
+                shard_count = len(shard_inventories)
+                shard_forks = max(1, execution_plan['forks'] // shard_count) if execution_plan else None
+                if shard_count > 1:
+                    emit(f"🧱 샤드 분할: {shard_count}개 ({', '.join(shard_inventories)})")
+            
+            if incremental_plan and not incremental_plan['run_hosts']:
+                emit("🔁 증분 점검: 모든 (호스트, 점검) 조합의 입력이 이전 실행과 같아 결과를 재사용했습니다.")
+                return_code = 0
+            elif shard_count > 1:
+                return_code = run_shards(env_overrides)
+            else:
+                # 실시간 출력 수집 및 백엔드 콘솔 출력
+                return_code = stream_process(run_inventory, env_overrides, emit, emit_event, ident=timestamp)
             
-            # 프로세스 완료 대기
-            return_code = process.wait()
+            if incremental_plan:
+                finalize_incremental_run(incremental_plan, result_folder_path)
             
             # 완료 메시지를 로그에 추가
             completion_msg = f"실행 완료 - 종료 코드: {return_code} (ansible.cfg 설정, 타임스탬프: {timestamp})"
-            log_lines.append(f"\n{'='*50}")
-            log_lines.append(f"[{datetime.now().strftime('%H:%M:%S')}] {completion_msg}")
-            log_lines.append(f"실행 종료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            log_writer.write(f"\n{'='*50}")
+            log_writer.write_line(completion_msg)
+            log_writer.write(f"실행 종료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             
             # 종료 코드별 처리 (ansible.cfg 설정에 따라 대부분 성공으로 처리됨)
             if return_code == 0:
-                log_lines.append(f"✅ 플레이북 실행이 성공적으로 완료되었습니다.")
+                log_writer.write(f"✅ 플레이북 실행이 성공적으로 완료되었습니다.")
                 success = True
             elif return_code == 2:
-                log_lines.append(f"⚠️ 일부 태스크에서 실패가 있었지만 ansible.cfg 설정으로 계속 진행되었습니다.")
-                log_lines.append(f"📊 PLAY RECAP에서 개별 실패 내역을 확인하세요.")
+                log_writer.write(f"⚠️ 일부 태스크에서 실패가 있었지만 ansible.cfg 설정으로 계속 진행되었습니다.")
+                log_writer.write(f"📊 PLAY RECAP에서 개별 실패 내역을 확인하세요.")
                 success = True  # ansible.cfg 설정으로 성공으로 간주
             elif return_code == 4:
-                log_lines.append(f"🔌 일부 호스트에 접근할 수 없었지만 가능한 호스트에서는 실행되었습니다.")
+                log_writer.write(f"🔌 일부 호스트에 접근할 수 없었지만 가능한 호스트에서는 실행되었습니다.")
                 success = True  # 부분 성공으로 간주
             else:
-                log_lines.append(f"❌ 심각한 오류가 발생했습니다 (코드: {return_code}).")
+                log_writer.write(f"❌ 심각한 오류가 발생했습니다 (코드: {return_code}).")
                 success = False
             
-            # 로그 파일에 저장
+            # 로그 파일 마무리 (선택 시 gzip 압축)
+            final_log_path = log_path
             try:
-                with open(log_path, 'w', encoding='utf-8') as log_file:
-                    log_file.write('\n'.join(log_lines))
-                print(f"📄 로그 저장 완료: {log_path}")
+                final_log_path = log_writer.close(compress=compress_log)
+                print(f"📄 로그 저장 완료: {final_log_path}")
             except Exception as log_error:
                 print(f"❌ 로그 파일 저장 실패: {str(log_error)}")
             
@@ -330,7 +887,7 @@ def execute_ansible_playbook(playbook_path, inventory_path, limit_hosts, result_
                 print(f"📁 결과 파일들이 다음 위치에 저장되었습니다: {result_folder_path}/results/")
             else:
                 print(f"❌ ANSIBLE PLAYBOOK 실행 오류 (종료 코드: {return_code}, 타임스탬프: {timestamp})")
-            print(f"📄 로그: {log_path}")
+            print(f"📄 로그: {final_log_path}")
             print(f"⚙️ ansible.cfg 설정으로 개별 태스크 실패는 무시되었습니다.")
             print(f"{'='*80}\n")
             
@@ -340,13 +897,13 @@ def execute_ansible_playbook(playbook_path, inventory_path, limit_hosts, result_
             
         except Exception as e:
             error_msg = f"실행 오류: {str(e)}"
-            log_lines.append(f"\n[{datetime.now().strftime('%H:%M:%S')}] ERROR: {error_msg}")
             
-            # 에러 발생 시에도 로그 파일 저장
+            # 에러 발생 시에도 그때까지의 로그 파일 마무리
             try:
-                with open(log_path, 'w', encoding='utf-8') as log_file:
-                    log_file.write('\n'.join(log_lines))
-                print(f"📄 에러 로그 저장 완료: {log_path}")
+                log_writer.write("")
+                log_writer.write_line(f"ERROR: {error_msg}")
+                error_log_path = log_writer.close(compress=compress_log)
+                print(f"📄 에러 로그 저장 완료: {error_log_path}")
             except Exception as log_error:
                 print(f"❌ 에러 로그 파일 저장 실패: {str(log_error)}")
             
@@ -0,0 +1,75 @@
+"""
+분석 리포트 데이터 캐시 관련 함수들 (프로세스 공유, 파일 mtime 기반 무효화, LRU 제거)
+
+게스트 화면/여러 관리자 세션/사이드바 클릭이 같은 실행 리포트를 열 때마다 결과 파일과 로그를
+다시 읽고 파싱하지 않도록, 파싱된 실행 데이터와 파생 결과(DataFrame, 차트, 실행 시간 등)를
+(종류, 실행 타임스탬프, 관련 파일 mtime) 키로 프로세스 전체에서 공유합니다.
+파일이 바뀌면 mtime 이 달라져 자동으로 새로 읽고, 오래 안 쓴 항목부터 제거됩니다.
+"""
+import os
+import threading
+
+from cachetools import LRUCache
+
+from modules.log_writer import resolve_log_path
+from modules.result_store import get_result_store_path
+
+REPORT_CACHE_MAXSIZE = 128        # 캐시할 (종류, 실행) 항목 수 (실행당 결과/요약/로그/차트 10여 개)
+
+_cache = LRUCache(maxsize=REPORT_CACHE_MAXSIZE)
+_cache_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+def _get_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+"""실행 하나의 캐시 무효화 기준 (실행 로그, 결과 폴더, Parquet 저장소의 mtime)"""
+def get_run_signature(timestamp):
+    result_folder_path = os.path.join("playbooks", f"playbook_result_{timestamp}")
+    return (
+        _get_mtime(resolve_log_path(timestamp)),
+        _get_mtime(os.path.join(result_folder_path, "results")),
+        _get_mtime(get_result_store_path(result_folder_path))
+    )
+
+"""캐시에서 실행 데이터 조회, 없거나 파일이 바뀌었으면 loader() 로 만들어 저장 (kind: 'results', 'timeline' 등)"""
+def get_cached_run_data(kind, timestamp, loader):
+    signature = get_run_signature(timestamp)
+    key = (kind, timestamp)
+
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] == signature:
+            _stats['hits'] += 1
+            return entry[1]
+        _stats['misses'] += 1
+
+    # 파일 읽기/파싱은 잠금 밖에서 (다른 실행 조회를 막지 않도록)
+    value = loader()
+    with _cache_lock:
+        _cache[key] = (signature, value)
+    return value
+
+"""특정 실행(또는 전체)의 캐시 항목 제거"""
+def invalidate_run_cache(timestamp=None):
+    with _cache_lock:
+        if timestamp is None:
+            _cache.clear()
+            return
+        for key in [key for key in _cache.keys() if key[1] == timestamp]:
+            _cache.pop(key, None)
+
+"""캐시 적중/미스 통계"""
+def get_report_cache_stats():
+    with _cache_lock:
+        total = _stats['hits'] + _stats['misses']
+        return {
+            'hits': _stats['hits'],
+            'misses': _stats['misses'],
+            'hit_rate': (_stats['hits'] / total * 100) if total else 0.0,
+            'entries': len(_cache),
+            'maxsize': _cache.maxsize
+        }
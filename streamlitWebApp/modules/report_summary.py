@@ -0,0 +1,257 @@
+"""
+분석 리포트 요약 집계 관련 함수들 (실행 완료 시 한 번 계산해 report_summary.json 으로 저장)
+
+리포트 대시보드가 매 렌더마다 전체 결과 DataFrame 에서 실질적 상태/서버별 통계/히트맵/실패 분류를
+다시 계산하지 않도록, 실행이 끝나면 집계 결과만 작은 요약 파일(playbook_result_<ts>/report_summary.json)로
+저장합니다. 대시보드 차트와 지표는 요약 파일로 그리고, 개별 항목 목록(드릴다운)만 원본 결과를 사용합니다.
+"""
+import os
+import json
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from modules.result_store import (
+    RESULT_SCHEMA, build_result_record, read_result_json_files,
+    get_result_store_path, is_result_store_fresh, load_result_store
+)
+
+REPORT_SUMMARY_FILENAME = "report_summary.json"
+REPORT_SUMMARY_VERSION = 1        # 집계 규칙이 바뀌면 올려서 기존 요약 파일을 다시 계산
+
+# 리포트 화면과 같은 조치 결과 분류 키워드 (대소문자 무시)
+REMEDIATED_PATTERN = "조치 완료|완료|성공"
+FAILED_PATTERN = "실패|오류|ERROR|FAILED|무시|ignore|건너뛰|skip"
+IGNORED_PATTERN = "무시|ignore"
+MANUAL_PATTERN = "수동 조치 필요"
+NOT_NEEDED_PATTERN = "조치 불필요"
+AUTOMATED_PATTERN = "완료"
+REMEDIATED_DETAIL_TEXT = "조치 완료"   # 상세 상태의 '조치 후 양호' 판단 (대소문자 구분 부분 문자열)
+
+# 한 번의 분류로 결과 DataFrame 에 추가되는 상태 컬럼 (모든 탭/차트/요약이 재사용)
+STATUS_FLAG_PATTERNS = {
+    '조치_완료': REMEDIATED_PATTERN,
+    '조치_문제': FAILED_PATTERN,
+    '조치_무시': IGNORED_PATTERN,
+    '수동_조치_필요': MANUAL_PATTERN,
+    '조치_불필요': NOT_NEEDED_PATTERN,
+    '자동_조치': AUTOMATED_PATTERN
+}
+DETAIL_STATUSES = ['원래부터 양호', '조치 후 양호', '실질적 취약']
+FAILURE_TYPES = ['Failed (실패)', 'Ignored (무시됨)', 'Skipped (건너뜀)', 'Other (기타)']
+
+# 서버별 집계 컬럼 (호스트 단위 합계)
+SERVER_COUNT_COLUMNS = [
+    '총_점검', '실질적_양호', '실질적_취약', '원래_양호', '조치_후_양호',
+    '조치_시도_실패', '미조치_취약', '조치_완료', '수동_조치_필요', '조치_불필요'
+]
+
+"""요약 파일 경로"""
+def get_report_summary_path(result_folder_path):
+    return os.path.join(result_folder_path, REPORT_SUMMARY_FILENAME)
+
+"""조치 결과 실패 문구를 실패 유형으로 분류"""
+def categorize_failure_type(result):
+    result_lower = str(result).lower()
+    if any(word in result_lower for word in ['무시', 'ignore', 'ignored']):
+        return 'Ignored (무시됨)'
+    elif any(word in result_lower for word in ['건너뛰', 'skip', 'skipped']):
+        return 'Skipped (건너뜀)'
+    elif any(word in result_lower for word in ['실패', 'failed', 'error']):
+        return 'Failed (실패)'
+    else:
+        return 'Other (기타)'
+
+def _as_categorical(column):
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column
+    return column.astype(str).astype('category')
+
+"""문자열 컬럼의 정규식 일치 여부 (범주형이면 고유값마다 한 번만 검사한 뒤 코드로 행에 펼침)"""
+def match_result_pattern(column, pattern, case=False):
+    column = _as_categorical(column)
+    matched = column.cat.categories.astype(str).str.contains(pattern, case=case, regex=True)
+    # 코드 -1(결측)은 마지막에 덧붙인 False 로 매핑
+    matched = np.append(np.asarray(matched, dtype=bool), False)
+    return pd.Series(matched[column.cat.codes.to_numpy()], index=column.index)
+
+"""결과 DataFrame 에 상태 분류 컬럼을 한 번에 추가 (실질적 양호, 조치 결과 플래그, 상세 상태, 실패 유형)"""
+def classify_result_statuses(df):
+    df = df.copy(deep=False)
+    for column, pattern in STATUS_FLAG_PATTERNS.items():
+        df[column] = match_result_pattern(df['조치 결과'], pattern)
+
+    vulnerable = df['전체 취약 여부'].astype(bool)
+    action = df['조치 여부'].astype(bool)
+    df['실질적_양호상태'] = ~vulnerable | df['조치_완료']
+
+    detail_codes = np.select(
+        [~df['실질적_양호상태'], action & match_result_pattern(df['조치 결과'], REMEDIATED_DETAIL_TEXT, case=True)],
+        [2, 1],
+        default=0
+    )
+    df['상세_상태'] = pd.Categorical.from_codes(detail_codes, categories=DETAIL_STATUSES)
+
+    # 실패 유형도 고유 조치 결과 문구마다 한 번만 분류 (조치 시도 + 문제 문구인 행만, 나머지는 결측)
+    result_column = _as_categorical(df['조치 결과'])
+    category_types = np.array(
+        [FAILURE_TYPES.index(categorize_failure_type(value)) for value in result_column.cat.categories] + [-1]
+    )
+    failure_codes = np.where(action & df['조치_문제'], category_types[result_column.cat.codes.to_numpy()], -1)
+    df['실패_유형'] = pd.Categorical.from_codes(failure_codes, categories=FAILURE_TYPES)
+    return df
+
+def _table_to_json(table):
+    # 컬럼명 + 값 배열 형태로 저장 (레코드마다 키를 반복하지 않아 파일이 작음)
+    return {'columns': list(table.columns), 'data': table.astype(object).values.tolist()}
+
+def _table_from_json(data):
+    return pd.DataFrame(data['data'], columns=data['columns'])
+
+"""결과 DataFrame 에서 대시보드 집계 계산 (상태 분류 컬럼이 없으면 먼저 분류)"""
+def compute_report_summary(df, meta):
+    if '실질적_양호상태' not in df.columns:
+        df = classify_result_statuses(df)
+    action = df['조치 여부'].astype(bool)
+    actual_safe = df['실질적_양호상태']
+
+    flags = pd.DataFrame({
+        '호스트': df['호스트'],
+        '작업 설명': df['작업 설명'],
+        '총_점검': 1,
+        '실질적_양호': actual_safe,
+        '실질적_취약': ~actual_safe,
+        '원래_양호': actual_safe & ~action,
+        '조치_후_양호': action & df['조치_완료'],
+        '조치_시도_실패': action & df['조치_문제'],
+        '미조치_취약': ~actual_safe & ~action,
+        '조치_완료': df['조치_완료'],
+        '수동_조치_필요': df['수동_조치_필요'],
+        '조치_불필요': df['조치_불필요']
+    })
+
+    server_counts = flags.groupby('호스트', observed=True)[SERVER_COUNT_COLUMNS].sum().astype(int).reset_index()
+
+    # 서버 × 점검 항목별 점검 수 / 실질적 취약 수 (점검 유형 표, 히트맵, 취약점 유형 차트 공용)
+    task_counts = flags.groupby(['호스트', '작업 설명'], observed=True)[['총_점검', '실질적_취약']].sum().astype(int).reset_index()
+
+    vulnerable_status = df.loc[~actual_safe, ['조치 결과', '호스트']].groupby(
+        ['조치 결과', '호스트'], observed=True
+    ).size().reset_index(name='count')
+
+    failures = df.loc[df['실패_유형'].notna(), ['호스트', '조치 결과', '실패_유형']].groupby(
+        ['호스트', '조치 결과', '실패_유형'], observed=True
+    ).size().reset_index(name='count')
+
+    totals = {
+        'total_checks': int(len(df)),
+        'actual_safe': int(actual_safe.sum()),
+        'actual_vulnerable': int((~actual_safe).sum()),
+        'originally_safe': int(flags['원래_양호'].sum()),
+        'remediated_safe': int(flags['조치_후_양호'].sum()),
+        'attempted_but_failed': int(flags['조치_시도_실패'].sum()),
+        'still_vulnerable': int(flags['미조치_취약'].sum()),
+        'action_attempted': int(action.sum()),
+        'remediation_needed': int(flags['수동_조치_필요'].sum()),
+        'remediation_complete': int(flags['조치_완료'].sum()),
+        'automated': int(df['자동_조치'].sum()),
+        'issue_results': int(df['조치_문제'].sum()),
+        'ignored_results': int(df['조치_무시'].sum()),
+        'ignored_actions': int((action & df['조치_무시']).sum())
+    }
+
+    return {
+        'version': REPORT_SUMMARY_VERSION,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'totals': totals,
+        'servers': meta.get('servers', []),
+        'reachable_servers': sorted(str(host) for host in df['호스트'].unique()),
+        'server_counts': _table_to_json(server_counts),
+        'task_counts': _table_to_json(task_counts),
+        'vulnerable_status': _table_to_json(vulnerable_status),
+        'failures': _table_to_json(failures)
+    }
+
+"""요약 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+def write_report_summary(result_folder_path, summary):
+    summary_path = get_report_summary_path(result_folder_path)
+    temp_path = f"{summary_path}.{os.getpid()}.{threading.get_ident()}.tmp"   # 동시 생성 시 임시 파일 충돌 방지
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(temp_path, summary_path)
+    return summary_path
+
+"""실행 결과에서 요약 파일 생성 (실행 완료 시 호출, 결과가 없으면 None)"""
+def build_run_summary(result_folder_path):
+    if is_result_store_fresh(result_folder_path):
+        df, meta = load_result_store(result_folder_path)
+    else:
+        results_dir = os.path.join(result_folder_path, "results")
+        if not os.path.isdir(results_dir):
+            return None
+        reports, meta = read_result_json_files(results_dir)
+        df = pd.DataFrame.from_records([build_result_record(report) for report in reports], columns=RESULT_SCHEMA.names)
+
+    if df.empty:
+        return None
+
+    summary_path = write_report_summary(result_folder_path, compute_report_summary(df, meta))
+    print(f"📊 리포트 요약 저장 완료: {summary_path} ({len(df)}행)")
+    return summary_path
+
+"""요약 파일이 현재 결과(Parquet 저장소/결과 폴더)보다 최신이고 같은 집계 버전인지 확인"""
+def is_report_summary_fresh(result_folder_path):
+    summary_path = get_report_summary_path(result_folder_path)
+    if not os.path.exists(summary_path):
+        return False
+    summary_mtime = os.path.getmtime(summary_path)
+    for source_path in (get_result_store_path(result_folder_path), os.path.join(result_folder_path, "results")):
+        if os.path.exists(source_path) and os.path.getmtime(source_path) > summary_mtime:
+            return False
+    return True
+
+"""요약 파일 로드 (없거나 오래됐으면 None), 집계 표는 DataFrame 으로 복원"""
+def load_report_summary(result_folder_path):
+    if not is_report_summary_fresh(result_folder_path):
+        return None
+    try:
+        with open(get_report_summary_path(result_folder_path), 'r', encoding='utf-8') as f:
+            summary = json.load(f)
+    except Exception as e:
+        print(f"⚠️ 리포트 요약 읽기 실패: {str(e)}")
+        return None
+    if summary.get('version') != REPORT_SUMMARY_VERSION:
+        return None
+    return _restore_summary_tables(summary)
+
+def _restore_summary_tables(summary):
+    for key in ('server_counts', 'task_counts', 'vulnerable_status', 'failures'):
+        summary[key] = _table_from_json(summary[key])
+    return summary
+
+"""게스트 첫 화면용 요약 (헤드라인 지표 + 서버별 집계만, 저장된 최신 요약이 없으면 None)"""
+def build_guest_summary(result_folder_path):
+    summary = load_report_summary(result_folder_path)
+    if summary is None:
+        return None
+    return {
+        'generated_at': summary['generated_at'],
+        'totals': summary['totals'],
+        'servers': summary['servers'],
+        'server_counts': _table_to_json(summary['server_counts'])
+    }
+
+"""리포트 화면용 요약 반환 (저장된 요약 우선, 없거나 오래됐으면 결과 DataFrame 으로 계산해 저장)"""
+def get_report_summary(result_folder_path, df, meta):
+    summary = load_report_summary(result_folder_path)
+    if summary is not None:
+        return summary
+
+    summary = compute_report_summary(df, meta)
+    try:
+        write_report_summary(result_folder_path, summary)
+    except Exception as e:
+        print(f"⚠️ 리포트 요약 저장 실패: {str(e)}")
+    return _restore_summary_tables(summary)
@@ -0,0 +1,133 @@
+"""
+점검 결과 수집 관련 함수들 (콜백 플러그인 기반 결과 저장소)
+
+점검 플레이북은 원래 결과 JSON 을 localhost 로 위임한 copy 로 저장하고, 조치 단계에서 같은 파일을
+lookup 으로 다시 읽어 combine 한 뒤 또 저장합니다 (점검 × 호스트마다 로컬 액션 2회 + 파일 I/O).
+수집 모드에서는 플레이북 생성 시 이 태스크들을 점검별 보고서 팩트(set_fact)로 바꾸고,
+callback_plugins/kisa_result_collector.py 가 태스크 결과에서 보고서를 받아 메모리에서 병합한 뒤
+실행이 끝날 때 실행당 하나의 결과 저장소(results/kisa_results*.json, 보고서 리스트)로 저장합니다.
+"""
+import os
+import re
+import glob
+import json
+
+RESULT_STORE_PREFIX = "kisa_results"               # 결과 저장소 파일명 (results/kisa_results[_<구분>].json)
+REPORT_FACT_PREFIX = "kisa_report_"                # 점검별 보고서 팩트 이름 접두사 (콜백이 이 팩트만 수집)
+REPORT_TASK_CODE_KEY = "task_code"                 # 콜백이 보고서에 남기는 점검 코드 (팩트 이름에서 접두사를 뺀 값)
+CALLBACK_NAME = "kisa_result_collector"
+CALLBACK_PLUGIN_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "callback_plugins")
+
+COPY_MODULES = ('ansible.builtin.copy', 'copy')
+RESULT_LOOKUP_PATTERN = re.compile(r"""lookup\((['"])file\1,\s*result_json_path\)\s*\|\s*from_json""")
+
+"""점검 파일의 점검 코드 (보고서 팩트 이름/결과 저장소 키 공통, 예: 1_3_1_check_unnecessary_users)"""
+def build_task_code(task_file):
+    return re.sub(r'\W', '_', task_file.replace('.yml', ''))
+
+"""점검 파일의 보고서 팩트 이름 (예: kisa_report_1_1_9_etc_shadow_permissions)"""
+def build_report_fact_name(task_file):
+    return REPORT_FACT_PREFIX + build_task_code(task_file)
+
+"""결과 JSON 을 localhost 로 저장하는 copy 태스크인지 확인"""
+def _is_result_copy_task(task):
+    for module in COPY_MODULES:
+        args = task.get(module)
+        if isinstance(args, dict) and 'result_json_path' in str(args.get('dest', '')):
+            return module
+    return None
+
+"""점검 태스크 트리의 결과 파일 저장/재조회를 보고서 팩트 설정/참조로 변환"""
+def convert_report_tasks(tasks, task_file):
+    fact_name = build_report_fact_name(task_file)
+    # 문자열(JSON)/딕셔너리 어느 쪽으로 템플릿되어도 이전 보고서를 딕셔너리로 사용
+    previous_report = f"({fact_name} if {fact_name} is mapping else {fact_name} | from_json)"
+
+    def convert_value(node):
+        if isinstance(node, dict):
+            return {key: convert_value(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [convert_value(item) for item in node]
+        if isinstance(node, str) and "result_json_path" in node:
+            return RESULT_LOOKUP_PATTERN.sub(previous_report, node)
+        return node
+
+    converted = []
+    for task in tasks:
+        if not isinstance(task, dict):
+            converted.append(task)
+            continue
+
+        module = _is_result_copy_task(task)
+        if module:
+            # copy 모듈 자리에 set_fact 를 넣고 localhost 위임 관련 키워드는 제거 (name/when 등은 유지)
+            report_task = {}
+            for key, value in task.items():
+                if key == module:
+                    report_task['ansible.builtin.set_fact'] = {fact_name: value.get('content', '')}
+                elif key not in ('delegate_to', 'become', 'run_once'):
+                    report_task[key] = value
+            converted.append(convert_value(report_task))
+            continue
+
+        task = convert_value(task)
+        for section in ('block', 'rescue', 'always'):
+            if isinstance(task.get(section), list):
+                task[section] = convert_report_tasks(task[section], task_file)
+        converted.append(task)
+
+    return converted
+
+"""결과 수집 콜백 플러그인을 켜는 환경 변수 (store_name 은 샤드 등 프로세스별 저장소 구분용)"""
+def build_result_collector_env(result_folder_path, store_name=None):
+    store_file = f"{RESULT_STORE_PREFIX}_{store_name}.json" if store_name else f"{RESULT_STORE_PREFIX}.json"
+    return {
+        'ANSIBLE_CALLBACK_PLUGINS': CALLBACK_PLUGIN_DIR,
+        'ANSIBLE_CALLBACKS_ENABLED': CALLBACK_NAME,
+        'ANSIBLE_CALLBACK_WHITELIST': CALLBACK_NAME,   # ansible 2.10 이하 호환
+        'KISA_RESULT_STORE': os.path.abspath(os.path.join(result_folder_path, "results", store_file))
+    }
+
+"""보고서 리스트를 결과 저장소 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+def write_result_store(store_path, reports):
+    temp_path = store_path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(reports, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, store_path)
+    return store_path
+
+"""보고서의 점검 코드 (결과 저장소는 콜백이 남긴 task_code, 점검별 개별 파일은 <점검 코드>_<호스트>.json 파일명 기준)"""
+def get_report_task_code(report, json_file):
+    if report.get(REPORT_TASK_CODE_KEY):
+        return report[REPORT_TASK_CODE_KEY]
+    if not report.get('hostname'):
+        return None
+    host_suffix = f"_{report['hostname']}.json"
+    filename = os.path.basename(json_file)
+    if filename.endswith(host_suffix) and not filename.startswith(RESULT_STORE_PREFIX):
+        return build_task_code(filename[:-len(host_suffix)])
+    return None
+
+"""results 폴더의 보고서를 (호스트, 점검 코드) 기준으로 로드 (점검별 개별 파일 / 결과 저장소 모두 지원)
+
+playbook_name 은 점검 파일명과 다른 점검이 많으므로 (예: 1_3_1 → mysql_unnecessary_accounts) 키로 쓰지 않고,
+점검 코드를 알 수 없는 보고서는 재사용 대상에서 제외합니다.
+"""
+def load_result_reports(results_dir):
+    reports = {}
+    for json_file in sorted(glob.glob(os.path.join(results_dir, "*.json"))):
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ 결과 파일 읽기 실패 ({json_file}): {str(e)}")
+            continue
+
+        for report in data if isinstance(data, list) else [data]:
+            if not isinstance(report, dict) or not report.get('hostname'):
+                continue
+            task_code = get_report_task_code(report, json_file)
+            if task_code:
+                # 재사용 저장소로 옮겨 써도 점검 코드를 잃지 않도록 보고서에 기록
+                reports[(report['hostname'], task_code)] = {**report, REPORT_TASK_CODE_KEY: task_code}
+    return reports
@@ -0,0 +1,196 @@
+"""
+점검 결과 Parquet 저장소 관련 함수들 (실행당 하나의 컬럼형 결과 파일)
+
+실행이 끝나면 results/*.json 보고서를 고정 스키마의 Parquet 파일 하나(playbook_result_<ts>/results.parquet)로
+압축 저장합니다. 호스트/플레이북/진단 결과처럼 반복되는 문자열 컬럼은 사전(dictionary) 인코딩되어
+리포트에서 읽을 때 pandas 범주형(category) 컬럼으로 바로 로드됩니다.
+"""
+import os
+import glob
+import json
+import threading
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from modules.result_collector import REPORT_TASK_CODE_KEY, get_report_task_code
+
+RESULT_STORE_FILENAME = "results.parquet"
+RESULT_STORE_META_KEY = b"kisa_result_meta"
+
+# 리포트 DataFrame 컬럼 (parse 순서 그대로) → Parquet 타입
+RESULT_SCHEMA = pa.schema([
+    ("호스트", pa.dictionary(pa.int32(), pa.string())),
+    ("진단 결과", pa.dictionary(pa.int32(), pa.string())),
+    ("전체 취약 여부", pa.bool_()),
+    ("조치 여부", pa.bool_()),
+    ("조치 결과", pa.dictionary(pa.int32(), pa.string())),
+    ("조치 시간", pa.string()),
+    ("작업 설명", pa.dictionary(pa.int32(), pa.string())),
+    ("플레이북", pa.dictionary(pa.int32(), pa.string())),
+    ("점검 코드", pa.dictionary(pa.int32(), pa.string())),
+    ("취약 사유", pa.dictionary(pa.int32(), pa.string())),
+    ("취약 파일 수", pa.int32()),
+    ("권장사항", pa.dictionary(pa.int32(), pa.string())),
+    ("현재 권한", pa.dictionary(pa.int32(), pa.string())),
+    ("현재 소유자", pa.dictionary(pa.int32(), pa.string()))
+])
+
+"""보고서 값의 참/거짓 판단 (문자열 "true"/"false" 도 허용)"""
+def _to_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', 'yes', '1')
+    return bool(value)
+
+def _to_text(value):
+    return "" if value is None else str(value)
+
+"""점검 보고서 하나를 리포트 행으로 변환"""
+def build_result_record(data):
+    # vulnerability_details에서 추가 정보 추출
+    vuln_details = data.get("vulnerability_details") or {}
+    vulnerable_files = []
+
+    # 다양한 형태의 취약 파일 정보 추출
+    if "vulnerable_files_found" in vuln_details:
+        vulnerable_files = vuln_details["vulnerable_files_found"]
+    elif "file_list" in vuln_details:
+        vulnerable_files = vuln_details["file_list"]
+    elif "vulnerable_files" in vuln_details:
+        vulnerable_files = vuln_details["vulnerable_files"]
+
+    return {
+        "호스트": _to_text(data.get("hostname", "알 수 없음")),
+        "진단 결과": _to_text(data.get("diagnosis_result", "알 수 없음")),
+        "전체 취약 여부": _to_bool(data.get("is_vulnerable", False)),
+        "조치 여부": _to_bool(data.get("remediation_applied", False)),
+        "조치 결과": _to_text(data.get("remediation_result", "")),
+        "조치 시간": _to_text(data.get("remediation_timestamp", "")),
+        "작업 설명": _to_text(data.get("task_description", "")),
+        "플레이북": _to_text(data.get("playbook_name", "")),
+        "점검 코드": _to_text(data.get(REPORT_TASK_CODE_KEY, "")),
+        "취약 사유": _to_text(vuln_details.get("reason", "")),
+        "취약 파일 수": len(vulnerable_files) if vulnerable_files else 0,
+        "권장사항": _to_text(vuln_details.get("recommendation", "")),
+        "현재 권한": _to_text(vuln_details.get("current_mode", "")),
+        "현재 소유자": _to_text(vuln_details.get("current_owner", ""))
+    }
+
+"""결과 폴더의 Parquet 저장소 경로"""
+def get_result_store_path(result_folder_path):
+    return os.path.join(result_folder_path, RESULT_STORE_FILENAME)
+
+"""결과 JSON 파일들을 읽어 (보고서 리스트, 메타데이터) 반환 (load_timestamp_results 와 같은 규칙)"""
+def read_result_json_files(results_dir):
+    json_files = sorted(glob.glob(os.path.join(results_dir, "*.json")))
+    reports = []
+    file_info = []
+    server_list = set()
+    check_types = set()
+
+    for json_file in json_files:
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ 결과 파일 읽기 실패 ({json_file}): {str(e)}")
+            continue
+
+        filename = os.path.basename(json_file)
+        file_info.append({
+            'filename': filename,
+            'path': json_file,
+            'size': os.path.getsize(json_file),
+            'data_type': type(data).__name__
+        })
+
+        for item in data if isinstance(data, list) else [data]:
+            if not isinstance(item, dict):
+                continue
+            server_list.add(item.get('hostname', 'Unknown'))
+            # 결과 저장소(리스트)는 보고서마다 점검이 다르므로 playbook_name 우선
+            source_name = item.get('playbook_name') if isinstance(data, list) else None
+            check_type = (source_name or filename).split('_')[1:3]
+            if len(check_type) >= 2:
+                check_types.add('_'.join(check_type))
+            # 점검 코드가 없는 이전 형식 보고서는 파일명(<점검 코드>_<호스트>.json)에서 복원
+            if not item.get(REPORT_TASK_CODE_KEY):
+                task_code = get_report_task_code(item, json_file)
+                if task_code:
+                    item = {**item, REPORT_TASK_CODE_KEY: task_code}
+            reports.append(item)
+
+    meta = {
+        'file_info': file_info,
+        'total_files': len(json_files),
+        'loaded_files': len(file_info),
+        'servers': sorted(server_list),
+        'check_types': sorted(check_types)
+    }
+    return reports, meta
+
+"""실행 결과 JSON 을 Parquet 파일 하나로 압축 저장 (결과가 없으면 None)"""
+def compact_run_results(result_folder_path):
+    results_dir = os.path.join(result_folder_path, "results")
+    if not os.path.isdir(results_dir):
+        return None
+
+    reports, meta = read_result_json_files(results_dir)
+    if not meta['total_files']:
+        return None
+
+    # 행 단위 dict 대신 컬럼 리스트로 바로 모아 메모리 사용 최소화
+    columns = {field.name: [] for field in RESULT_SCHEMA}
+    for report in reports:
+        for name, value in build_result_record(report).items():
+            columns[name].append(value)
+
+    arrays = []
+    for field in RESULT_SCHEMA:
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(columns[field.name], type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(columns[field.name], type=field.type))
+
+    table = pa.Table.from_arrays(arrays, schema=RESULT_SCHEMA).replace_schema_metadata({
+        RESULT_STORE_META_KEY: json.dumps(meta, ensure_ascii=False).encode('utf-8')
+    })
+
+    store_path = get_result_store_path(result_folder_path)
+    # 작업 스레드와 리포트 세션이 동시에 압축해도 서로의 임시 파일을 덮어쓰지 않도록 프로세스/스레드별 임시 파일 사용
+    temp_path = f"{store_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    pq.write_table(table, temp_path, compression='zstd')
+    os.replace(temp_path, store_path)
+    print(f"🗜️ 결과 Parquet 저장 완료: {store_path} ({table.num_rows}행, JSON {meta['total_files']}개)")
+    return store_path
+
+"""Parquet 저장소가 결과 폴더보다 최신인지 확인 (이후 JSON 이 추가/변경되거나 스키마 컬럼이 늘었으면 다시 압축 필요)"""
+def is_result_store_fresh(result_folder_path):
+    store_path = get_result_store_path(result_folder_path)
+    results_dir = os.path.join(result_folder_path, "results")
+    if not os.path.exists(store_path):
+        return False
+    if not os.path.isdir(results_dir):
+        return True
+    if not set(RESULT_SCHEMA.names) <= set(pq.read_schema(store_path).names):
+        return False
+    return os.path.getmtime(store_path) >= os.path.getmtime(results_dir)
+
+"""Parquet 저장소의 메타데이터만 읽기 (결과 행은 읽지 않음, 저장소가 없으면 None)"""
+def read_result_store_meta(result_folder_path):
+    store_path = get_result_store_path(result_folder_path)
+    if not os.path.exists(store_path):
+        return None
+    metadata = pq.read_schema(store_path).metadata or {}
+    return json.loads(metadata.get(RESULT_STORE_META_KEY, b"{}").decode('utf-8'))
+
+"""Parquet 저장소를 (DataFrame, 메타데이터)로 로드 (사전 인코딩 컬럼은 category 로 로드)"""
+def load_result_store(result_folder_path):
+    table = pq.read_table(get_result_store_path(result_folder_path))
+    meta = json.loads((table.schema.metadata or {}).get(RESULT_STORE_META_KEY, b"{}").decode('utf-8'))
+    df = table.to_pandas()
+    # 원본 JSON 을 정리해 다시 압축할 수 없는 이전 스키마 저장소는 빠진 컬럼을 빈 값으로 채움
+    for field in RESULT_SCHEMA:
+        if field.name not in df.columns:
+            df[field.name] = "" if pa.types.is_dictionary(field.type) else None
+    return df, meta
@@ -0,0 +1,300 @@
+"""
+실행 기록 보관 정책 관련 함수들 (오래된 실행 압축/보관, 만료 실행 삭제)
+
+실행마다 생성 플레이북, inventory, 결과 JSON 폴더, 일반 텍스트 로그가 계속 쌓이므로
+정책 기간이 지난 실행은 리포트에 필요한 압축본(results.parquet, 요약, 태스크 프로파일, gzip 로그)만 남기고
+나머지 상세 파일을 정리하며, 삭제 기간이 지난 실행은 카탈로그에서 빼고 모든 파일을 지웁니다.
+파일은 교체/이름 변경으로 한 번에 바꾸고 카탈로그는 한 트랜잭션으로 갱신하여,
+정리 도중에도 사이드바와 리포트가 반쯤 지워진 실행을 보지 않도록 합니다.
+"""
+import os
+import glob
+import json
+import shutil
+import threading
+import time
+from datetime import datetime
+
+from modules.log_writer import LOG_DIR, COMPRESSED_SUFFIX, resolve_log_path, compress_log_file
+from modules.run_catalog import CATALOG_DIR, PLAYBOOKS_DIR, RUN_PATH_PATTERN, get_run_catalog
+from modules.result_store import RESULT_STORE_FILENAME, compact_run_results, get_result_store_path, is_result_store_fresh
+from modules.report_summary import REPORT_SUMMARY_FILENAME, build_run_summary, is_report_summary_fresh
+from modules.task_profile import TASK_PROFILE_FILENAME, compact_task_profile, get_task_profile_path
+from modules.incremental_scan import CHECK_MAPPING_FILENAME, INCREMENTAL_MAX_AGE_DAYS
+from modules.report_cache import invalidate_run_cache
+from modules.export_bundle import get_export_bundle_dir
+from modules.job_manager import ACTIVE_STATUSES, get_job_manager
+
+RETENTION_POLICY_PATH = os.path.join(CATALOG_DIR, "retention_policy.json")
+RETENTION_STATE_PATH = os.path.join(CATALOG_DIR, "retention_state.json")
+RETENTION_MARKER_FILENAME = "retention.json"       # 압축 보관된 실행 표시 (결과 폴더 안)
+RETENTION_CHECK_INTERVAL = 6 * 60 * 60             # 자동 정리 주기 (초)
+RETENTION_START_DELAY = 60                         # 서버 시작 직후에는 정리하지 않음 (초)
+RETENTION_MIN_COMPACT_DAYS = INCREMENTAL_MAX_AGE_DAYS  # 증분 점검이 이전 결과 JSON 을 재사용하는 기간보다 짧게 압축하지 않음
+TRASH_PREFIX = ".trash_"                            # 삭제 전 이름을 바꿔 두는 폴더 접두사 (glob 대상에서 제외)
+
+# 관리자가 정책을 저장하기 전에는 아무것도 정리하지 않음 (기존 설치본 업그레이드 시 실행 기록 보호)
+DEFAULT_RETENTION_POLICY = {
+    'enabled': False,
+    'compact_after_days': 30,     # 이 기간이 지나면 Parquet + gzip 로그만 남기고 상세 파일 정리
+    'delete_after_days': 0        # 이 기간이 지나면 실행 기록 삭제 (0 이면 삭제 안 함)
+}
+
+# 압축 보관 후에도 결과 폴더에 남기는 파일 (리포트/추이/내보내기가 읽는 압축본과 작은 메타데이터)
+RETAINED_FILES = {
+    RESULT_STORE_FILENAME, REPORT_SUMMARY_FILENAME, TASK_PROFILE_FILENAME,
+    CHECK_MAPPING_FILENAME, "incremental_plan.json", RETENTION_MARKER_FILENAME
+}
+
+_apply_lock = threading.Lock()
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"⚠️ 보관 정책 파일 읽기 실패 ({path}): {str(e)}")
+        return None
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+"""정책 값 정리 (압축 기간 하한 적용, 삭제 기간은 압축 기간 이상, 0 은 삭제 안 함)"""
+def normalize_retention_policy(policy):
+    merged = {**DEFAULT_RETENTION_POLICY, **(policy or {})}
+    compact_after_days = max(int(merged['compact_after_days']), RETENTION_MIN_COMPACT_DAYS)
+    delete_after_days = max(int(merged['delete_after_days'] or 0), 0)
+    if delete_after_days:
+        delete_after_days = max(delete_after_days, compact_after_days)
+    return {
+        'enabled': bool(merged['enabled']),
+        'compact_after_days': compact_after_days,
+        'delete_after_days': delete_after_days
+    }
+
+"""관리자가 보관 정책을 저장한 적이 있는지 (저장 전에는 자동/수동 정리 모두 하지 않음)"""
+def is_retention_policy_saved():
+    return os.path.exists(RETENTION_POLICY_PATH)
+
+"""저장된 보관 정책 (없으면 기본 정책)"""
+def load_retention_policy():
+    return normalize_retention_policy(_read_json(RETENTION_POLICY_PATH))
+
+def save_retention_policy(policy):
+    policy = normalize_retention_policy(policy)
+    _write_json(RETENTION_POLICY_PATH, policy)
+    return policy
+
+"""마지막 정리 결과 (한 번도 실행하지 않았으면 None)"""
+def load_retention_state():
+    return _read_json(RETENTION_STATE_PATH)
+
+def _result_folder(timestamp):
+    return os.path.join(PLAYBOOKS_DIR, f"playbook_result_{timestamp}")
+
+def _run_time(timestamp):
+    try:
+        return datetime.strptime(timestamp, "%Y%m%d_%H%M%S")
+    except ValueError:
+        return None
+
+def _path_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        for file_name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, file_name))
+            except OSError:
+                pass
+    return total
+
+def _discard_path(path):
+    # 폴더는 먼저 이름을 바꿔(원자적) 다른 세션에서 반쯤 지워진 내용이 보이지 않게 한 뒤 삭제
+    size = _path_size(path)
+    if os.path.isdir(path):
+        trash_path = os.path.join(os.path.dirname(path), f"{TRASH_PREFIX}{os.path.basename(path)}")
+        if os.path.exists(trash_path):
+            shutil.rmtree(trash_path, ignore_errors=True)
+        os.rename(path, trash_path)
+        shutil.rmtree(trash_path, ignore_errors=True)
+    else:
+        os.remove(path)
+    return size
+
+"""실행이 이미 압축 보관되었는지 (보관 표시가 있고 일반 텍스트 로그가 없음)"""
+def is_run_compacted(timestamp):
+    plain_log = resolve_log_path(timestamp)
+    if os.path.exists(plain_log) and not plain_log.endswith(COMPRESSED_SUFFIX):
+        return False
+    result_folder_path = _result_folder(timestamp)
+    return not os.path.isdir(result_folder_path) or os.path.exists(
+        os.path.join(result_folder_path, RETENTION_MARKER_FILENAME)
+    )
+
+"""정책 기준으로 압축/삭제할 실행 목록 (실행 중/대기 중 작업의 실행은 제외)"""
+def plan_retention(policy=None, now=None):
+    policy = normalize_retention_policy(policy) if policy else load_retention_policy()
+    now = now or datetime.now()
+
+    active_timestamps = {
+        job['timestamp'] for job in get_job_manager().list_jobs(limit=None) if job.get('status') in ACTIVE_STATUSES
+    }
+
+    # 카탈로그의 실행 + 로그 없이 결과 폴더만 남은 실행
+    timestamps = {run['timestamp'] for run in get_run_catalog().list_runs()}
+    for folder in glob.glob(os.path.join(PLAYBOOKS_DIR, "playbook_result_*")):
+        match = RUN_PATH_PATTERN.search(os.path.basename(folder))
+        if match:
+            timestamps.add(match.group(1))
+
+    plan = {'compact': [], 'delete': []}
+    for timestamp in sorted(timestamps - active_timestamps):
+        run_time = _run_time(timestamp)
+        if run_time is None:
+            continue
+        age_days = (now - run_time).total_seconds() / 86400
+        if policy['delete_after_days'] and age_days >= policy['delete_after_days']:
+            plan['delete'].append(timestamp)
+        elif age_days >= policy['compact_after_days'] and not is_run_compacted(timestamp):
+            plan['compact'].append(timestamp)
+    return plan
+
+"""실행 하나를 압축 보관 (리포트용 압축본 생성 → 로그 gzip → 카탈로그 갱신 → 상세 파일 정리, 확보한 바이트 반환)"""
+def compact_run(timestamp):
+    result_folder_path = _result_folder(timestamp)
+    freed_bytes = 0
+
+    if os.path.isdir(result_folder_path):
+        # 상세 파일을 지우기 전에 리포트가 읽을 압축본이 모두 최신인지 먼저 확인
+        if not is_result_store_fresh(result_folder_path):
+            compact_run_results(result_folder_path)
+        results_dir = os.path.join(result_folder_path, "results")
+        if glob.glob(os.path.join(results_dir, "*.json")) and not os.path.exists(get_result_store_path(result_folder_path)):
+            raise RuntimeError("결과 Parquet 저장소를 만들지 못해 결과 JSON 을 유지합니다")
+        if os.path.exists(get_result_store_path(result_folder_path)) and not is_report_summary_fresh(result_folder_path):
+            build_run_summary(result_folder_path)
+        if not os.path.exists(get_task_profile_path(result_folder_path)):
+            compact_task_profile(result_folder_path)
+
+    log_path = resolve_log_path(timestamp)
+    if os.path.exists(log_path) and not log_path.endswith(COMPRESSED_SUFFIX):
+        original_size = os.path.getsize(log_path)
+        freed_bytes += original_size - os.path.getsize(compress_log_file(log_path))
+
+    # 카탈로그의 로그 경로(.gz)를 한 트랜잭션으로 갱신 (결과 수는 Parquet 저장소 메타데이터로 유지됨)
+    get_run_catalog().index_run(timestamp)
+
+    if os.path.isdir(result_folder_path):
+        for entry in os.listdir(result_folder_path):
+            if entry not in RETAINED_FILES:
+                freed_bytes += _discard_path(os.path.join(result_folder_path, entry))
+        _write_json(os.path.join(result_folder_path, RETENTION_MARKER_FILENAME), {
+            'tier': 'compacted',
+            'compacted_at': datetime.now().isoformat(timespec='seconds'),
+            'freed_bytes': freed_bytes
+        })
+
+    bundle_dir = get_export_bundle_dir(timestamp)
+    if os.path.exists(bundle_dir):
+        freed_bytes += _discard_path(bundle_dir)
+
+    invalidate_run_cache(timestamp)
+    return freed_bytes
+
+"""실행 하나를 삭제 (로그 → 카탈로그 → 결과 폴더/내보내기 번들 순, 확보한 바이트 반환)"""
+def delete_run(timestamp):
+    freed_bytes = 0
+
+    # 카탈로그는 로그 존재 여부로 색인하므로 로그를 먼저 지워야 감시자가 다시 색인하지 않음
+    plain_log = os.path.join(LOG_DIR, f"ansible_execute_log_{timestamp}.log")
+    for log_path in (plain_log, plain_log + COMPRESSED_SUFFIX):
+        if os.path.exists(log_path):
+            freed_bytes += _discard_path(log_path)
+    get_run_catalog().remove_run(timestamp)
+    invalidate_run_cache(timestamp)
+
+    for path in (_result_folder(timestamp), get_export_bundle_dir(timestamp)):
+        if os.path.exists(path):
+            freed_bytes += _discard_path(path)
+    return freed_bytes
+
+"""보관 정책 적용 (dry_run 이면 대상만 반환, 다른 정리가 진행 중이면 None)
+
+policy 를 직접 주지 않으면 관리자가 저장한 정책이 있을 때만 파일을 정리합니다.
+"""
+def apply_retention(policy=None, dry_run=False):
+    if not dry_run and policy is None and not is_retention_policy_saved():
+        print("🧹 저장된 보관 정책이 없어 정리하지 않습니다.")
+        return {'compact': [], 'delete': [], 'failed': {}, 'freed_bytes': 0}
+    if not _apply_lock.acquire(blocking=False):
+        return None
+    try:
+        policy = normalize_retention_policy(policy) if policy else load_retention_policy()
+        plan = plan_retention(policy)
+        if dry_run:
+            return {**plan, 'failed': {}, 'freed_bytes': 0, 'dry_run': True}
+
+        result = {'compact': [], 'delete': [], 'failed': {}, 'freed_bytes': 0}
+
+        # 이전 정리 도중 중단되어 남은 삭제 대기 폴더
+        for trash_path in glob.glob(os.path.join(PLAYBOOKS_DIR, f"{TRASH_PREFIX}*")):
+            result['freed_bytes'] += _path_size(trash_path)
+            shutil.rmtree(trash_path, ignore_errors=True)
+
+        for action, handler in (('delete', delete_run), ('compact', compact_run)):
+            for timestamp in plan[action]:
+                try:
+                    result['freed_bytes'] += handler(timestamp)
+                    result[action].append(timestamp)
+                except Exception as e:
+                    result['failed'][timestamp] = str(e)
+                    print(f"⚠️ 보관 정책 적용 실패 ({action} {timestamp}): {str(e)}")
+
+        state = {
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'policy': policy,
+            'compacted': len(result['compact']),
+            'deleted': len(result['delete']),
+            'failed': len(result['failed']),
+            'freed_bytes': result['freed_bytes']
+        }
+        try:
+            _write_json(RETENTION_STATE_PATH, state)
+        except Exception as e:
+            print(f"⚠️ 보관 정책 결과 저장 실패: {str(e)}")
+
+        print(f"🧹 보관 정책 적용 완료: 압축 {state['compacted']}개, 삭제 {state['deleted']}개, "
+              f"실패 {state['failed']}개, {state['freed_bytes']:,} bytes 확보")
+        return result
+    finally:
+        _apply_lock.release()
+
+def _scheduler_loop(interval):
+    time.sleep(RETENTION_START_DELAY)
+    while True:
+        try:
+            if is_retention_policy_saved() and load_retention_policy()['enabled']:
+                apply_retention()
+        except Exception as e:
+            print(f"⚠️ 보관 정책 자동 적용 오류: {str(e)}")
+        time.sleep(interval)
+
+"""보관 정책 자동 적용 스레드 시작 (프로세스당 한 번)"""
+def start_retention_scheduler(interval=RETENTION_CHECK_INTERVAL):
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None:
+            return
+        _scheduler = threading.Thread(target=_scheduler_loop, args=(interval,), name="retention", daemon=True)
+        _scheduler.start()
+        print(f"🧹 보관 정책 자동 적용 시작 ({interval // 3600}시간마다)")
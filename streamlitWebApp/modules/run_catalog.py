@@ -0,0 +1,288 @@
+"""
+점검 실행 기록 카탈로그 관련 함수들 (SQLite 인덱스, watchdog 기반 갱신)
+
+사이드바/게스트 화면/리포트 페이지가 매 rerun 마다 logs, playbooks 폴더를 glob/stat 하지 않도록
+실행 기록을 SQLite 카탈로그에 저장해 두고 조회합니다. 실행이 끝날 때 해당 실행을 색인하고,
+watchdog 감시자가 로그/결과 폴더의 변경(수동 삭제, 압축, 다른 프로세스의 실행 등)을 반영합니다.
+결과가 있는 가장 최근 실행은 색인이 바뀔 때마다 게스트 요약과 함께 포인터 파일(latest_run.json)로 유지되어,
+게스트 첫 화면은 실행 수와 관계없이 이 파일 하나만 읽습니다.
+"""
+import os
+import re
+import glob
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+
+from modules.log_writer import LOG_DIR, resolve_log_path, list_execution_logs
+from modules.result_store import read_result_store_meta
+from modules.report_summary import get_report_summary_path, build_guest_summary
+
+CATALOG_DIR = "catalog"
+CATALOG_DB_PATH = os.path.join(CATALOG_DIR, "run_catalog.db")
+LATEST_RUN_FILENAME = "latest_run.json"   # 결과가 있는 가장 최근 실행 + 게스트 요약 (카탈로그 DB 옆)
+PLAYBOOKS_DIR = "playbooks"
+CATALOG_DEBOUNCE_SECONDS = 1.0    # 같은 실행의 연속된 파일 이벤트(로그 flush 등)를 모아 한 번만 재색인
+
+RUN_PATH_PATTERN = re.compile(r'(?:ansible_execute_log_|playbook_result_)(\d{8}_\d{6})')
+LATEST_VALID_RUN_QUERY = "SELECT * FROM runs WHERE has_results = 1 ORDER BY execution_time DESC LIMIT 1"
+# 포인터를 다시 쓸지 판단할 때 비교하지 않는 컬럼 (실행 중 로그 flush 마다 바뀜)
+LATEST_POINTER_IGNORED = ('execution_time', 'log_size', 'indexed_at')
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+class _CatalogEventHandler(FileSystemEventHandler):
+    """로그/결과 폴더 변경 이벤트에서 실행 타임스탬프를 추출해 카탈로그 재색인 예약"""
+
+    def __init__(self, catalog):
+        super().__init__()
+        self.catalog = catalog
+
+    def on_any_event(self, event):
+        for path in (event.src_path, getattr(event, 'dest_path', None)):
+            match = RUN_PATH_PATTERN.search(str(path or ''))
+            if match:
+                self.catalog.schedule_reindex(match.group(1))
+
+class RunCatalog:
+    """실행 기록 카탈로그 (타임스탬프 → 로그/결과 폴더 요약)"""
+
+    def __init__(self, db_path=CATALOG_DB_PATH):
+        self.db_path = db_path
+        self.latest_path = os.path.join(os.path.dirname(db_path), LATEST_RUN_FILENAME)
+        self._lock = threading.Lock()
+        self._latest_lock = threading.Lock()
+        self._latest_cache = (None, None)   # (포인터 파일 mtime, 내용)
+        self._pending = set()
+        self._timer = None
+        self._observer = None
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    timestamp TEXT PRIMARY KEY,
+                    execution_time REAL NOT NULL,
+                    log_file TEXT NOT NULL,
+                    log_size INTEGER NOT NULL,
+                    result_folder TEXT NOT NULL,
+                    json_count INTEGER NOT NULL,
+                    has_results INTEGER NOT NULL,
+                    indexed_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_execution_time ON runs (execution_time DESC)")
+            run_count = conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+        # 최초 생성 시(또는 비어 있으면) 기존 기록 전체를 한 번 색인
+        if run_count == 0:
+            self.rebuild()
+        elif not os.path.exists(self.latest_path):
+            self.refresh_latest_pointer()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def index_run(self, timestamp, refresh_latest=True):
+        """실행 하나를 다시 색인 (실행 로그가 없으면 카탈로그에서 제거)"""
+        log_file = resolve_log_path(timestamp)
+        if not os.path.exists(log_file):
+            self.remove_run(timestamp, refresh_latest)
+            return None
+
+        file_stat = os.stat(log_file)
+        result_folder = os.path.join(PLAYBOOKS_DIR, f"playbook_result_{timestamp}")
+        results_path = os.path.join(result_folder, "results")
+        json_count = len(glob.glob(os.path.join(results_path, "*.json"))) if os.path.isdir(results_path) else 0
+        if not json_count:
+            # 보관 정책으로 결과 JSON 을 정리한 실행은 Parquet 저장소에 기록된 원본 파일 수 사용
+            store_meta = read_result_store_meta(result_folder)
+            json_count = store_meta.get('total_files', 0) if store_meta else 0
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (timestamp, file_stat.st_mtime, log_file, file_stat.st_size, result_folder,
+                 json_count, int(json_count > 0), datetime.now().isoformat(timespec='seconds'))
+            )
+        if refresh_latest:
+            self.refresh_latest_pointer()
+        return timestamp
+
+    def remove_run(self, timestamp, refresh_latest=True):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM runs WHERE timestamp = ?", (timestamp,))
+        if refresh_latest:
+            self.refresh_latest_pointer()
+
+    def rebuild(self):
+        """logs 폴더 전체를 스캔해 카탈로그 재구성 (최초 실행 / 수동 새로고침)"""
+        timestamps = set()
+        for log_file in list_execution_logs():
+            match = RUN_PATH_PATTERN.search(os.path.basename(log_file))
+            if match:
+                timestamps.add(match.group(1))
+
+        with self._connect() as conn:
+            indexed = {row['timestamp'] for row in conn.execute("SELECT timestamp FROM runs")}
+        for timestamp in indexed - timestamps:
+            self.remove_run(timestamp, refresh_latest=False)
+        for timestamp in sorted(timestamps):
+            try:
+                self.index_run(timestamp, refresh_latest=False)
+            except Exception as e:
+                print(f"  ❌ 실행 기록 색인 오류 {timestamp}: {str(e)}")
+        self.refresh_latest_pointer()
+
+        print(f"🗂️ 실행 기록 카탈로그 재구성 완료: {len(timestamps)}개")
+        return len(timestamps)
+
+    def schedule_reindex(self, timestamp):
+        """파일 이벤트가 잠잠해진 뒤 한 번만 재색인하도록 예약"""
+        with self._lock:
+            self._pending.add(timestamp)
+            if self._timer is None:
+                self._timer = threading.Timer(CATALOG_DEBOUNCE_SECONDS, self._flush_pending)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, set()
+            self._timer = None
+        for timestamp in pending:
+            try:
+                self.index_run(timestamp)
+            except Exception as e:
+                print(f"⚠️ 실행 기록 재색인 실패 ({timestamp}): {str(e)}")
+
+    def start_watcher(self):
+        """logs / playbooks 폴더 변경 감시 시작 (프로세스당 한 번)"""
+        if self._observer is not None:
+            return
+        handler = _CatalogEventHandler(self)
+        observer = Observer()
+        for watch_dir, recursive in ((LOG_DIR, False), (PLAYBOOKS_DIR, True)):
+            os.makedirs(watch_dir, exist_ok=True)
+            observer.schedule(handler, watch_dir, recursive=recursive)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+        print("👀 실행 기록 카탈로그 감시 시작 (logs, playbooks)")
+
+    def _to_record(self, row):
+        execution_time = datetime.fromtimestamp(row['execution_time'])
+        has_results = bool(row['has_results'])
+        return {
+            'timestamp': row['timestamp'],
+            'execution_time': execution_time,
+            'log_file': row['log_file'],
+            'result_folder': row['result_folder'],
+            'display_name': execution_time.strftime("%Y-%m-%d %H:%M:%S"),
+            'file_size': row['log_size'],
+            'has_results': has_results,
+            'json_count': row['json_count'],
+            'status': '완료' if has_results else '실패 (실행만)'
+        }
+
+    def list_runs(self, limit=None):
+        """최신 순 실행 기록 (load_analysis_history 와 같은 형식)"""
+        query = "SELECT * FROM runs ORDER BY execution_time DESC"
+        params = ()
+        if limit:
+            query += " LIMIT ?"
+            params = (limit,)
+        with self._connect() as conn:
+            return [self._to_record(row) for row in conn.execute(query, params)]
+
+    def count_runs(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def get_run(self, timestamp):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM runs WHERE timestamp = ?", (timestamp,)).fetchone()
+        return self._to_record(row) if row else None
+
+    def refresh_latest_pointer(self):
+        """결과가 있는 가장 최근 실행과 게스트 요약을 포인터 파일로 저장 (바뀐 경우에만 다시 씀)"""
+        with self._latest_lock:
+            with self._connect() as conn:
+                row = conn.execute(LATEST_VALID_RUN_QUERY).fetchone()
+
+            if row is None:
+                if os.path.exists(self.latest_path):
+                    os.remove(self.latest_path)
+                return None
+
+            run = dict(row)
+            summary_path = get_report_summary_path(run['result_folder'])
+            summary_mtime = os.path.getmtime(summary_path) if os.path.exists(summary_path) else None
+
+            current = self._read_latest_pointer()
+            if current is not None and current.get('summary_mtime') == summary_mtime and all(
+                current['run'].get(key) == value for key, value in run.items() if key not in LATEST_POINTER_IGNORED
+            ):
+                return current
+
+            # 요약은 실행 완료 시 저장된 최신 요약이 있을 때만 (실행 중이면 None → 전체 리포트 표시)
+            pointer = {
+                'run': run,
+                'summary': build_guest_summary(run['result_folder']),
+                'summary_mtime': summary_mtime,
+                'updated_at': datetime.now().isoformat(timespec='seconds')
+            }
+            # 여러 프로세스/스레드가 동시에 갱신해도 서로의 임시 파일을 덮어쓰지 않도록 이름 구분
+            temp_path = f"{self.latest_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(pointer, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_path, self.latest_path)
+            print(f"📌 최근 리포트 포인터 갱신: {run['timestamp']}")
+            return pointer
+
+    def _read_latest_pointer(self):
+        # 포인터 파일이 바뀌지 않았으면 이전에 읽은 내용 재사용 (stat 한 번)
+        try:
+            mtime = os.stat(self.latest_path).st_mtime_ns
+        except OSError:
+            return None
+        cached_mtime, pointer = self._latest_cache
+        if cached_mtime == mtime:
+            return pointer
+        try:
+            with open(self.latest_path, 'r', encoding='utf-8') as f:
+                pointer = json.load(f)
+        except Exception as e:
+            print(f"⚠️ 최근 리포트 포인터 읽기 실패: {str(e)}")
+            return None
+        self._latest_cache = (mtime, pointer)
+        return pointer
+
+    def get_latest_valid_run(self):
+        """결과 JSON 이 있는 가장 최근 실행 (게스트 화면 기본 리포트, 실행 수와 관계없이 포인터 파일만 읽음)"""
+        pointer = self._read_latest_pointer()
+        if pointer is None:
+            return None
+        record = self._to_record(pointer['run'])
+        record['summary'] = pointer.get('summary')
+        return record
+
+"""프로세스 전체에서 공유하는 실행 기록 카탈로그 반환 (최초 호출 시 생성 + 감시 시작)"""
+def get_run_catalog():
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = RunCatalog()
+            try:
+                _catalog.start_watcher()
+            except Exception as e:
+                print(f"⚠️ 실행 기록 감시 시작 실패 (실행 종료 시 색인만 사용): {str(e)}")
+        return _catalog
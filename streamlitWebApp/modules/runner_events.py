@@ -0,0 +1,73 @@
+"""
+ansible-runner 구조화 이벤트 처리 관련 함수들
+"""
+
+# ansible-runner 결과 이벤트 → 호스트별 태스크 결과 상태
+RUNNER_RESULT_EVENTS = {
+    'runner_on_ok': 'ok',
+    'runner_on_failed': 'failed',
+    'runner_on_skipped': 'skipped',
+    'runner_on_unreachable': 'unreachable'
+}
+
+# playbook_on_stats 이벤트 키 → PLAY RECAP 키
+RUNNER_STATS_KEYS = {
+    'ok': 'ok',
+    'changed': 'changed',
+    'dark': 'unreachable',
+    'failures': 'failed',
+    'skipped': 'skipped',
+    'rescued': 'rescued',
+    'ignored': 'ignored'
+}
+
+"""playbook_on_stats 이벤트 데이터를 호스트별 PLAY RECAP 통계로 변환"""
+def runner_stats_to_host_stats(event_data):
+    host_stats = {}
+    for runner_key, recap_key in RUNNER_STATS_KEYS.items():
+        for host, count in (event_data.get(runner_key) or {}).items():
+            stats = host_stats.setdefault(host, {key: 0 for key in RUNNER_STATS_KEYS.values()})
+            stats[recap_key] = count
+    return host_stats
+
+"""ansible-runner 이벤트를 출력 큐용 구조화 이벤트로 변환 (화면/집계에 쓰지 않는 이벤트는 None)
+
+반환 형식:
+    {'type': 'play_start', 'play': ...}
+    {'type': 'task_start', 'play': ..., 'task': ...}
+    {'type': 'host_result', 'host': ..., 'play': ..., 'task': ..., 'status': ok|changed|failed|skipped|unreachable,
+     'ignored': bool, 'start': ..., 'end': ..., 'duration': ...}
+    {'type': 'host_stats', 'hosts': {host: {ok, changed, unreachable, failed, skipped, rescued, ignored}}}
+"""
+def convert_runner_event(event):
+    event_name = event.get('event')
+    event_data = event.get('event_data') or {}
+
+    if event_name == 'playbook_on_play_start':
+        return {'type': 'play_start', 'play': event_data.get('play')}
+
+    if event_name == 'playbook_on_task_start':
+        return {'type': 'task_start', 'play': event_data.get('play'), 'task': event_data.get('task')}
+
+    if event_name in RUNNER_RESULT_EVENTS:
+        status = RUNNER_RESULT_EVENTS[event_name]
+        result = event_data.get('res') or {}
+        if status == 'ok' and isinstance(result, dict) and result.get('changed'):
+            status = 'changed'
+
+        return {
+            'type': 'host_result',
+            'host': event_data.get('host'),
+            'play': event_data.get('play'),
+            'task': event_data.get('task'),
+            'status': status,
+            'ignored': bool(event_data.get('ignore_errors')) and status == 'failed',
+            'start': event_data.get('start'),
+            'end': event_data.get('end'),
+            'duration': event_data.get('duration')
+        }
+
+    if event_name == 'playbook_on_stats':
+        return {'type': 'host_stats', 'hosts': runner_stats_to_host_stats(event_data)}
+
+    return None
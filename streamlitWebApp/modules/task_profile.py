@@ -0,0 +1,125 @@
+"""
+점검 태스크 실행 시간 프로파일 관련 함수들 (호스트 × 태스크 실제 시작/종료 시각, Parquet 저장)
+
+callback_plugins/kisa_task_profiler.py 가 실행(샤드)마다 playbook_result_<ts>/profile/task_profile*.json 으로
+호스트별 태스크 시작/종료 시각을 기록하면, 실행이 끝날 때 Parquet 파일 하나(task_profile.parquet)로 압축합니다.
+리포트의 실행 타임라인과 '느린 점검 / 느린 서버' 프로파일은 이 기록으로 그립니다.
+"""
+import os
+import glob
+import json
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from modules.report_cache import get_cached_run_data
+
+TASK_PROFILER_CALLBACK = "kisa_task_profiler"
+TASK_PROFILE_DIRNAME = "profile"                   # 콜백 기록 위치 (profile/task_profile[_<구분>].json)
+TASK_PROFILE_PREFIX = "task_profile"
+TASK_PROFILE_FILENAME = "task_profile.parquet"
+TASK_PROFILE_TOP_N = 15                            # 프로파일 화면에 표시할 느린 점검/서버/태스크 수
+UNKNOWN_CHECK = "(점검 외 태스크)"                 # 팩트 수집 등 점검 코드가 없는 태스크
+
+TASK_PROFILE_SCHEMA = pa.schema([
+    ("host", pa.dictionary(pa.int32(), pa.string())),
+    ("check", pa.dictionary(pa.int32(), pa.string())),
+    ("task", pa.dictionary(pa.int32(), pa.string())),
+    ("status", pa.dictionary(pa.int32(), pa.string())),
+    ("start", pa.float64()),
+    ("end", pa.float64()),
+    ("duration", pa.float64())
+])
+
+"""태스크 프로파일 콜백 플러그인 기록 경로 환경 변수 (store_name 은 샤드 등 프로세스별 파일 구분용)"""
+def build_task_profiler_env(result_folder_path, store_name=None):
+    profile_file = f"{TASK_PROFILE_PREFIX}_{store_name}.json" if store_name else f"{TASK_PROFILE_PREFIX}.json"
+    return {
+        'KISA_TASK_PROFILE': os.path.abspath(os.path.join(result_folder_path, TASK_PROFILE_DIRNAME, profile_file))
+    }
+
+"""Parquet 프로파일 경로"""
+def get_task_profile_path(result_folder_path):
+    return os.path.join(result_folder_path, TASK_PROFILE_FILENAME)
+
+"""콜백 기록(샤드별 JSON)을 하나의 DataFrame 으로 읽기 (기록이 없으면 None)"""
+def read_task_profile_records(result_folder_path):
+    frames = []
+    for profile_file in sorted(glob.glob(os.path.join(result_folder_path, TASK_PROFILE_DIRNAME, "*.json"))):
+        try:
+            with open(profile_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            frames.append(pd.DataFrame(data['data'], columns=data['columns']))
+        except Exception as e:
+            print(f"⚠️ 태스크 프로파일 읽기 실패 ({profile_file}): {str(e)}")
+
+    if not frames:
+        return None
+    df = pd.concat(frames, ignore_index=True)
+    df['check'] = df['check'].fillna('').replace('', UNKNOWN_CHECK)
+    df['duration'] = (df['end'] - df['start']).clip(lower=0)
+    return df.sort_values('start', kind='stable').reset_index(drop=True)
+
+"""실행이 끝난 뒤 콜백 기록을 Parquet 파일 하나로 압축 저장 (기록이 없으면 None)"""
+def compact_task_profile(result_folder_path):
+    df = read_task_profile_records(result_folder_path)
+    if df is None:
+        return None
+
+    arrays = []
+    for field in TASK_PROFILE_SCHEMA:
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(df[field.name].astype(str), type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(df[field.name].astype(float), type=field.type))
+    table = pa.Table.from_arrays(arrays, schema=TASK_PROFILE_SCHEMA)
+
+    profile_path = get_task_profile_path(result_folder_path)
+    temp_path = f"{profile_path}.{os.getpid()}.{threading.get_ident()}.tmp"   # 동시 생성 시 임시 파일 충돌 방지
+    pq.write_table(table, temp_path, compression='zstd')
+    os.replace(temp_path, profile_path)
+    print(f"⏱️ 태스크 프로파일 저장 완료: {profile_path} ({table.num_rows}행)")
+    return profile_path
+
+"""실행의 태스크 프로파일 로드 (Parquet 우선, 없으면 콜백 기록, 둘 다 없으면 None)"""
+def load_task_profile(result_folder_path):
+    profile_path = get_task_profile_path(result_folder_path)
+    if os.path.exists(profile_path):
+        return pq.read_table(profile_path).to_pandas()
+    return read_task_profile_records(result_folder_path)
+
+"""리포트 화면용 태스크 프로파일 (파일이 바뀌지 않았으면 프로세스 공유 캐시에서 반환)"""
+def get_task_profile(timestamp):
+    result_folder_path = os.path.join("playbooks", f"playbook_result_{timestamp}")
+    return get_cached_run_data('task_profile', timestamp, lambda: load_task_profile(result_folder_path))
+
+"""점검별 실행 구간 (모든 호스트 중 첫 시작 ~ 마지막 종료, 실행 타임라인용)"""
+def summarize_check_spans(profile_df):
+    spans = profile_df.groupby('check', observed=True).agg(
+        start=('start', 'min'), end=('end', 'max'), hosts=('host', 'nunique')
+    ).reset_index()
+    return spans.sort_values('start', kind='stable').reset_index(drop=True)
+
+"""느린 점검 순위 (호스트별 소요 시간 합계/평균/최대)"""
+def summarize_slowest_checks(profile_df, top_n=TASK_PROFILE_TOP_N):
+    per_host = profile_df.groupby(['check', 'host'], observed=True)['duration'].sum().reset_index()
+    checks = per_host.groupby('check', observed=True)['duration'].agg(
+        total_seconds='sum', mean_seconds='mean', max_seconds='max', hosts='count'
+    ).reset_index()
+    return checks.sort_values('total_seconds', ascending=False).head(top_n).reset_index(drop=True)
+
+"""느린 서버 순위 (첫 태스크 시작 ~ 마지막 태스크 종료 구간과 태스크 소요 시간 합계)"""
+def summarize_slowest_hosts(profile_df, top_n=TASK_PROFILE_TOP_N):
+    hosts = profile_df.groupby('host', observed=True).agg(
+        start=('start', 'min'), end=('end', 'max'),
+        busy_seconds=('duration', 'sum'), tasks=('task', 'count')
+    ).reset_index()
+    hosts['wall_seconds'] = hosts['end'] - hosts['start']
+    hosts = hosts.drop(columns=['start', 'end'])
+    return hosts.sort_values('wall_seconds', ascending=False).head(top_n).reset_index(drop=True)
+
+"""가장 오래 걸린 (호스트, 태스크) 실행 목록"""
+def summarize_slowest_tasks(profile_df, top_n=TASK_PROFILE_TOP_N):
+    return profile_df.nlargest(top_n, 'duration')[['host', 'check', 'task', 'status', 'duration']].reset_index(drop=True)
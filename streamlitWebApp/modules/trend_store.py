@@ -0,0 +1,228 @@
+"""
+실행 간 점검 추이 저장소 관련 함수들 (SQLite 팩트 테이블, 증분 적재)
+
+실행마다 (실행, 호스트, 점검, 상태, 조치) 한 행씩을 추가 전용(append-only) 팩트 테이블에 적재하고,
+추이 조회는 과거 결과 폴더를 다시 읽지 않고 색인된 테이블에서만 답합니다.
+이미 적재한 실행은 ingested_runs 에 기록되어 다시 읽지 않습니다.
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from modules.run_catalog import CATALOG_DIR, get_run_catalog
+from modules.result_store import (
+    RESULT_SCHEMA, build_result_record, read_result_json_files,
+    is_result_store_fresh, load_result_store
+)
+
+TREND_DB_PATH = os.path.join(CATALOG_DIR, "trend_facts.db")
+TREND_DEFAULT_RUNS = 90           # 추이 조회 기본 범위 (최근 실행 수)
+TREND_SCHEMA_VERSION = 2          # 2: check_code 를 playbook_name 대신 점검 코드(task_code)로 기록
+REMEDIATED_PATTERN = ("완료", "성공")   # 리포트의 실질적 양호 판단과 같은 조치 결과 키워드
+
+_ingest_lock = threading.Lock()
+_initialized = False
+
+def _connect():
+    os.makedirs(os.path.dirname(TREND_DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(TREND_DB_PATH, timeout=10)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+"""팩트 테이블/색인 생성 (없을 때만)"""
+def init_trend_store():
+    global _initialized
+    if _initialized:
+        return
+    with _connect() as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        # 이전 버전 팩트는 점검 키가 달라 섞이면 추이가 끊기므로 비우고 카탈로그에서 다시 적재
+        if conn.execute("PRAGMA user_version").fetchone()[0] < TREND_SCHEMA_VERSION:
+            conn.executescript("""
+                DROP TABLE IF EXISTS check_facts;
+                DROP TABLE IF EXISTS ingested_runs;
+            """)
+            conn.execute(f"PRAGMA user_version = {TREND_SCHEMA_VERSION}")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS ingested_runs (
+                run_timestamp TEXT PRIMARY KEY,
+                run_time TEXT NOT NULL,
+                row_count INTEGER NOT NULL,
+                ingested_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS check_facts (
+                run_timestamp TEXT NOT NULL,
+                host TEXT NOT NULL,
+                check_code TEXT NOT NULL,
+                diagnosis_result TEXT NOT NULL,
+                is_vulnerable INTEGER NOT NULL,
+                remediation_applied INTEGER NOT NULL,
+                remediation_result TEXT NOT NULL,
+                actual_vulnerable INTEGER NOT NULL,
+                PRIMARY KEY (run_timestamp, host, check_code)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_facts_check_run ON check_facts (check_code, run_timestamp);
+            CREATE INDEX IF NOT EXISTS idx_facts_host_check_run ON check_facts (host, check_code, run_timestamp);
+        """)
+    _initialized = True
+
+"""리포트 행 → 팩트 행 (실질적 취약 = 취약이면서 조치 완료/성공이 아닌 항목)
+
+점검 키는 점검 파일 기준 코드(task_code)이며, 점검 코드 없이 정리된 이전 실행만 playbook_name 으로 대신합니다.
+"""
+def _to_fact(run_timestamp, record):
+    remediated = any(keyword in record["조치 결과"] for keyword in REMEDIATED_PATTERN)
+    return (
+        run_timestamp,
+        record["호스트"],
+        record["점검 코드"] or record["플레이북"].replace('.yml', ''),
+        record["진단 결과"],
+        int(record["전체 취약 여부"]),
+        int(record["조치 여부"]),
+        record["조치 결과"],
+        int(record["전체 취약 여부"] and not remediated)
+    )
+
+"""실행 하나의 결과를 팩트 테이블에 적재 (이미 적재한 실행은 건너뜀, 적재한 행 수 반환)"""
+def ingest_run(run_timestamp, result_folder_path=None):
+    result_folder_path = result_folder_path or os.path.join("playbooks", f"playbook_result_{run_timestamp}")
+    init_trend_store()
+
+    with _ingest_lock:
+        with _connect() as conn:
+            if conn.execute("SELECT 1 FROM ingested_runs WHERE run_timestamp = ?", (run_timestamp,)).fetchone():
+                return 0
+
+        # Parquet 결과 저장소가 있으면 컬럼 단위로 읽고, 없으면 결과 JSON 을 직접 읽음
+        if is_result_store_fresh(result_folder_path):
+            df, _ = load_result_store(result_folder_path)
+            names = RESULT_SCHEMA.names
+            records = [dict(zip(names, values)) for values in zip(*(df[name].tolist() for name in names))]
+        else:
+            reports, _ = read_result_json_files(os.path.join(result_folder_path, "results"))
+            records = [build_result_record(report) for report in reports]
+
+        if not records:
+            return 0
+
+        try:
+            run_time = datetime.strptime(run_timestamp, "%Y%m%d_%H%M%S").isoformat()
+        except ValueError:
+            run_time = run_timestamp
+
+        with _connect() as conn:
+            # 같은 (호스트, 점검) 보고서가 여러 파일에 있으면 마지막 것으로 (실행 내 중복 제거)
+            conn.executemany(
+                "INSERT OR REPLACE INTO check_facts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (_to_fact(run_timestamp, record) for record in records)
+            )
+            conn.execute(
+                "INSERT INTO ingested_runs VALUES (?, ?, ?, ?)",
+                (run_timestamp, run_time, len(records), datetime.now().isoformat(timespec='seconds'))
+            )
+
+    print(f"📈 점검 추이 적재: {run_timestamp} ({len(records)}행)")
+    return len(records)
+
+"""실행 기록 카탈로그에서 아직 적재하지 않은 실행만 찾아 적재 (적재한 실행 수 반환)"""
+def ingest_new_runs():
+    init_trend_store()
+    with _connect() as conn:
+        ingested = {row['run_timestamp'] for row in conn.execute("SELECT run_timestamp FROM ingested_runs")}
+
+    ingested_count = 0
+    for run in get_run_catalog().list_runs():
+        if run['has_results'] and run['timestamp'] not in ingested:
+            try:
+                if ingest_run(run['timestamp'], run['result_folder']):
+                    ingested_count += 1
+            except Exception as e:
+                print(f"⚠️ 점검 추이 적재 실패 ({run['timestamp']}): {str(e)}")
+    return ingested_count
+
+"""최근 N개 실행 (오래된 순)"""
+def get_trend_runs(limit=TREND_DEFAULT_RUNS):
+    init_trend_store()
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT run_timestamp, run_time, row_count FROM ingested_runs ORDER BY run_timestamp DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+    return [dict(row) for row in reversed(rows)]
+
+"""최근 N개 실행의 점검별/호스트별 취약 건수 추이 (group_by: 'check' | 'host')"""
+def query_vulnerable_trend(group_by="check", limit=TREND_DEFAULT_RUNS, actual=True, keys=None):
+    key_column = {'check': 'check_code', 'host': 'host'}[group_by]
+    status_column = 'actual_vulnerable' if actual else 'is_vulnerable'
+    key_filter = ""
+    params = [limit]
+    if keys:
+        key_filter = f" AND f.{key_column} IN ({', '.join('?' for _ in keys)})"
+        params.extend(keys)
+
+    init_trend_store()
+    with _connect() as conn:
+        rows = conn.execute(f"""
+            SELECT f.run_timestamp, f.{key_column} AS key, SUM(f.{status_column}) AS vulnerable_count,
+                   COUNT(*) AS total_count
+            FROM check_facts f
+            JOIN (SELECT run_timestamp FROM ingested_runs ORDER BY run_timestamp DESC LIMIT ?) r
+              ON r.run_timestamp = f.run_timestamp
+            WHERE 1 = 1{key_filter}
+            GROUP BY f.run_timestamp, f.{key_column}
+            ORDER BY f.run_timestamp
+        """, params).fetchall()
+    return [dict(row) for row in rows]
+
+"""가장 최근 실행에서 취약 건수가 많은 점검/호스트 (추이 화면 기본 선택)"""
+def top_vulnerable_keys(group_by="check", limit_keys=10, actual=True):
+    key_column = {'check': 'check_code', 'host': 'host'}[group_by]
+    status_column = 'actual_vulnerable' if actual else 'is_vulnerable'
+
+    init_trend_store()
+    with _connect() as conn:
+        rows = conn.execute(f"""
+            SELECT {key_column} AS key, SUM({status_column}) AS vulnerable_count
+            FROM check_facts
+            WHERE run_timestamp = (SELECT MAX(run_timestamp) FROM ingested_runs)
+            GROUP BY {key_column}
+            HAVING vulnerable_count > 0
+            ORDER BY vulnerable_count DESC, key
+            LIMIT ?
+        """, (limit_keys,)).fetchall()
+    return [row['key'] for row in rows]
+
+"""호스트 × 점검의 실행별 상태 이력 (오래된 순)"""
+def get_host_check_history(host, check_code):
+    init_trend_store()
+    with _connect() as conn:
+        rows = conn.execute("""
+            SELECT run_timestamp, diagnosis_result, is_vulnerable, remediation_applied,
+                   remediation_result, actual_vulnerable
+            FROM check_facts WHERE host = ? AND check_code = ?
+            ORDER BY run_timestamp
+        """, (host, check_code)).fetchall()
+    return [dict(row) for row in rows]
+
+"""호스트가 점검에서 처음 취약으로 진단된 실행과, 마지막으로 양호 → 취약으로 바뀐 실행"""
+def find_first_vulnerable(host, check_code):
+    history = get_host_check_history(host, check_code)
+    first_run = next((row['run_timestamp'] for row in history if row['is_vulnerable']), None)
+
+    last_transition = None
+    previous_vulnerable = False
+    for row in history:
+        if row['is_vulnerable'] and not previous_vulnerable:
+            last_transition = row['run_timestamp']
+        previous_vulnerable = bool(row['is_vulnerable'])
+
+    return {'first_vulnerable_run': first_run, 'latest_transition_run': last_transition, 'history': history}
+
+"""추이 화면 선택 목록용 호스트/점검 코드 (색인에서 조회)"""
+def list_trend_dimensions():
+    init_trend_store()
+    with _connect() as conn:
+        hosts = [row[0] for row in conn.execute("SELECT DISTINCT host FROM check_facts ORDER BY host")]
+        checks = [row[0] for row in conn.execute("SELECT DISTINCT check_code FROM check_facts ORDER BY check_code")]
+    return hosts, checks
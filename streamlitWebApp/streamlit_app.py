@@ -3,16 +3,18 @@ import pandas as pd
 import json
 import time
 import os
-import queue
-import glob
 import re
 import math
 from datetime import datetime, timedelta
+from collections import deque
 
 from modules.history_manager import render_sidebar_with_history, show_analysis_report
 from modules.inventory_handler import parse_inventory_file, save_inventory_file
-from modules.playbook_manager import save_generated_playbook, execute_ansible_playbook, generate_task_filename, generate_playbook_tasks
+from modules.playbook_manager import save_generated_playbook, generate_task_filename, generate_playbook_tasks, load_host_groups
+from modules.job_manager import get_job_manager, ACTIVE_STATUSES
 from modules.input_utils import count_selected_checks, parse_play_recap
+from modules.run_catalog import get_run_catalog
+from modules.retention import start_retention_scheduler
 
 # --- 페이지 설정  ---
 st.set_page_config(
@@ -61,6 +63,14 @@ ADMIN_PASSWORD = "admin"
 GUEST_USERNAME = "guest" # 일반유저
 GUEST_PASSWORD = "guest"
 
+# --- 실시간 실행 로그 표시 설정 ---
+LIVE_LOG_LINES = 100        # 화면에 유지할 최근 로그 라인 수 (링 버퍼 크기)
+LIVE_LOG_FPS = 4            # 초당 최대 로그 화면 갱신 횟수
+LIVE_METRIC_LABELS = {      # 실행 중 누적 통계 (ansible PLAY RECAP 과 같은 기준) → 지표 이름
+    'ok': "✅ 성공", 'changed': "🔄 변경", 'failed': "❌ 실패",
+    'ignored': "⚠️ 무시됨", 'unreachable': "🚫 접근불가", 'skipped': "⏭️ 건너뜀"
+}
+
 # --- 함수 정의 (모두 전역 범위로 이동) ---
 @st.cache_data
 def load_json_config(filename):
@@ -124,40 +134,62 @@ def render_guest_view():
         show_analysis_report(selected_report)
         return  # 함수 종료하여 아래 코드 실행 방지
 
-    latest_valid_report = None
+    latest_run = None
     
     try:
-        # playbooks 디렉토리에서 모든 결과 폴더를 찾음
-        report_dirs = glob.glob("playbooks/playbook_result_*")
-        
-        # ✨ 수정된 로직: 최신순으로 정렬하여 유효한 리포트를 찾을 때까지 반복
-        for folder_path in sorted(report_dirs, key=os.path.getmtime, reverse=True):
-            report_folder_name = os.path.basename(folder_path)
-            timestamp_str = report_folder_name.replace("playbook_result_", "")
-            
-            # 해당 리포트의 결과 폴더와 로그 파일 경로를 확인
-            results_path = os.path.join(folder_path, "results")
-            log_path = os.path.join("logs", f"ansible_execute_log_{timestamp_str}.log")
-
-            # 결과 폴더가 비어있지 않고, 로그 파일도 존재하면 유효한 리포트로 간주
-            if os.path.exists(results_path) and os.listdir(results_path) and os.path.exists(log_path):
-                latest_valid_report = timestamp_str  # 여기를 수정
-                break # 가장 최근의 유효한 리포트를 찾았으므로 반복 중단
+        # 🆕 실행 완료 시 갱신되는 최근 리포트 포인터에서 조회 (실행 수와 관계없이 파일 하나만 읽음)
+        latest_run = get_run_catalog().get_latest_valid_run()
 
     except Exception as e:
         st.error(f"분석 기록을 찾는 중 오류가 발생했습니다: {e}")
-        latest_valid_report = None
+        latest_run = None
     
-    # 유효한 리포트를 찾은 경우에만 리포트 표시 함수 호출
-    if latest_valid_report:
+    # 유효한 리포트를 찾은 경우에만 표시 (미리 계산된 요약이 있으면 요약, 없으면 전체 리포트)
+    if latest_run and latest_run.get('summary'):
+        render_guest_summary(latest_run)
+    elif latest_run:
         # history_manager.py의 show_analysis_report 함수가 호출됨
-        show_analysis_report(latest_valid_report)
+        show_analysis_report(latest_run['timestamp'])
     else:
         # 유효한 리포트가 하나도 없을 경우 안내 메시지 표시
         col1, col2, col3 = st.columns([1, 3, 1])
         with col2:
             st.info("표시할 수 있는 정상적인 분석 기록이 없습니다. 관리자에게 문의 바랍니다.")
 
+def render_guest_summary(latest_run):
+    """최근 실행의 미리 계산된 요약 표시 (결과 파일을 읽지 않음, 상세 리포트는 버튼으로 이동)"""
+    summary = latest_run['summary']
+    totals = summary['totals']
+    total_checks = totals['total_checks']
+    success_rate = totals['actual_safe'] / total_checks * 100 if total_checks else 0.0
+
+    st.title("📊 최근 보안 점검 요약")
+    st.caption(f"🕒 실행 시간: {latest_run['display_name']} · 요약 생성: {summary['generated_at'].replace('T', ' ')}")
+
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("📋 점검 항목", total_checks)
+    with col2:
+        st.metric("🖥️ 점검 서버", len(summary['servers']))
+    with col3:
+        st.metric("✅ 실질적 양호", totals['actual_safe'])
+    with col4:
+        st.metric("⚠️ 실질적 취약", totals['actual_vulnerable'])
+    with col5:
+        st.metric("🛡️ 실질적 성공률", f"{success_rate:.1f}%")
+
+    server_counts = pd.DataFrame(summary['server_counts']['data'], columns=summary['server_counts']['columns'])
+    if not server_counts.empty:
+        st.subheader("🖥️ 서버별 현황")
+        st.dataframe(
+            server_counts[['호스트', '총_점검', '실질적_양호', '실질적_취약', '조치_후_양호', '미조치_취약']],
+            use_container_width=True, hide_index=True
+        )
+
+    if st.button("📊 상세 분석 리포트 보기", type="primary", use_container_width=True):
+        st.query_params.from_dict({"report": latest_run['timestamp']})
+        st.rerun()
+
 def reset_playbook_session(reason="사용자 요청"):
     """플레이북 실행 관련 세션 상태를 초기화하는 함수"""
     print(f"\n{'='*60}")
@@ -182,7 +214,8 @@ def reset_playbook_session(reason="사용자 요청"):
         'playbook_tasks',
         'selected_checks',
         'result_folder_path',
-        'timestamp'
+        'timestamp',
+        'active_job_id'
     ]
     
     for key in session_keys_to_reset:
@@ -244,6 +277,211 @@ def sync_checkbox_states():
     
     return individual_states, category_states, all_checked
 
+def render_live_log(output_container, log_buffer, total_lines):
+    """링 버퍼의 최근 로그를 스타일링된 로그 박스로 한 번에 표시"""
+    log_text = '\n'.join(log_buffer)
+    display_text = log_text + '\n' + '─' * 50 + f' (실시간 업데이트 {total_lines}) ' + '─' * 50
+    
+    # 스크롤 가능한 스타일링된 컨테이너로 표시
+    output_container.markdown(f"""
+    <div style="
+        background-color: #0e1117;
+        border: 1px solid #262730;
+        border-radius: 5px;
+        padding: 10px;
+        font-family: 'Courier New', monospace;
+        font-size: 11px;
+        color: #fafafa;
+        max-height: 400px;
+        overflow-y: auto;
+        white-space: pre-wrap;
+        word-wrap: break-word;
+    ">
+    {display_text.replace('<', '&lt;').replace('>', '&gt;')}
+    </div>
+    """, unsafe_allow_html=True)
+
+def render_live_stats(stats_container, live_counts, live_hosts):
+    """실행 중 누적된 태스크 결과 지표와 서버별 진행 상황을 한 번에 표시"""
+    with stats_container.container():
+        for col, (key, label) in zip(st.columns(len(LIVE_METRIC_LABELS)), LIVE_METRIC_LABELS.items()):
+            col.metric(label, f"{live_counts.get(key, 0)}개")
+        
+        if live_hosts:
+            host_df = pd.DataFrame([
+                {'서버': host, **{label: counts.get(key, 0) for key, label in LIVE_METRIC_LABELS.items()},
+                 '처리한 태스크': counts.get('tasks', 0)}
+                for host, counts in sorted(live_hosts.items())
+            ])
+            # 서버마다 전체 태스크 수를 미리 알 수 없으므로 가장 많이 진행한 서버 대비 진행률로 표시
+            max_tasks = max(int(host_df['처리한 태스크'].max()), 1)
+            host_df['진행 (최다 서버 대비)'] = host_df['처리한 태스크']
+            st.dataframe(
+                host_df,
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    '진행 (최다 서버 대비)': st.column_config.ProgressColumn(
+                        '진행 (최다 서버 대비)', min_value=0, max_value=max_tasks, format="%d"
+                    )
+                }
+            )
+
+def render_job_monitor(job_id):
+    """백그라운드 점검 작업의 실시간 로그/진행 상황을 표시하고, 작업이 끝나면 결과 요약 표시"""
+    job_manager = get_job_manager()
+    job = job_manager.get_job(job_id)
+    if not job:
+        st.warning(f"⚠️ 점검 작업을 찾을 수 없습니다: {job_id}")
+        return
+    
+    # 실행 명령어 표시
+    st.subheader("🖥️ 실행 중인 Ansible 명령어")
+    cmd_text = f"ansible-playbook -i {job['inventory_path']} {job['playbook_path']} --limit target_servers -v"
+    st.code(cmd_text)
+    
+    # 로그 파일 정보 표시
+    log_filename = f"ansible_execute_log_{job['timestamp']}.log" + (".gz" if job['options'].get('compress_log') else "")
+    st.info(f"🆔 작업 ID: `{job_id}` · 📄 실행 로그가 다음 위치에 저장됩니다: `logs/{log_filename}`")
+    st.caption("💡 브라우저를 닫거나 새로고침해도 점검은 계속 실행됩니다. '🛰️ 백그라운드 점검 작업' 목록에서 다시 연결할 수 있습니다.")
+    
+    # 실시간 진행 현황 (태스크 결과가 들어오는 대로 누적한 호스트별 통계)
+    st.subheader("📡 실시간 진행 현황")
+    stats_container = st.empty()
+    
+    # 실시간 출력 영역
+    st.subheader("📄 실시간 실행 로그")
+    output_container = st.empty()
+    status_text = st.empty()
+    
+    # 작업 관리자의 출력 버퍼를 고정 프레임 간격으로 폴링 (최근 로그만 링 버퍼로 유지)
+    log_buffer = deque(maxlen=LIVE_LOG_LINES)
+    last_seq = 0
+    last_status_line = None
+    last_live_stats = None
+    
+    while True:
+        job = job_manager.get_job(job_id)
+        lines, last_seq = job_manager.read_output(job_id, last_seq)
+        if lines:
+            log_buffer.extend(lines)
+            render_live_log(output_container, log_buffer, job['total_lines'])
+        
+        # 통계가 바뀐 경우에만 지표/서버 표 다시 그림
+        live_stats = (job['live_counts'], job.get('live_hosts', {}))
+        if live_stats != last_live_stats:
+            render_live_stats(stats_container, *live_stats)
+            last_live_stats = live_stats
+        
+        if job['status'] == 'queued':
+            status_line = f"⏸️ 대기 중 - 대기열 {job_manager.queue_position(job_id)}번째 (동시 실행 수 제한)"
+        else:
+            status_line = f"⏳ 진행 중 - 서버 {len(live_stats[1])}대 | 현재 태스크: {job['current_task']}"
+        if status_line != last_status_line:
+            status_text.caption(status_line)
+            last_status_line = status_line
+        
+        if job['status'] not in ACTIVE_STATUSES:
+            break
+        time.sleep(1.0 / LIVE_LOG_FPS)
+    
+    if job['status'] == 'finished':
+        st.success("🎉 Ansible 플레이북 실행 완료!")
+        st.success(f"📄 전체 실행 로그가 `logs/{log_filename}`에 저장되었습니다.")
+        st.success(f"📁 점검 결과 파일들이 `{job['result_folder_path']}/results/`에 저장되었습니다.")
+    elif job['status'] == 'failed':
+        st.error(f"❌ 실행 실패 (종료 코드: {job['return_code']})")
+    elif job['status'] == 'cancelled':
+        st.warning("🚫 대기 중에 취소된 작업입니다.")
+        return
+    else:
+        st.error(f"❌ 실행 오류: {job['error']}")
+    
+    # 작업 관리자가 저장한 결과 요약 (구조화 호스트 통계 또는 PLAY RECAP 기준)
+    result_summary = job.get('result_summary') or parse_play_recap([])
+    
+    # 최종 실행 결과 요약
+    st.subheader("📊 실행 결과 요약")
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("✅ 성공", f"{result_summary['성공한 태스크']}개")
+    with col2:
+        st.metric("🔄 변경", f"{result_summary['변경된 설정']}개")
+    with col3:
+        st.metric("❌ 실패", f"{result_summary['실패한 태스크']}개")
+    with col4:
+        st.metric("⚠️ 무시됨", f"{result_summary['무시된 태스크']}개")
+    with col5:
+        st.metric("🚫 접근불가", f"{result_summary['접근 불가 서버']}개")
+
+    # 서버별 상세 결과 표시 (추가 기능)
+
+    if result_summary.get("서버 상세"):
+        st.subheader("🖥️ 서버별 상세 결과")
+
+    for server_name, stats in result_summary["서버 상세"].items():
+        with st.expander(f"📍 {server_name} 서버 결과"):
+            col1, col2, col3, col4, col5 = st.columns(5)
+
+            with col1:
+                st.metric("성공", stats.get('ok', 0), delta=None)
+            with col2:
+                st.metric("변경", stats.get('changed', 0), delta=None)
+            with col3:
+                st.metric("실패", stats.get('failed', 0), delta=None)
+            with col4:
+                st.metric("접근불가", stats.get('unreachable', 0), delta=None)
+            with col5:
+                st.metric("건너뛴", stats.get('skipped', 0), delta=None)
+
+            # 전체 성공률 표시 (추가 기능)
+            if result_summary["성공한 태스크"] > 0 or result_summary["실패한 태스크"] > 0:
+                total_tasks = result_summary["성공한 태스크"] + result_summary["실패한 태스크"]
+                success_rate = (result_summary["성공한 태스크"] / total_tasks) * 100 if total_tasks > 0 else 0
+
+                st.subheader("📈 전체 성공률")
+                st.progress(success_rate / 100)
+                st.write(f"**{success_rate:.1f}%** ({result_summary['성공한 태스크']}/{total_tasks} 태스크 성공)")
+
+            # 문제가 있는 경우 경고 표시
+            if result_summary["실패한 태스크"] > 0:
+                st.error(f"⚠️ {result_summary['실패한 태스크']}개의 태스크가 실패했습니다. 로그를 확인해주세요.")
+
+            if result_summary["접근 불가 서버"] > 0:
+                st.warning(f"🔌 {result_summary['접근 불가 서버']}개의 서버에 접근할 수 없습니다. 네트워크 연결을 확인해주세요.")
+
+def render_job_panel():
+    """모든 세션이 공유하는 백그라운드 점검 작업 목록 (다시 연결 / 대기 작업 취소)"""
+    job_manager = get_job_manager()
+    jobs = job_manager.list_jobs()
+    active_count = sum(1 for job in jobs if job['status'] in ACTIVE_STATUSES)
+    
+    status_icons = {
+        'queued': '⏸️', 'running': '⏳', 'finished': '✅', 'failed': '❌',
+        'error': '❌', 'interrupted': '⚠️', 'cancelled': '🚫'
+    }
+    
+    with st.expander(f"🛰️ 백그라운드 점검 작업 (실행/대기 {active_count}개)", expanded=active_count > 0):
+        if not jobs:
+            st.caption("등록된 점검 작업이 없습니다.")
+            return
+        
+        for job in jobs:
+            col1, col2, col3 = st.columns([5, 1, 1])
+            with col1:
+                st.markdown(
+                    f"{status_icons.get(job['status'], '📦')} `{job['job_id']}` · {job['status']} · "
+                    f"등록 {job['created_at']} · 요청자 {job.get('owner') or '-'}"
+                )
+            with col2:
+                if st.button("📡 연결", key=f"attach_{job['job_id']}", use_container_width=True):
+                    st.session_state.active_job_id = job['job_id']
+                    st.rerun()
+            with col3:
+                if job['status'] == 'queued' and st.button("🚫 취소", key=f"cancel_{job['job_id']}", use_container_width=True):
+                    job_manager.cancel_job(job['job_id'])
+                    st.rerun()
+
 def render_main_app():
     """로그인 성공 후 표시될 메인 애플리케이션을 렌더링하는 함수 (Admin용)"""
 
@@ -270,6 +508,12 @@ def render_main_app():
         except ImportError:
             st.error("❌ dynamic_analysis.py 모듈을 찾을 수 없습니다.")
 
+    # 🆕 점검 추이 분석 페이지 라우팅
+    if selected_page == "trend_analysis":
+        import trend_analysis
+        trend_analysis.main()
+        st.stop()
+
     # 스케줄링 페이지 라우팅
     if selected_page == "scheduling":
         try:
@@ -649,10 +893,60 @@ def render_main_app():
         st.session_state.selected_checks = {}
     if 'result_folder_path' not in st.session_state:
         st.session_state.result_folder_path = ""
+    
+    # 🆕 백그라운드 점검 작업 목록 (다른 세션에서 시작한 작업에도 다시 연결 가능)
+    render_job_panel()
+    if st.session_state.get('active_job_id') and not st.session_state.playbook_generated:
+        render_job_monitor(st.session_state.active_job_id)
 
     if active_servers and vulnerability_categories:
         # 취약점 점검 시작 버튼
         if not st.session_state.playbook_generated:
+            # 🆕 실행 최적화 옵션
+            with st.expander("⚙️ 실행 최적화 옵션"):
+                fact_once = st.checkbox(
+                    "🗂️ 팩트 1회 수집 (디스크 팩트 캐시 사용)",
+                    key="opt_fact_once",
+                    help="연결성 테스트 단계에서만 팩트를 수집하고 호스트별 디스크 캐시에 저장합니다. 캐시 유효 시간 내의 다음 실행도 이를 재사용합니다."
+                )
+                flat_layout = st.checkbox(
+                    "🧩 점검 항목을 단일 플레이로 병합 (flat 레이아웃)",
+                    key="opt_flat_layout",
+                    help="점검마다 import_playbook 플레이를 만드는 대신 선택된 점검들을 하나의 플레이에 block 단위로 병합합니다. 서버별 개별 설정 모드에서는 레이아웃과 관계없이 점검 세트가 같은 서버끼리 그룹별 플레이로 만듭니다."
+                )
+                auto_schedule = st.checkbox(
+                    "🧮 병렬 실행 자동 스케줄링 (forks / strategy)",
+                    value=True,
+                    key="opt_auto_schedule",
+                    help="호스트 수, 컨트롤 노드 CPU/메모리, SSH 응답 시간으로 forks 를 정하고 읽기 전용 점검은 free 전략으로 실행합니다. 끄면 ansible.cfg 설정을 그대로 사용합니다."
+                )
+                shards = st.number_input(
+                    "🧱 샤드 수 (동시에 실행할 ansible-playbook 프로세스 수)",
+                    min_value=1, max_value=16, value=1, step=1,
+                    key="opt_shards",
+                    help="대상 서버를 N개 그룹으로 나눠 N개의 프로세스로 동시에 실행합니다. 수백 대 규모에서 컨트롤 노드 CPU 병목을 줄입니다. 서버별 개별 설정 모드에서는 점검 세트가 같은 서버 그룹을 나누지 않고 샤드에 배정하므로, 그룹별 플레이가 순서대로가 아니라 동시에 실행됩니다."
+                )
+                compress_log = st.checkbox(
+                    "🗜️ 실행 완료 후 로그 gzip 압축",
+                    key="opt_compress_log",
+                    help="실행이 끝난 로그를 logs/ansible_execute_log_<타임스탬프>.log.gz 로 압축 저장합니다. 분석 리포트와 기록 목록에서는 그대로 읽을 수 있습니다."
+                )
+                incremental = st.checkbox(
+                    "🔁 증분 점검 (변경 없는 서버/점검 결과 재사용)",
+                    key="opt_incremental",
+                    help="점검 전에 대상 서버의 설정 파일·패키지 목록·실행 중 서비스 지문을 수집하고, 이전 실행과 지문이 같은 (서버, 점검) 조합은 다시 실행하지 않고 이전 결과를 재사용합니다. 결과는 최대 7일까지 재사용합니다."
+                )
+                collect_results = st.checkbox(
+                    "📦 콜백 플러그인으로 점검 결과 수집",
+                    value=True,
+                    key="opt_collect_results",
+                    help="점검마다 localhost 로 결과 JSON 을 쓰고 다시 읽는 대신, 콜백 플러그인이 태스크 결과에서 보고서를 받아 실행당 하나의 결과 저장소(results/kisa_results.json)로 저장합니다. 끄면 점검별 개별 JSON 파일로 저장합니다."
+                )
+            fact_gathering = "once" if fact_once else "per_check"
+            scheduling = "auto" if auto_schedule else "config"
+            playbook_layout = "flat" if flat_layout else "import"
+            result_collection = "callback" if collect_results else "file"
+            
             if st.button("🔍 취약점 점검 시작", type="primary", use_container_width=True):
                 reset_playbook_session("새로운 취약점 점검 시작")
                 # 플레이북 생성 및 저장
@@ -705,7 +999,11 @@ def render_main_app():
                             analysis_mode="server_specific",  # ← 🔑 정확한 모드 전달
                             server_specific_checks=st.session_state.get('server_specific_checks', {}),
                             vulnerability_categories=vulnerability_categories,
-                            filename_mapping=filename_mapping
+                            filename_mapping=filename_mapping,
+                            fact_gathering=fact_gathering,
+                            playbook_layout=playbook_layout,
+                            incremental=incremental,
+                            result_collection=result_collection
                         )
                     else:
                         playbook_path, playbook_filename, timestamp = save_generated_playbook(
@@ -714,7 +1012,11 @@ def render_main_app():
                             result_folder_path,
                             analysis_mode="unified",
                             vulnerability_categories=vulnerability_categories,
-                            filename_mapping=filename_mapping
+                            filename_mapping=filename_mapping,
+                            fact_gathering=fact_gathering,
+                            playbook_layout=playbook_layout,
+                            incremental=incremental,
+                            result_collection=result_collection
                         )
                           
                     # inventory 파일 저장 (결과 폴더 내에)
@@ -734,6 +1036,12 @@ def render_main_app():
                     st.session_state.selected_checks = selected_checks if 'selected_checks' in locals() else {}
                     st.session_state.result_folder_path = result_folder_path
                     st.session_state.timestamp = timestamp  # 이 라인 추가
+                    st.session_state.fact_gathering = fact_gathering
+                    st.session_state.playbook_layout = playbook_layout
+                    st.session_state.scheduling = scheduling
+                    st.session_state.shards = int(shards)
+                    st.session_state.compress_log = compress_log
+                    st.session_state.incremental = incremental
                     time.sleep(1)
                     
                     # 페이지 새로고침
@@ -770,12 +1078,22 @@ def render_main_app():
                     )
                     total_checks = sum(details['count'] for details in server_task_details.values())
                 
+                # 플레이북 레이아웃 (flat 이면 서버 그룹별 플레이를 그룹 단위 샤드로 동시 실행)
+                host_groups = load_host_groups(st.session_state.result_folder_path)
+                layout_info = st.session_state.get('playbook_layout', 'import')
+                if host_groups:
+                    group_shards = min(st.session_state.get('shards', 1), len(host_groups))
+                    layout_info += f" (서버 그룹 {len(host_groups)}개 플레이, " + (
+                        f"샤드 {group_shards}개로 동시 실행)" if group_shards > 1 else "순서대로 실행 - 샤드 수를 늘리면 그룹별 동시 실행)"
+                    )
+                
                 # 기본 정보 (서버별 모드)
                 playbook_info = {
                     "분석 모드": "서버별 개별 설정",
                     "대상 서버": active_servers,
                     "총 점검 항목": f"{total_checks}개 (모든 서버 합계)",
                     "서버별 점검 수": {server: details['count'] for server, details in server_task_details.items()} if server_task_details else {},
+                    "플레이북 레이아웃": layout_info,
                     "생성된 플레이북": os.path.basename(st.session_state.playbook_path),
                     "저장 경로": st.session_state.playbook_path,
                     "inventory 파일": st.session_state.inventory_path,
@@ -903,155 +1221,27 @@ def render_main_app():
             # 실행 경고 메시지
             st.warning("⚠️ 실제 서버에 변경 사항이 적용됩니다!")
             if st.button("▶️ 실행 시작 (생성된 Ansible 플레이북을 실제로 실행)", type="secondary", use_container_width=True):
-                # 실행 명령어 표시
-                st.subheader("🖥️ 실행 중인 Ansible 명령어")
-                cmd_text = f"ansible-playbook -i {st.session_state.inventory_path} {st.session_state.playbook_path} --limit target_servers -v"
-                st.code(cmd_text)
-                
-                # 실시간 출력 영역
-                st.subheader("📄 실시간 실행 로그")
-                output_container = st.empty()
-                status_text = st.empty()
-                
-                # 실제 Ansible 실행
-                try:
-                    # 백엔드 콘솔에 실행 시작 알림
-                    print(f"\n🔥 실제 실행 모드로 Ansible 플레이북 실행을 시작합니다...")
-                    
-                    output_queue, thread = execute_ansible_playbook(
-                        st.session_state.playbook_path, 
-                        st.session_state.inventory_path, 
-                        active_servers,
-                        st.session_state.result_folder_path,
-                        st.session_state.timestamp  # 타임스탬프 추가
-                    )
-                    
-                    # 로그 파일 정보 표시
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    log_filename = f"ansible_execute_log_{timestamp}.log"
-                    st.info(f"📄 실행 로그가 다음 위치에 저장됩니다: `logs/{log_filename}`")
-                    
-                    displayed_logs = []
-                    finished = False
-                    # 초기값 추가
-                    result_summary = {"성공한 태스크": 0, "변경된 설정": 0, "실패한 태스크": 0, "접근 불가 서버": 0}  # 초기값 추가
-                    
-                    while not finished:
-                        try:
-                            # 큐에서 출력 가져오기 (타임아웃 1초)
-                            msg_type, content = output_queue.get(timeout=1)
-                            
-                            if msg_type == 'output':
-                                # 빈 줄 필터링 및 공백 정리
-                                if content and content.strip():
-                                    cleaned_content = content.strip()
-                                    displayed_logs.append(cleaned_content)
-                                    
-                                    # 스타일링된 로그 박스로 표시 (최근 100줄 유지)
-                                    log_text = '\n'.join(displayed_logs[-100:])
-                                    display_text = log_text + '\n' + '─' * 50 + f' (실시간 업데이트 {len(displayed_logs)}) ' + '─' * 50
-                                    
-                                    # 스크롤 가능한 스타일링된 컨테이너로 표시
-                                    output_container.markdown(f"""
-                                    <div style="
-                                        background-color: #0e1117;
-                                        border: 1px solid #262730;
-                                        border-radius: 5px;
-                                        padding: 10px;
-                                        font-family: 'Courier New', monospace;
-                                        font-size: 11px;
-                                        color: #fafafa;
-                                        max-height: 400px;
-                                        overflow-y: auto;
-                                        white-space: pre-wrap;
-                                        word-wrap: break-word;
-                                    ">
-                                    {display_text.replace('<', '&lt;').replace('>', '&gt;')}
-                                    </div>
-                                    """, unsafe_allow_html=True)
-                                
-                            elif msg_type == 'finished':
-                                finished = True
-                                if content == 0:
-                                    st.success("🎉 Ansible 플레이북 실행 완료!")
-                                    st.success(f"📄 전체 실행 로그가 `logs/{log_filename}`에 저장되었습니다.")
-                                    st.success(f"📁 점검 결과 파일들이 `{st.session_state.result_folder_path}/results/`에 저장되었습니다.")
-                                    print("🎉 스트림릿 UI에서도 실행 완료 확인됨")
-                                    # PLAY RECAP 파싱하여 실제 결과 표시
-                                    result_summary = parse_play_recap(displayed_logs)
-                                else:
-                                    st.error(f"❌ 실행 실패 (종료 코드: {content})")
-                                    print(f"❌ 스트림릿 UI에서도 실행 실패 확인됨 (코드: {content})")
-                                    # 실패해도 가능한 결과는 파싱
-                                    result_summary = parse_play_recap(displayed_logs)
-                                    
-                            elif msg_type == 'error':
-                                st.error(f"❌ 실행 오류: {content}")
-                                print(f"❌ 스트림릿 UI에서도 오류 확인됨: {content}")
-                                finished = True
-                                result_summary = parse_play_recap(displayed_logs)
-                                
-                        except queue.Empty:
-                            continue
-                    
-                    # 스레드 완료 대기
-                    thread.join(timeout=5)
-                    
-                except Exception as e:
-                    error_msg = f"실행 중 오류 발생: {str(e)}"
-                    st.error(f"❌ {error_msg}")
-                    print(f"❌ [STREAMLIT ERROR] {error_msg}")
-                    result_summary = {"성공한 태스크": 0, "변경된 설정": 0, "실패한 태스크": 0, "접근 불가 서버": 0}
-                    
-                # 최종 실행 결과 요약
-                st.subheader("📊 실행 결과 요약")
-                col1, col2, col3, col4, col5 = st.columns(5)
-                with col1:
-                    st.metric("✅ 성공", f"{result_summary['성공한 태스크']}개")
-                with col2:
-                    st.metric("🔄 변경", f"{result_summary['변경된 설정']}개")
-                with col3:
-                    st.metric("❌ 실패", f"{result_summary['실패한 태스크']}개")
-                with col4:
-                    st.metric("⚠️ 무시됨", f"{result_summary['무시된 태스크']}개")
-                with col5:
-                    st.metric("🚫 접근불가", f"{result_summary['접근 불가 서버']}개")
-                    
-                # 서버별 상세 결과 표시 (추가 기능)
-                
-                if result_summary.get("서버 상세"):
-                    st.subheader("🖥️ 서버별 상세 결과")
-                
-                for server_name, stats in result_summary["서버 상세"].items():
-                    with st.expander(f"📍 {server_name} 서버 결과"):
-                        col1, col2, col3, col4, col5 = st.columns(5)
-                        
-                        with col1:
-                            st.metric("성공", stats.get('ok', 0), delta=None)
-                        with col2:
-                            st.metric("변경", stats.get('changed', 0), delta=None)
-                        with col3:
-                            st.metric("실패", stats.get('failed', 0), delta=None)
-                        with col4:
-                            st.metric("접근불가", stats.get('unreachable', 0), delta=None)
-                        with col5:
-                            st.metric("건너뛴", stats.get('skipped', 0), delta=None)
-
-                        # 전체 성공률 표시 (추가 기능)
-                        if result_summary["성공한 태스크"] > 0 or result_summary["실패한 태스크"] > 0:
-                            total_tasks = result_summary["성공한 태스크"] + result_summary["실패한 태스크"]
-                            success_rate = (result_summary["성공한 태스크"] / total_tasks) * 100 if total_tasks > 0 else 0
-                            
-                            st.subheader("📈 전체 성공률")
-                            st.progress(success_rate / 100)
-                            st.write(f"**{success_rate:.1f}%** ({result_summary['성공한 태스크']}/{total_tasks} 태스크 성공)")
-
-                        # 문제가 있는 경우 경고 표시
-                        if result_summary["실패한 태스크"] > 0:
-                            st.error(f"⚠️ {result_summary['실패한 태스크']}개의 태스크가 실패했습니다. 로그를 확인해주세요.")
-
-                        if result_summary["접근 불가 서버"] > 0:
-                            st.warning(f"🔌 {result_summary['접근 불가 서버']}개의 서버에 접근할 수 없습니다. 네트워크 연결을 확인해주세요.")
+                # 🆕 백그라운드 작업으로 등록 (브라우저 연결 종료/rerun 과 무관하게 서버에서 계속 실행)
+                print(f"\n🔥 실제 실행 모드로 Ansible 플레이북 실행을 요청합니다...")
+                st.session_state.active_job_id = get_job_manager().submit_job(
+                    st.session_state.get('role'),
+                    st.session_state.playbook_path,
+                    st.session_state.inventory_path,
+                    active_servers,
+                    st.session_state.result_folder_path,
+                    st.session_state.timestamp,
+                    options={
+                        'fact_gathering': st.session_state.get('fact_gathering', 'per_check'),
+                        'scheduling': st.session_state.get('scheduling', 'auto'),
+                        'shards': st.session_state.get('shards', 1),
+                        'compress_log': st.session_state.get('compress_log', False),
+                        'incremental': st.session_state.get('incremental', False)
+                    }
+                )
+            
+            # 실행 중이거나 완료된 작업의 로그/결과 표시
+            if st.session_state.get('active_job_id'):
+                render_job_monitor(st.session_state.active_job_id)
             
             # 실행 후 초기화 버튼        
             if st.button("🔄 새로운 점검 시작 (현재 세션을 초기화하고 처음부터 다시)", use_container_width=True):
@@ -1062,6 +1252,7 @@ def render_main_app():
                 st.session_state.playbook_tasks = []
                 st.session_state.selected_checks = {}
                 st.session_state.result_folder_path = ""
+                st.session_state.active_job_id = ""
                 st.rerun()    
         st.markdown("---")
 
@@ -1306,6 +1497,12 @@ def count_server_specific_checks(server_specific_checks, vulnerability_categorie
 
 # --- 메인 실행 로직 ---
 
+# 오래된 실행 기록 압축/삭제 (프로세스당 한 번 시작, 이후 주기적으로 적용)
+try:
+    start_retention_scheduler()
+except Exception as e:
+    print(f"⚠️ 보관 정책 자동 적용 시작 실패: {str(e)}")
+
 # ✨ 세션 상태 키를 'role'로 변경하여 사용자 역할 관리
 if "role" not in st.session_state:
     st.session_state.role = None
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 앱과 같이 streamlitWebApp 폴더 기준으로 modules 패키지를 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
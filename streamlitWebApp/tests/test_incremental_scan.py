@@ -0,0 +1,87 @@
+"""
+증분 점검 결과 재사용 테스트 (playbook_name 이 점검 파일명과 다른 점검도 점검 코드로 조회)
+"""
+import os
+import json
+
+from modules import incremental_scan
+from modules.incremental_scan import analyze_check_inputs, prepare_incremental_run, finalize_incremental_run
+from modules.result_collector import RESULT_STORE_PREFIX, build_task_code, load_result_reports, write_result_store
+
+TASKS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tasks")
+LINUX_CHECK = "1_1_5_password_files.yml"              # playbook_name: 1_1_5_shadow_password_check.yml
+MYSQL_CHECK = "1_3_1_check-unnecessary-users.yml"     # playbook_name: mysql_unnecessary_accounts.yml
+HOST = "web1"
+
+def _report(task_file, playbook_name, task_code=True):
+    report = {'hostname': HOST, 'playbook_name': playbook_name, 'is_vulnerable': False}
+    if task_code:
+        # 콜백 플러그인이 kisa_report_<점검 코드> 팩트 이름에서 남기는 값
+        report['task_code'] = build_task_code(task_file)
+    return report
+
+def _write_run_results(result_folder_path):
+    results_dir = os.path.join(result_folder_path, "results")
+    os.makedirs(results_dir, exist_ok=True)
+    write_result_store(os.path.join(results_dir, f"{RESULT_STORE_PREFIX}.json"), [
+        _report(LINUX_CHECK, "1_1_5_shadow_password_check.yml"),
+        _report(MYSQL_CHECK, "mysql_unnecessary_accounts.yml")
+    ])
+
+def _prepare_run(tmp_path, timestamp):
+    result_folder_path = str(tmp_path / f"playbook_result_{timestamp}")
+    os.makedirs(result_folder_path, exist_ok=True)
+    with open(os.path.join(result_folder_path, "check_mapping.json"), 'w', encoding='utf-8') as f:
+        json.dump({'hosts': {HOST: [LINUX_CHECK, MYSQL_CHECK]}}, f)
+    return result_folder_path
+
+def test_load_result_reports_keys_on_task_code(tmp_path):
+    store_dir = tmp_path / "store"
+    store_dir.mkdir()
+    write_result_store(str(store_dir / f"{RESULT_STORE_PREFIX}.json"), [
+        _report(LINUX_CHECK, "1_1_5_shadow_password_check.yml"),
+        _report(MYSQL_CHECK, "mysql_unnecessary_accounts.yml")
+    ])
+
+    # 점검별 개별 파일 (결과 수집 콜백을 쓰지 않는 모드)은 파일명에서 점검 코드를 얻음
+    legacy_dir = tmp_path / "legacy"
+    legacy_dir.mkdir()
+    (legacy_dir / f"{MYSQL_CHECK[:-len('.yml')]}_{HOST}.json").write_text(
+        json.dumps(_report(MYSQL_CHECK, "mysql_unnecessary_accounts.yml", task_code=False)), encoding='utf-8'
+    )
+
+    expected = {(HOST, build_task_code(LINUX_CHECK)), (HOST, build_task_code(MYSQL_CHECK))}
+    assert set(load_result_reports(str(store_dir))) == expected
+    assert set(load_result_reports(str(legacy_dir))) == {(HOST, build_task_code(MYSQL_CHECK))}
+
+def test_incremental_run_reuses_report_by_task_code(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    inventory_path = str(tmp_path / "inventory.ini")
+    with open(inventory_path, 'w', encoding='utf-8') as f:
+        f.write(f"[target_servers]\n{HOST} ansible_host=10.0.0.1\n")
+
+    # 지문 수집 플레이북 대신 입력 파일이 모두 그대로인 호스트 지문 사용
+    paths = analyze_check_inputs(LINUX_CHECK, TASKS_DIR)['paths']
+    host_fingerprint = {'complete': True, 'files': [f"{path}\t644 0 0 10 1 abc" for path in paths],
+                        'packages': "pkg", 'services': "svc"}
+    monkeypatch.setattr(incremental_scan, "collect_fingerprints", lambda *args: {HOST: host_fingerprint})
+
+    first_folder = _prepare_run(tmp_path, "20260101_000000")
+    plan = prepare_incremental_run(inventory_path, first_folder, "20260101_000000", TASKS_DIR, {}, lambda line: None)
+    assert not plan['reused']
+    _write_run_results(first_folder)
+    finalize_incremental_run(plan, first_folder)
+
+    second_folder = _prepare_run(tmp_path, "20260102_000000")
+    plan = prepare_incremental_run(inventory_path, second_folder, "20260102_000000", TASKS_DIR, {}, lambda line: None)
+
+    # 리눅스 점검은 playbook_name 이 달라도 재사용, MySQL 점검은 DB 상태 점검이라 재실행
+    assert [item['check'] for item in plan['reused']] == [LINUX_CHECK]
+    assert [(item['check'], item['reason']) for item in plan['executed']] == [(MYSQL_CHECK, 'database_state')]
+    reused = load_result_reports(os.path.join(second_folder, "results"))
+    assert set(reused) == {(HOST, build_task_code(LINUX_CHECK))}
+
+    finalize_incremental_run(plan, second_folder)
+    index = incremental_scan.load_fingerprint_index()
+    assert index[HOST][LINUX_CHECK]['results_dir'] == os.path.abspath(os.path.join(second_folder, "results"))
+    assert MYSQL_CHECK not in index[HOST]
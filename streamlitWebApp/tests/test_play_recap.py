@@ -0,0 +1,117 @@
+"""
+PLAY RECAP 집계 테스트 (실행 중 누적 집계 = 로그 파일 PLAY RECAP 파싱, 라인 기반 실시간 카운트)
+
+fixtures/ 의 로그는 ansible-core 2.19 로 execute_ansible_playbook(engine="subprocess", -v)을 실제로 실행해 얻은
+실행 로그입니다. 두 점검 플레이 (ignore_errors / ignore_unreachable), 접근 불가 호스트 db1, 루프 항목 성공/실패/건너뜀,
+delegate_to, 핸들러를 포함합니다.
+  - ansible_execute_log_20250619_141836.log: 샤드 1개, 저장소 ansible.cfg 그대로 (display_skipped_hosts = False)
+  - ansible_execute_log_20250619_150212.log: 샤드 2개, ANSIBLE_DISPLAY_SKIPPED_HOSTS=True
+"""
+import os
+import re
+
+import pytest
+
+from modules.input_utils import LIVE_STAT_KEYS, PlayRecapAggregator, parse_play_recap
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SINGLE_LOG = "ansible_execute_log_20250619_141836.log"
+SHARDED_LOG = "ansible_execute_log_20250619_150212.log"
+# 실행 출력(emit) 라인만 [HH:MM:SS] 타임스탬프를 붙여 기록됨 (헤더/종료 안내 라인은 작업 출력이 아님)
+LOG_TIMESTAMP_PATTERN = re.compile(r'^\[\d\d:\d\d:\d\d\] ?')
+
+def _read_log(filename):
+    with open(os.path.join(FIXTURES_DIR, filename), 'r', encoding='utf-8') as f:
+        return f.read().splitlines()
+
+def _job_output(log_lines):
+    # 작업 관리자가 실행 중 받는 출력 라인 (타임스탬프 없음)
+    return [LOG_TIMESTAMP_PATTERN.sub('', line) for line in log_lines if LOG_TIMESTAMP_PATTERN.match(line)]
+
+def _aggregate(lines):
+    aggregator = PlayRecapAggregator()
+    for line in lines:
+        aggregator.feed_line(line)
+    return aggregator
+
+@pytest.mark.parametrize("filename", [SINGLE_LOG, SHARDED_LOG])
+def test_aggregator_summary_matches_parse_play_recap(filename):
+    log_lines = _read_log(filename)
+    summary = _aggregate(_job_output(log_lines)).summary()
+
+    assert summary == parse_play_recap(log_lines)
+    assert sorted(summary["서버 상세"]) == ["db1", "web1", "web2"]
+
+def test_live_counts_match_sharded_recap():
+    # 건너뛴 태스크도 출력되면 호스트별 실시간 카운트가 최종 PLAY RECAP 과 모두 같음
+    log_lines = _read_log(SHARDED_LOG)
+    aggregator = _aggregate(_job_output(log_lines))
+    recap_hosts = parse_play_recap(log_lines)["서버 상세"]
+
+    for host, stats in recap_hosts.items():
+        assert {key: aggregator.live_hosts[host][key] for key in LIVE_STAT_KEYS} == \
+            {key: stats[key] for key in LIVE_STAT_KEYS}, host
+    for key in LIVE_STAT_KEYS:
+        assert aggregator.live_counts[key] == sum(stats[key] for stats in recap_hosts.values())
+
+def test_live_counts_match_recap_without_skipped_lines():
+    # 저장소 ansible.cfg (display_skipped_hosts = False) 는 건너뜀 라인이 없으므로 skipped 를 뺀 나머지가 같음
+    log_lines = _read_log(SINGLE_LOG)
+    aggregator = _aggregate(_job_output(log_lines))
+
+    for host, stats in parse_play_recap(log_lines)["서버 상세"].items():
+        for key in LIVE_STAT_KEYS:
+            expected = 0 if key == 'skipped' else stats[key]
+            assert aggregator.live_hosts[host][key] == expected, (host, key)
+
+def test_loop_item_lines_count_as_one_task_result():
+    aggregator = _aggregate([
+        "TASK [패스워드 관련 파일 권한 점검] ****",
+        "ok: [web1 -> localhost] => (item=/etc/passwd) => {\"changed\": false}",
+        "changed: [web1 -> localhost] => (item=/etc/shadow) => {\"changed\": true}",
+        "skipping: [web2] => (item=old1)  => {\"changed\": false}",
+        "TASK [불필요한 계정 존재 여부 진단] ****",
+        "ok: [web2] => (item=root) => {\"changed\": false}",
+        "failed: [web2] (item=guest) => {\"changed\": false, \"rc\": 1}",
+        "PLAY RECAP ****"
+    ])
+
+    assert aggregator.live_hosts["web1"] == {**{key: 0 for key in LIVE_STAT_KEYS}, 'ok': 1, 'changed': 1, 'tasks': 1}
+    assert aggregator.live_hosts["web2"] == {**{key: 0 for key in LIVE_STAT_KEYS}, 'skipped': 1, 'failed': 1, 'tasks': 2}
+
+def test_ignoring_line_moves_failed_and_unreachable_results_to_ignored():
+    aggregator = _aggregate([
+        "TASK [Gathering Facts] ****",
+        "fatal: [db1]: UNREACHABLE! => {\"changed\": false, \"unreachable\": true}",
+        "...ignoring",
+        "TASK [MySQL 설치 여부 확인 (사전 확인)] ****",
+        "fatal: [web1]: FAILED! => {\"changed\": false, \"rc\": 2}",
+        "...ignoring",
+        "failed: [db1] (item=root) => {\"changed\": false}",
+        "...ignoring",
+        "fatal: [web2]: FAILED! => {\"changed\": false, \"rc\": 1}"
+    ])
+
+    assert aggregator.live_hosts["db1"]['ok'] == 2 and aggregator.live_hosts["db1"]['ignored'] == 2
+    assert aggregator.live_hosts["db1"]['unreachable'] == 0 and aggregator.live_hosts["db1"]['failed'] == 0
+    assert aggregator.live_hosts["web1"]['ok'] == 1 and aggregator.live_hosts["web1"]['ignored'] == 1
+    assert aggregator.live_hosts["web2"]['failed'] == 1
+    assert aggregator.live_counts == {'ok': 3, 'changed': 0, 'failed': 1, 'skipped': 0, 'unreachable': 0, 'ignored': 3}
+
+def test_shard_prefixes_keep_items_and_ignoring_per_shard():
+    # 다른 샤드의 태스크 경계/실패 라인은 이 샤드의 보류 중인 항목 결과와 '...ignoring' 에 영향을 주지 않음
+    aggregator = _aggregate([
+        "(shard 1/2) TASK [백업 파일 정리] ****",
+        "(shard 1/2) failed: [db1] (item=old1) => {\"changed\": false}",
+        "(shard 2/2) TASK [최종 JSON 보고서 파일 저장] ****",
+        "(shard 2/2) fatal: [web2]: FAILED! => {\"changed\": false}",
+        "(shard 1/2) ok: [web1] => (item=old1) => {\"changed\": false}",
+        "(shard 1/2) ...ignoring",
+        "(shard 2/2) TASK [MySQL 설정 파일 권한 확인] ****",
+        "(shard 1/2) SHARD 1/2 RECAP ****"
+    ])
+
+    assert aggregator.live_hosts["web2"]['failed'] == 1 and aggregator.live_hosts["web2"]['ignored'] == 0
+    assert aggregator.live_hosts["web1"]['ok'] == 1 and aggregator.live_hosts["web1"]['tasks'] == 1
+    assert aggregator.live_hosts["db1"]['failed'] == 0 and aggregator.live_hosts["db1"]['ignored'] == 1
+    assert aggregator.live_hosts["db1"]['ok'] == 1 and aggregator.live_hosts["db1"]['tasks'] == 1
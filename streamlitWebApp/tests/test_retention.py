@@ -0,0 +1,113 @@
+"""
+보관 정책 테스트 (실행 중 작업 제외, 압축 보관 후 리포트 로드, 삭제 순서)
+"""
+import os
+import json
+from datetime import datetime
+
+import pytest
+
+from modules import job_manager, run_catalog
+from modules.job_manager import JobManager
+from modules.run_catalog import RunCatalog, get_run_catalog
+from modules.result_collector import RESULT_STORE_PREFIX, build_task_code, write_result_store
+from modules.retention import RETAINED_FILES, plan_retention, compact_run, delete_run, is_run_compacted
+from analysis_report import load_timestamp_results
+
+OLD_RUN = "20250101_090000"
+ACTIVE_RUN = "20250102_090000"
+POLICY = {'enabled': True, 'compact_after_days': 30, 'delete_after_days': 0}
+NOW = datetime(2025, 6, 1)
+CHECKS = ["1_1_5_password_files.yml", "1_3_1_check-unnecessary-users.yml"]
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    # 앱과 같은 상대 경로(logs/, playbooks/, catalog/, jobs/)를 임시 폴더에 두고, 감시자 없는 카탈로그와
+    # 작업을 실행하지 않는 작업 관리자(동시 실행 0개, 등록한 작업은 대기 상태로 남음)를 사용
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(run_catalog, "_catalog", RunCatalog())
+    monkeypatch.setattr(job_manager, "_manager", JobManager(max_concurrent=0))
+    return tmp_path
+
+def _result_folder(timestamp):
+    return os.path.join("playbooks", f"playbook_result_{timestamp}")
+
+def _make_run(timestamp):
+    result_folder_path = _result_folder(timestamp)
+    results_dir = os.path.join(result_folder_path, "results")
+    os.makedirs(results_dir)
+    write_result_store(os.path.join(results_dir, f"{RESULT_STORE_PREFIX}.json"), [
+        {'hostname': host, 'task_code': build_task_code(task_file), 'playbook_name': task_file,
+         'is_vulnerable': host == "web2", 'diagnosis_result': "취약" if host == "web2" else "양호"}
+        for host in ("web1", "web2") for task_file in CHECKS
+    ])
+
+    # 실행마다 남는 상세 파일 (생성 플레이북, inventory, 점검 복사본, 콜백 기록)
+    with open(os.path.join(result_folder_path, "check_mapping.json"), 'w', encoding='utf-8') as f:
+        json.dump({'hosts': {"web1": CHECKS, "web2": CHECKS}}, f)
+    with open(os.path.join(result_folder_path, f"security_check_{timestamp}.yml"), 'w', encoding='utf-8') as f:
+        f.write("- import_playbook: checks/1_1_5_password_files.yml\n")
+    with open(os.path.join(result_folder_path, f"inventory_{timestamp}.ini"), 'w', encoding='utf-8') as f:
+        f.write("[target_servers]\nweb1\nweb2\n")
+    os.makedirs(os.path.join(result_folder_path, "checks"))
+    with open(os.path.join(result_folder_path, "checks", CHECKS[0]), 'w', encoding='utf-8') as f:
+        f.write("- hosts: target_servers\n")
+    os.makedirs(os.path.join(result_folder_path, "profile"))
+    with open(os.path.join(result_folder_path, "profile", "task_profile.json"), 'w', encoding='utf-8') as f:
+        json.dump({'columns': ["host", "check", "task", "status", "start", "end"],
+                   'data': [["web1", build_task_code(CHECKS[0]), "Gathering Facts", "ok", 1.0, 2.5]]}, f)
+
+    os.makedirs("logs", exist_ok=True)
+    with open(os.path.join("logs", f"ansible_execute_log_{timestamp}.log"), 'w', encoding='utf-8') as f:
+        f.write("PLAY RECAP ****\n[09:00:00] web1 : ok=4 changed=0 unreachable=0 failed=0\n" * 50)
+    get_run_catalog().index_run(timestamp)
+    return result_folder_path
+
+def test_plan_retention_skips_runs_of_active_jobs(workspace):
+    _make_run(OLD_RUN)
+    _make_run(ACTIVE_RUN)
+    job_manager.get_job_manager().submit_job("admin", "site.yml", "inventory.ini", None,
+                                             _result_folder(ACTIVE_RUN), ACTIVE_RUN)
+
+    assert plan_retention(POLICY, NOW) == {'compact': [OLD_RUN], 'delete': []}
+    assert plan_retention({**POLICY, 'delete_after_days': 90}, NOW) == {'compact': [], 'delete': [OLD_RUN]}
+
+def test_compact_run_keeps_retained_files_and_report_loads_from_parquet(workspace):
+    result_folder_path = _make_run(OLD_RUN)
+
+    compact_run(OLD_RUN)
+
+    remaining = set(os.listdir(result_folder_path))
+    assert remaining <= RETAINED_FILES
+    assert {"results.parquet", "report_summary.json", "task_profile.parquet", "check_mapping.json"} <= remaining
+    assert not os.path.exists(os.path.join("logs", f"ansible_execute_log_{OLD_RUN}.log"))
+    assert get_run_catalog().get_run(OLD_RUN)['log_file'].endswith(".gz")
+    assert is_run_compacted(OLD_RUN)
+
+    # results 폴더가 없어도 리포트는 Parquet 저장소에서 그대로 로드
+    result_data, error = load_timestamp_results(OLD_RUN)
+    assert error is None
+    df = result_data['df']
+    assert len(df) == 4
+    assert set(df['점검 코드']) == {build_task_code(task_file) for task_file in CHECKS}
+    assert set(df.loc[df['전체 취약 여부'], '호스트']) == {"web2"}
+
+def test_delete_run_removes_catalog_row_before_folder(workspace, monkeypatch):
+    result_folder_path = _make_run(OLD_RUN)
+    catalog = get_run_catalog()
+    remove_run = catalog.remove_run
+    seen = {}
+
+    def spy_remove_run(timestamp, refresh_latest=True):
+        # 카탈로그에서 빠지는 시점에는 로그는 이미 없고 결과 폴더는 아직 남아 있어야 함
+        seen['folder_exists'] = os.path.isdir(result_folder_path)
+        seen['log_exists'] = os.path.exists(os.path.join("logs", f"ansible_execute_log_{timestamp}.log"))
+        return remove_run(timestamp, refresh_latest)
+
+    monkeypatch.setattr(catalog, "remove_run", spy_remove_run)
+    freed_bytes = delete_run(OLD_RUN)
+
+    assert seen == {'folder_exists': True, 'log_exists': False}
+    assert catalog.get_run(OLD_RUN) is None
+    assert not os.path.exists(result_folder_path)
+    assert freed_bytes > 0
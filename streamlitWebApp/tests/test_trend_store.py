@@ -0,0 +1,52 @@
+"""
+점검 추이 적재 테스트 (check_code 는 playbook_name 이 아니라 점검 코드 기준)
+"""
+import os
+import json
+
+from modules import trend_store
+from modules.result_collector import RESULT_STORE_PREFIX, build_task_code, write_result_store
+from modules.result_store import compact_run_results
+from modules.trend_store import ingest_run, list_trend_dimensions, find_first_vulnerable
+
+LINUX_CHECK = "1_1_5_password_files.yml"              # playbook_name: 1_1_5_shadow_password_check.yml
+MYSQL_CHECK = "1_3_1_check-unnecessary-users.yml"     # playbook_name: mysql_unnecessary_accounts.yml
+HOST = "db1"
+
+def _report(task_file, playbook_name, is_vulnerable, task_code=True):
+    report = {'hostname': HOST, 'playbook_name': playbook_name, 'is_vulnerable': is_vulnerable}
+    if task_code:
+        report['task_code'] = build_task_code(task_file)
+    return report
+
+def _write_run(tmp_path, timestamp, mysql_vulnerable):
+    result_folder_path = str(tmp_path / f"playbook_result_{timestamp}")
+    results_dir = os.path.join(result_folder_path, "results")
+    os.makedirs(results_dir)
+    write_result_store(os.path.join(results_dir, f"{RESULT_STORE_PREFIX}.json"), [
+        _report(LINUX_CHECK, "1_1_5_shadow_password_check.yml", False)
+    ])
+    # 점검별 개별 파일 (task_code 없음) 은 파일명에서 점검 코드를 얻음
+    with open(os.path.join(results_dir, f"{MYSQL_CHECK[:-len('.yml')]}_{HOST}.json"), 'w', encoding='utf-8') as f:
+        json.dump(_report(MYSQL_CHECK, "mysql_unnecessary_accounts.yml", mysql_vulnerable, task_code=False), f)
+    return result_folder_path
+
+def test_trend_facts_key_on_task_code(tmp_path, monkeypatch):
+    monkeypatch.setattr(trend_store, "TREND_DB_PATH", str(tmp_path / "catalog" / "trend_facts.db"))
+    monkeypatch.setattr(trend_store, "_initialized", False)
+
+    # 첫 실행은 Parquet 결과 저장소에서, 두 번째 실행은 결과 JSON 에서 적재
+    first_run = _write_run(tmp_path, "20250101_000000", mysql_vulnerable=False)
+    assert compact_run_results(first_run)
+    second_run = _write_run(tmp_path, "20250102_000000", mysql_vulnerable=True)
+    assert ingest_run("20250101_000000", first_run) == 2
+    assert ingest_run("20250102_000000", second_run) == 2
+
+    hosts, checks = list_trend_dimensions()
+    assert hosts == [HOST]
+    assert checks == sorted([build_task_code(LINUX_CHECK), build_task_code(MYSQL_CHECK)])
+
+    result = find_first_vulnerable(HOST, build_task_code(MYSQL_CHECK))
+    assert [row['run_timestamp'] for row in result['history']] == ["20250101_000000", "20250102_000000"]
+    assert result['first_vulnerable_run'] == "20250102_000000"
+    assert find_first_vulnerable(HOST, "mysql_unnecessary_accounts")['history'] == []
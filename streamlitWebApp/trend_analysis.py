@@ -0,0 +1,129 @@
+"""
+점검 추이 분석 페이지 - 여러 실행에 걸친 점검별/호스트별 취약 건수 변화와 호스트 × 점검 이력 표시
+"""
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from datetime import datetime
+
+from modules.trend_store import (
+    TREND_DEFAULT_RUNS, ingest_new_runs, get_trend_runs, query_vulnerable_trend,
+    top_vulnerable_keys, find_first_vulnerable, list_trend_dimensions
+)
+
+def format_run_time(run_timestamp):
+    """실행 타임스탬프(YYYYMMDD_HHMMSS)를 화면 표시용 문자열로 변환"""
+    try:
+        return datetime.strptime(run_timestamp, "%Y%m%d_%H%M%S").strftime("%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return run_timestamp
+
+def render_trend_chart(group_by, label, run_limit, actual):
+    """점검별/호스트별 취약 건수 추이 차트"""
+    hosts, checks = list_trend_dimensions()
+    options = checks if group_by == "check" else hosts
+
+    selected_keys = st.multiselect(
+        f"표시할 {label} 선택 (기본: 최근 실행 기준 취약 건수 상위 10개)",
+        options=options,
+        default=top_vulnerable_keys(group_by, actual=actual),
+        key=f"trend_keys_{group_by}"
+    )
+    if not selected_keys:
+        st.info(f"{label}을(를) 하나 이상 선택해주세요.")
+        return
+
+    trend_df = pd.DataFrame(query_vulnerable_trend(group_by, run_limit, actual, selected_keys))
+    if trend_df.empty:
+        st.info("선택한 범위에 적재된 점검 결과가 없습니다.")
+        return
+
+    trend_df['실행 시간'] = pd.to_datetime(trend_df['run_timestamp'], format="%Y%m%d_%H%M%S", errors='coerce')
+    fig = px.line(
+        trend_df,
+        x='실행 시간',
+        y='vulnerable_count',
+        color='key',
+        markers=True,
+        title=f"{label}별 {'실질적 ' if actual else ''}취약 건수 추이",
+        labels={'vulnerable_count': '취약 건수', 'key': label}
+    )
+    fig.update_layout(height=450)
+    st.plotly_chart(fig, use_container_width=True)
+
+    with st.expander("📊 실행별 상세 수치"):
+        pivot_df = trend_df.pivot_table(index='run_timestamp', columns='key', values='vulnerable_count', fill_value=0)
+        pivot_df.index = [format_run_time(run_timestamp) for run_timestamp in pivot_df.index]
+        st.dataframe(pivot_df, use_container_width=True)
+
+def render_host_check_history():
+    """호스트 × 점검 상태 이력 및 최초 취약 시점"""
+    hosts, checks = list_trend_dimensions()
+    col1, col2 = st.columns(2)
+    with col1:
+        selected_host = st.selectbox("호스트 선택:", options=hosts, key="trend_history_host")
+    with col2:
+        selected_check = st.selectbox("점검 항목 선택:", options=checks, key="trend_history_check")
+
+    if not selected_host or not selected_check:
+        return
+
+    result = find_first_vulnerable(selected_host, selected_check)
+    if not result['history']:
+        st.info("선택한 호스트/점검 조합의 기록이 없습니다.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("📋 기록된 실행 수", len(result['history']))
+    col2.metric("🚨 최초 취약 진단",
+                format_run_time(result['first_vulnerable_run']) if result['first_vulnerable_run'] else "없음")
+    col3.metric("🔁 최근 양호 → 취약 전환",
+                format_run_time(result['latest_transition_run']) if result['latest_transition_run'] else "없음")
+
+    history_df = pd.DataFrame(result['history'])
+    history_df['run_timestamp'] = history_df['run_timestamp'].apply(format_run_time)
+    history_df = history_df.rename(columns={
+        'run_timestamp': '실행 시간',
+        'diagnosis_result': '진단 결과',
+        'is_vulnerable': '취약 여부',
+        'remediation_applied': '조치 여부',
+        'remediation_result': '조치 결과',
+        'actual_vulnerable': '실질적 취약'
+    })
+    for column in ('취약 여부', '조치 여부', '실질적 취약'):
+        history_df[column] = history_df[column].astype(bool)
+    st.dataframe(history_df, use_container_width=True, hide_index=True)
+
+def main():
+    """점검 추이 분석 메인 페이지"""
+    st.header("📈 점검 추이 분석 (Trend Analysis)")
+    st.markdown("여러 실행에 걸쳐 점검 항목별/서버별 취약 건수가 어떻게 변했는지 확인합니다.")
+    st.markdown("---")
+
+    # 아직 적재하지 않은 실행만 추이 저장소에 추가 (이미 적재한 실행은 다시 읽지 않음)
+    with st.spinner("📥 새 실행 결과 적재 중..."):
+        new_runs = ingest_new_runs()
+    if new_runs:
+        st.toast(f"📈 새 실행 {new_runs}개를 추이 저장소에 적재했습니다.")
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        run_limit = st.slider("조회할 최근 실행 수", min_value=5, max_value=365, value=TREND_DEFAULT_RUNS, step=5)
+    with col2:
+        actual = st.checkbox("조치 완료 항목 제외 (실질적 취약)", value=True)
+
+    runs = get_trend_runs(run_limit)
+    if not runs:
+        st.info("추이를 표시할 실행 기록이 없습니다. 취약점 점검을 실행하면 결과가 적재됩니다.")
+        return
+
+    st.caption(f"📅 {format_run_time(runs[0]['run_timestamp'])} ~ {format_run_time(runs[-1]['run_timestamp'])} "
+               f"({len(runs)}개 실행)")
+
+    tab1, tab2, tab3 = st.tabs(["📋 점검별 추이", "🖥️ 서버별 추이", "🔎 서버 × 점검 이력"])
+    with tab1:
+        render_trend_chart("check", "점검 항목", run_limit, actual)
+    with tab2:
+        render_trend_chart("host", "서버", run_limit, actual)
+    with tab3:
+        render_host_check_history()